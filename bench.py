@@ -0,0 +1,1041 @@
+"""
+Micro-benchmarks de l'Assistant Vocal
+Usage: python bench.py [répertoire de fixtures WAV]
+"""
+import os
+import random
+import statistics
+import string
+import subprocess
+import sys
+import threading
+import time
+import wave
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from main import (
+    FORMAT_JOURNAL, CanalInterface, DetecteurActiviteVocale, Disjoncteur, EtatCircuit,
+    FiltreMotsCles, HistoriqueCommandes, LanceurNavigateur, MoteurCouverture, MoteurDisjoncteur,
+    MoteurLocal, MoteurReconnaissance, NavigateurEnregistreur, PipelineReconnaissance,
+    PretraitementAudio, ServiceIndisponible, Speculateur, StatistiquesLatence,
+    configurer_journalisation
+)
+from noyau import FICHIER_COMMANDES, IndexFlou, IndexMotsCles, MoteurCommandes, RegistreCommandes
+from service import ServiceCommandes
+
+
+def _chronometrer(fonction: Callable, repetitions: int) -> float:
+    """Retourne la durée moyenne d'un appel en microsecondes"""
+    debut = time.perf_counter()
+    for _ in range(repetitions):
+        fonction()
+    return (time.perf_counter() - debut) / repetitions * 1e6
+
+
+# Vérifications en échec; le script sort alors avec un code non nul
+ECHECS: List[str] = []
+
+
+def _verifier(condition: bool, message: str):
+    """Enregistre (et affiche) une vérification en échec"""
+    if not condition:
+        ECHECS.append(message)
+        print(f"  ✗ ÉCHEC: {message}")
+
+
+def _generer_commandes(nb_mots_cles: int) -> Dict[int, Tuple[str, ...]]:
+    """Génère des commandes factices, quatre mots-clés par commande"""
+    aleatoire = random.Random(42)
+    commandes = {}
+    for i in range(0, nb_mots_cles, 4):
+        commandes[i] = tuple(
+            "".join(aleatoire.choice(string.ascii_lowercase) for _ in range(aleatoire.randint(4, 12)))
+            for _ in range(min(4, nb_mots_cles - i))
+        )
+    return commandes
+
+
+def bench_dispatch(tailles=(10, 100, 1000, 10000), repetitions: int = 2000):
+    """Compare le balayage imbriqué et l'index compilé des mots-clés"""
+    phrase = "est-ce que tu peux ouvrir le site youtube pour moi s'il te plaît"
+
+    print("Dispatch des commandes (µs par phrase)")
+    print(f"{'mots-clés':>10} {'balayage':>12} {'index':>12}")
+    for taille in tailles:
+        commandes = _generer_commandes(taille)
+        index = IndexMotsCles()
+        for cle, mots_cles in commandes.items():
+            index.ajouter(cle, mots_cles)
+        index.cles_trouvees(phrase)
+
+        def balayage():
+            for mots_cles in commandes.values():
+                for mot_cle in mots_cles:
+                    if mot_cle in phrase:
+                        return True
+            return False
+
+        duree_balayage = _chronometrer(balayage, max(1, repetitions // max(1, taille // 100)))
+        duree_index = _chronometrer(lambda: index.cles_trouvees(phrase), repetitions)
+        print(f"{taille:>10} {duree_balayage:>12.2f} {duree_index:>12.2f}")
+
+    # Rechargements à chaud: les mots-clés remplacés ne laissent pas de nœuds morts
+    commandes = _generer_commandes(1000)
+    index = IndexMotsCles()
+    for cle, mots_cles in commandes.items():
+        index.ajouter(cle, mots_cles)
+    noeuds = index.nb_noeuds
+    for rechargement in range(20):
+        for cle, mots_cles in commandes.items():
+            index.ajouter(cle, tuple(f"{mot}{rechargement}" for mot in mots_cles))
+        index.cles_trouvees(phrase)
+    for cle, mots_cles in commandes.items():
+        index.ajouter(cle, mots_cles)
+    print(f"  après 20 rechargements: {index.nb_noeuds} nœuds (initialement {noeuds})")
+    _verifier(index.nb_noeuds == noeuds,
+              f"le trie grossit à chaque rechargement ({noeuds} -> {index.nb_noeuds} nœuds)")
+
+
+def bench_canal_interface(evenements_par_seconde: int = 10000, nb_threads: int = 4,
+                          duree: float = 3.0):
+    """Inonde le canal d'interface depuis plusieurs threads et mesure la boucle Tk"""
+    import tkinter
+
+    root = tkinter.Tk()
+    root.withdraw()
+
+    class Indicateur:
+        configurations = 0
+
+        def configure(self, **options):
+            Indicateur.configurations += 1
+
+    lignes_affichees = []
+    lots = []
+
+    def afficher(lignes):
+        lots.append(len(lignes))
+        lignes_affichees.extend(lignes)
+
+    canal = CanalInterface(root, afficher)
+    indicateur = Indicateur()
+    arret = threading.Event()
+    envoyes = [0] * nb_threads
+
+    def producteur(n):
+        intervalle = nb_threads / evenements_par_seconde
+        prochain = time.perf_counter()
+        while not arret.is_set():
+            if envoyes[n] % 2:
+                canal.console(f"ligne {envoyes[n]}\n", "INFO")
+            else:
+                canal.configurer(indicateur, text=f"état {envoyes[n]}")
+            envoyes[n] += 1
+            prochain += intervalle
+            attente = prochain - time.perf_counter()
+            if attente > 0:
+                time.sleep(attente)
+
+    # Battement de cœur: mesure le retard de la boucle Tk
+    retards = []
+    periode = 0.010
+
+    def battement(prevu):
+        maintenant = time.perf_counter()
+        retards.append(maintenant - prevu)
+        if not arret.is_set():
+            root.after(int(periode * 1000), battement, maintenant + periode)
+
+    threads = [threading.Thread(target=producteur, args=(n,)) for n in range(nb_threads)]
+    for thread in threads:
+        thread.start()
+    root.after(int(periode * 1000), battement, time.perf_counter() + periode)
+    root.after(int(duree * 1000), arret.set)
+    root.after(int(duree * 1000) + 200, root.quit)
+    root.mainloop()
+    for thread in threads:
+        thread.join()
+    root.destroy()
+
+    retards.sort()
+    print("Canal d'interface sous charge")
+    print(f"  événements envoyés : {sum(envoyes)} ({sum(envoyes) / duree:.0f}/s)")
+    print(f"  lignes affichées   : {len(lignes_affichees)} en {len(lots)} insertions")
+    print(f"  configurations     : {Indicateur.configurations}")
+    print(f"  retard boucle Tk   : p50 {retards[len(retards) // 2] * 1000:.1f} ms, "
+          f"max {retards[-1] * 1000:.1f} ms")
+
+
+def _fixtures_synthetiques(taux: int = 16000) -> List[Tuple[str, np.ndarray, float]]:
+    """Énoncés synthétiques (bruit de fond + salve voisée) et leur fin de parole exacte"""
+    aleatoire = np.random.default_rng(7)
+    fixtures = []
+    for duree_parole in (0.3, 0.5, 0.8, 1.2, 2.0):
+        silence_avant, silence_apres = 0.5, 1.5
+        n_parole = int(duree_parole * taux)
+        t = np.arange(n_parole) / taux
+        parole = 3000 * np.sin(2 * np.pi * 180 * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 4 * t))
+        signal = np.concatenate([
+            np.zeros(int(silence_avant * taux)), parole, np.zeros(int(silence_apres * taux))
+        ])
+        signal += aleatoire.normal(0, 40, len(signal))
+        fixtures.append((f"synthétique {duree_parole:.1f} s", signal.astype(np.int16),
+                         silence_avant + duree_parole))
+    return fixtures
+
+
+def _fixtures_wav(repertoire: str, seuil: float) -> List[Tuple[str, np.ndarray, float]]:
+    """Enregistrements WAV mono 16 bits; la fin de parole est estimée hors ligne"""
+    fixtures = []
+    for nom in sorted(os.listdir(repertoire)):
+        if not nom.lower().endswith(".wav"):
+            continue
+        with wave.open(os.path.join(repertoire, nom), "rb") as fichier:
+            taux = fichier.getframerate()
+            signal = np.frombuffer(fichier.readframes(fichier.getnframes()), dtype=np.int16)
+        detecteur = DetecteurActiviteVocale(taux, seuil_energie=seuil)
+        voisees = np.nonzero(detecteur.energies(signal.tobytes()) > seuil)[0]
+        if not len(voisees):
+            continue
+        fin = (voisees[-1] + 1) * detecteur.duree_trame
+        # Silence ajouté pour laisser l'énoncé se clore
+        signal = np.concatenate([signal, np.zeros(taux, dtype=np.int16)])
+        fixtures.append((nom, signal, fin))
+    return fixtures
+
+
+def bench_endpointing(repertoire: Optional[str] = None, taux: int = 16000,
+                      taille_bloc: int = 1024, seuil: float = 300.0):
+    """Délai entre la fin de la parole et la remise de l'énoncé à la reconnaissance"""
+    fixtures = _fixtures_wav(repertoire, seuil) if repertoire else _fixtures_synthetiques(taux)
+
+    print(f"Fin d'énoncé (bloc de {taille_bloc} échantillons, pause par défaut de "
+          f"speech_recognition: 800 ms)")
+    print(f"{'fixture':>22} {'délai':>10} {'calcul/s audio':>16}")
+    for nom, signal, fin_parole in fixtures:
+        detecteur = DetecteurActiviteVocale(taux, seuil_energie=seuil)
+        donnees = signal.tobytes()
+        octets_bloc = taille_bloc * 2
+        delai = None
+        calcul = 0.0
+        for position in range(0, len(donnees), octets_bloc):
+            debut = time.perf_counter()
+            enonces = detecteur.traiter(donnees[position:position + octets_bloc])
+            duree_calcul = time.perf_counter() - debut
+            calcul += duree_calcul
+            if enonces and delai is None:
+                remise = (position + octets_bloc) / 2 / taux
+                delai = remise - fin_parole + duree_calcul
+        duree_audio = len(signal) / taux
+        texte_delai = f"{delai * 1000:.0f} ms" if delai is not None else "non clos"
+        print(f"{nom:>22} {texte_delai:>10} {calcul / duree_audio * 1000:>13.2f} ms")
+
+
+def bench_tampon_audio(taux: int = 16000, taille_bloc: int = 1024, repetitions: int = 20):
+    """Octets alloués par seconde d'audio entre la capture et la remise des énoncés
+
+    Le pic de mémoire tracée pendant chaque bloc (détection, énoncés clos,
+    PCM rendu au filtre et à la reconnaissance) est cumulé; le tampon
+    préalloué n'est pas compté.
+    """
+    import tracemalloc
+
+    fixtures = _fixtures_synthetiques(taux)
+    donnees = np.concatenate([signal for _, signal, _ in fixtures] * repetitions).tobytes()
+    detecteur = DetecteurActiviteVocale(taux, seuil_energie=300.0)
+    octets_bloc = taille_bloc * 2
+    blocs = [donnees[i:i + octets_bloc] for i in range(0, len(donnees), octets_bloc)]
+
+    alloues = 0
+    enonces = []
+    tracemalloc.start()
+    debut = time.perf_counter()
+    for bloc in blocs:
+        avant = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        for segment in detecteur.traiter(bloc):
+            pcm = segment.octets()
+            enonces.append((segment.debut, len(pcm)))
+        alloues += tracemalloc.get_traced_memory()[1] - avant
+    duree_calcul = time.perf_counter() - debut
+    tracemalloc.stop()
+
+    duree_audio = len(donnees) / 2 / taux
+    print(f"Tampon audio ({len(enonces)} énoncés, {duree_audio:.0f} s d'audio)")
+    print(f"  alloué : {alloues / duree_audio / 1024:.1f} Ko par seconde d'audio")
+    print(f"  calcul : {duree_calcul / duree_audio * 1000:.2f} ms par seconde d'audio (sous tracemalloc)")
+
+    # Attaque conservée: écart entre le début de l'énoncé et le début de la parole
+    attaques = []
+    for _, signal, _ in fixtures:
+        detecteur = DetecteurActiviteVocale(taux, seuil_energie=300.0)
+        for i in range(0, len(signal), taille_bloc):
+            for segment in detecteur.traiter(signal[i:i + taille_bloc].tobytes()):
+                attaques.append(0.5 - segment.debut / taux)
+    print(f"  pré-roll avant l'attaque : {min(attaques) * 1000:.0f} ms minimum")
+
+
+def bench_pretraitement(taux_capture=(16000, 44100, 48000), repetitions: int = 20):
+    """Taille des requêtes envoyées et coût du prétraitement par seconde d'audio"""
+    import speech_recognition as sr
+
+    pretraitement = PretraitementAudio()
+    print("Prétraitement avant envoi (FLAC comme recognize_google, sinon WAV)")
+    print(f"{'capture':>10} {'audio brut':>11} {'envoyé':>8} {'brut':>9} {'prétraité':>10} "
+          f"{'coût/s audio':>13}")
+    for taux in taux_capture:
+        # Parole synthétique faible, entourée des silences du pré-roll et de la traîne
+        signal = np.concatenate([signal for _, signal, _ in _fixtures_synthetiques(taux)[2:4]])
+        signal = (signal // 4).astype(np.int16)
+        brut = sr.AudioData(signal.tobytes(), taux, 2)
+        duree_audio = len(signal) / taux
+
+        debut = time.perf_counter()
+        for _ in range(repetitions):
+            pretraite = pretraitement.audio(brut)
+        cout = (time.perf_counter() - debut) / repetitions / duree_audio
+
+        try:
+            taille_brut, taille_pretraite = len(brut.get_flac_data()), len(pretraite.get_flac_data())
+        except (OSError, AssertionError):
+            taille_brut, taille_pretraite = len(brut.get_wav_data()), len(pretraite.get_wav_data())
+        duree_envoyee = len(pretraite.frame_data) / 2 / pretraite.sample_rate
+        print(f"{taux:>8} Hz {duree_audio:>9.2f} s {duree_envoyee:>6.2f} s "
+              f"{taille_brut / 1024:>6.0f} Ko {taille_pretraite / 1024:>7.0f} Ko {cout * 1000:>10.2f} ms")
+
+
+class _MoteurPanne(MoteurReconnaissance):
+    """Service simulé: échoue après `latence` tant que la panne dure"""
+
+    nom = "panne"
+
+    def __init__(self, fin_panne: float, latence: float):
+        self.fin_panne = fin_panne
+        self.latence = latence
+        self.appels = 0
+        self.occupation = 0.0
+
+    def _reconnaitre(self, audio, langue: str, annulation: threading.Event) -> str:
+        self.appels += 1
+        self.occupation += self.latence
+        annulation.wait(self.latence)
+        if time.monotonic() < self.fin_panne:
+            raise ServiceIndisponible("réseau injoignable")
+        return audio
+
+
+def bench_disjoncteur(duree_panne: float = 3.0, periode: float = 0.05, latence: float = 0.03):
+    """Appels et temps de thread gaspillés pendant une panne, annonces, reprise"""
+    print(f"Panne du service de {duree_panne:.0f} s, un énoncé toutes les {periode * 1000:.0f} ms")
+    print(f"{'':>18} {'appels':>7} {'occupation':>11} {'annonces':>9} {'reprise':>9}")
+    for avec_disjoncteur in (False, True):
+        changements = []
+        debut = time.monotonic()
+        moteur = _MoteurPanne(debut + duree_panne, latence)
+        if avec_disjoncteur:
+            disjoncteur = Disjoncteur(delai_initial=0.1, delai_max=1.0,
+                                      en_changement=lambda ancien, nouveau: changements.append((ancien, nouveau)))
+            moteur_protege = MoteurDisjoncteur(moteur, disjoncteur)
+        else:
+            moteur_protege = moteur
+
+        reprise = None
+        while reprise is None and time.monotonic() < debut + duree_panne + 5.0:
+            try:
+                moteur_protege.reconnaitre("ouvre youtube", "fr-FR")
+                reprise = time.monotonic() - (debut + duree_panne)
+            except ServiceIndisponible:
+                if not avec_disjoncteur:
+                    # Sans disjoncteur, chaque échec est annoncé
+                    changements.append(None)
+            time.sleep(periode)
+
+        # Comme l'assistant: annonce à la coupure et au rétablissement seulement
+        annonces = [c for c in changements if c is None or c[1] is EtatCircuit.FERME
+                    or c == (EtatCircuit.FERME, EtatCircuit.OUVERT)]
+        nom = "avec disjoncteur" if avec_disjoncteur else "sans disjoncteur"
+        texte_reprise = f"{reprise * 1000:.0f} ms" if reprise is not None else "aucune"
+        print(f"{nom:>18} {moteur.appels:>7} {moteur.occupation:>9.2f} s {len(annonces):>9} "
+              f"{texte_reprise:>9}")
+
+
+def bench_couverture(delai_couverture: float = 0.1, lenteur: float = 0.5, repetitions: int = 10):
+    """Requêtes couvertes: principal lent ou en panne, réponse retenue et couvertures comptées"""
+    import rejeu
+
+    print(f"Requêtes couvertes (secours après {delai_couverture * 1000:.0f} ms)")
+    audio = b"\x01\x02" * 800
+    secours = MoteurLocal(transcriptions={audio: "secours"})
+    cas = (
+        ("principal rapide", MoteurLocal(transcriptions={audio: "principal"}), "principal", 0),
+        ("principal lent", MoteurLocal(transcriptions={audio: "principal"}, latence=lenteur),
+         "secours", repetitions),
+        ("principal en panne", _MoteurPanne(time.monotonic() + 3600, 0.01), "secours", repetitions),
+    )
+    for nom, principal, attendu, couvertures in cas:
+        moteur = MoteurCouverture(principal, secours, delai_couverture)
+        durees, textes = [], set()
+        for _ in range(repetitions):
+            debut = time.perf_counter()
+            textes.add(moteur.reconnaitre(audio, "fr-FR", delai=2.0))
+            durees.append(time.perf_counter() - debut)
+        print(f"  {nom:<19} réponse {'/'.join(sorted(textes)):<10} couvertures {moteur.couvertures:>3}  "
+              f"médiane {statistics.median(durees) * 1000:>5.0f} ms")
+        _verifier(textes == {attendu}, f"{nom}: réponse {textes}, attendu {attendu}")
+        _verifier(moteur.couvertures == couvertures,
+                  f"{nom}: {moteur.couvertures} couverture(s), attendu {couvertures}")
+
+    # Le paramètre de l'application construit bien le moteur couvert
+    app = rejeu.AssistantSansInterface()
+    try:
+        app.repertoire_moteur_local = os.path.dirname(os.path.abspath(__file__))
+        _verifier(isinstance(app._creer_moteur_reconnaissance(), MoteurCouverture),
+                  "repertoire_moteur_local ne construit pas de moteur couvert")
+        app.delai_couverture = None
+        _verifier(isinstance(app._creer_moteur_reconnaissance(), MoteurLocal),
+                  "sans délai de couverture, le moteur local n'est pas utilisé seul")
+    finally:
+        app.fermer()
+
+
+class _MicrophoneSimule:
+    """Micro simulé: rend le signal en boucle au rythme réel, compte les ouvertures"""
+
+    SAMPLE_RATE = 16000
+    SAMPLE_WIDTH = 2
+    CHUNK = 1024
+
+    verrou = threading.Lock()
+    ouverts = 0
+    ouverts_max = 0
+    ouvertures = 0
+
+    def __init__(self, signal: np.ndarray):
+        self._donnees = signal.tobytes()
+        self._position = 0
+        self.stream = self
+
+    def __enter__(self):
+        with self.verrou:
+            _MicrophoneSimule.ouverts += 1
+            _MicrophoneSimule.ouvertures += 1
+            _MicrophoneSimule.ouverts_max = max(_MicrophoneSimule.ouverts_max, _MicrophoneSimule.ouverts)
+        return self
+
+    def __exit__(self, *exc):
+        with self.verrou:
+            _MicrophoneSimule.ouverts -= 1
+
+    def read(self, taille: int) -> bytes:
+        time.sleep(taille / self.SAMPLE_RATE)
+        octets = taille * self.SAMPLE_WIDTH
+        if self._position + octets > len(self._donnees):
+            self._position = 0
+        bloc = self._donnees[self._position:self._position + octets]
+        self._position += octets
+        return bloc
+
+
+def bench_cycle_ecoute(nb_bascules: int = 1000, nb_arrets: int = 10, latence: float = 5.0):
+    """Bascules rapides de l'écoute: un seul micro ouvert, aucun thread perdu, arrêt borné"""
+    from rejeu import AssistantSansInterface
+
+    # Une phrase par seconde; la reconnaissance simulée est bien plus lente
+    signal = np.concatenate([_fixtures_synthetiques()[1][1]] * 2)
+    app = AssistantSansInterface(latence)
+    app._ouvrir_microphone = lambda: _MicrophoneSimule(signal)
+    app.moteur_rejeu.transcriptions.extend(["ouvre youtube"] * 1000)
+    threads_avant = threading.active_count()
+
+    aleatoire = random.Random(5)
+    for _ in range(nb_bascules):
+        app._toggle_ecoute()
+        time.sleep(aleatoire.uniform(0, 0.01))
+    if app.ecoute_active:
+        app._toggle_ecoute()
+    arrete = app.cycle_ecoute.arreter(delai=1.0)
+    sessions = app.cycle_ecoute.sessions
+
+    # Arrêts avec une reconnaissance en cours
+    latences = []
+    en_cours = 0
+    for _ in range(nb_arrets):
+        app._demarrer_ecoute()
+        time.sleep(1.6)
+        en_cours += bool(app._pipeline.en_attente)
+        debut = time.perf_counter()
+        app._arreter_ecoute()
+        app.cycle_ecoute.arreter(delai=1.0)
+        latences.append(time.perf_counter() - debut)
+
+    time.sleep(0.2)
+    threads_perdus = threading.active_count() - threads_avant
+    app.fermer()
+
+    print(f"Cycle d'écoute ({nb_bascules} bascules, {sessions} sessions lancées)")
+    print(f"  micros ouverts simultanément : {_MicrophoneSimule.ouverts_max} au plus, "
+          f"{_MicrophoneSimule.ouverts} encore ouvert(s) sur {_MicrophoneSimule.ouvertures}")
+    print(f"  threads perdus : {threads_perdus}  (arrêt final {'borné' if arrete else 'DÉPASSÉ'})")
+    print(f"  arrêt ({en_cours}/{nb_arrets} avec reconnaissance en cours) : "
+          f"p50 {statistics.median(latences) * 1000:.0f} ms, max {max(latences) * 1000:.0f} ms")
+    _verifier(_MicrophoneSimule.ouverts_max <= 1,
+              f"{_MicrophoneSimule.ouverts_max} micros ouverts simultanément")
+    _verifier(_MicrophoneSimule.ouverts == 0, f"{_MicrophoneSimule.ouverts} micro(s) resté(s) ouvert(s)")
+    _verifier(threads_perdus == 0, f"{threads_perdus} thread(s) perdu(s)")
+    _verifier(arrete, "arrêt final non borné")
+    _verifier(max(latences) < 0.1, f"arrêt en {max(latences) * 1000:.0f} ms (> 100 ms)")
+
+
+def _mots_cles_sites() -> Dict[str, Tuple[str, ...]]:
+    """Mots-clés des sites du registre livré, indexés par nom de site"""
+    registre = RegistreCommandes(FICHIER_COMMANDES)
+    registre.recharger()
+    return {site.nom: site.mots_cles for site in registre.sites.values()}
+
+
+# Transcriptions erronées relevées et commande attendue (None: aucune)
+CORPUS_TRANSCRIPTIONS = [
+    ("you tube", "YouTube"),
+    ("ouvre you tube", "YouTube"),
+    ("lance i tube", "YouTube"),
+    ("what's app", "WhatsApp"),
+    ("ouvrir what s up", "WhatsApp"),
+    ("watt sap", "WhatsApp"),
+    ("guitare hub", "GitHub"),
+    ("ouvre git hube", "GitHub"),
+    ("guit hub", "GitHub"),
+    ("face book", "Facebook"),
+    ("ouvre fesse book", "Facebook"),
+    ("tic toc", "TikTok"),
+    ("tik tak", "TikTok"),
+    ("gougle", "Google"),
+    ("ouvre gogol", "Google"),
+    ("quelle heure est-il", None),
+    ("bonjour comment ça va", None),
+    ("mets de la musique", None),
+    ("il fait beau aujourd'hui", None),
+    ("éteins la lumière", None),
+]
+
+
+def bench_flou(tailles=(10, 1000, 5000), repetitions: int = 200, seuil: float = 0.55):
+    """Précision et latence du rapprochement approximatif sur le corpus"""
+    print(f"Rapprochement approximatif ({len(CORPUS_TRANSCRIPTIONS)} transcriptions, seuil {seuil})")
+    print(f"{'mots-clés':>10} {'précision':>10} {'moyenne':>10} {'max':>10}")
+    for taille in tailles:
+        index = IndexFlou()
+        mots_cles_sites = _mots_cles_sites()
+        for site, mots_cles in mots_cles_sites.items():
+            index.ajouter(site, mots_cles)
+        nb_sites = sum(len(mots) for mots in mots_cles_sites.values())
+        for cle, mots_cles in _generer_commandes(max(0, taille - nb_sites)).items():
+            index.ajouter(cle, mots_cles)
+
+        corrects = 0
+        durees = []
+        for phrase, attendu in CORPUS_TRANSCRIPTIONS:
+            candidats = index.meilleurs(phrase, seuil)
+            obtenu = candidats[0][1] if candidats else None
+            corrects += obtenu == attendu
+            durees.append(_chronometrer(lambda: index.meilleurs(phrase, seuil), repetitions))
+        print(f"{taille:>10} {corrects / len(CORPUS_TRANSCRIPTIONS):>10.0%} "
+              f"{statistics.mean(durees):>7.0f} µs {max(durees):>7.0f} µs")
+
+
+def bench_grammaire(repetitions: int = 2000):
+    """Analyse d'une phrase en intentions: coût par phrase, simple ou multiple"""
+    moteur = MoteurCommandes(FICHIER_COMMANDES)
+    moteur.charger()
+    phrases = (
+        "ouvre youtube",
+        "cherche tutoriel youtube",
+        "ouvre github et cherche asyncio",
+        "ouvre youtube puis facebook et cherche la météo à paris",
+        "bonjour comment ça va",
+    )
+    print("Grammaire des commandes (découpage et analyse en une passe)")
+    for phrase in phrases:
+        duree = _chronometrer(lambda: moteur.intentions(phrase), repetitions)
+        intentions = ", ".join(
+            f"{i.cle}:{i.requete}" if i.requete else i.cle for i in moteur.intentions(phrase)
+        ) or "-"
+        print(f"  {duree:>6.1f} µs  {phrase!r} -> {intentions}")
+
+
+def bench_speculation(duree_par_mot: float = 0.05, delai_final: float = 0.3,
+                      repetitions: int = 2000):
+    """Hypothèses intermédiaires: avance des préparations sur le résultat final, coût, révisions"""
+    import rejeu
+
+    print(f"Spéculation sur hypothèses intermédiaires ({duree_par_mot * 1000:.0f} ms par mot, "
+          f"résultat final {delai_final * 1000:.0f} ms après le dernier mot)")
+    sans = rejeu.executer(latence=delai_final, repetitions=1)
+    avec = rejeu.executer(latence=delai_final, repetitions=1, progressif=duree_par_mot)
+    s = avec["speculation"]
+    print(f"  précision : {sans['precision']:.1%} sans hypothèses, {avec['precision']:.1%} avec")
+    print(f"  préparations : {s['preparations']}, confirmées {s['confirmees']}, "
+          f"abandonnées {s['abandonnees']}, avance médiane {s['avance_ms']} ms")
+    print(f"    (l'avance reflète le délai du moteur simulé, {delai_final * 1000:.0f} ms entre "
+          f"le dernier mot et le résultat final: ce n'est pas une mesure d'un vrai service)")
+
+    # Hypothèse corrigée par le service: la préparation est abandonnée, rien ne s'ouvre
+    app = rejeu.AssistantSansInterface(delai_final, progressif=duree_par_mot)
+    app.moteur_reconnaissance.revisions["regarde la télé"] = ["regarde", "regarde youtube"]
+    rejeu.rejouer_transcriptions(app, [("regarde la télé", "-")])
+    print(f"  révision 'regarde youtube' -> 'regarde la télé' : {app.speculateur.resume()}, "
+          f"{len(app.ouvrir_navigateur.appels)} appel(s) au navigateur")
+    app.fermer()
+
+    moteur = MoteurCommandes(FICHIER_COMMANDES)
+    moteur.charger()
+    speculateur = Speculateur(moteur, lambda intention, url: None)
+    for hypothese in ("ouvre", "ouvre you", "ouvre youtube et cherche la météo"):
+        duree = _chronometrer(lambda: speculateur.hypothese(1, hypothese, 0.9), repetitions)
+        print(f"  {duree:>6.1f} µs par hypothèse  {hypothese!r}")
+
+    # Ce que le préchauffage retire de la première ouverture
+    duree = subprocess.run(
+        [sys.executable, "-c",
+         "import time, webbrowser\n"
+         "debut = time.perf_counter()\n"
+         "try:\n    webbrowser.get()\nexcept webbrowser.Error:\n    pass\n"
+         "print(time.perf_counter() - debut)"],
+        capture_output=True, text=True
+    ).stdout
+    print(f"  résolution du navigateur à froid (préchauffée) : {float(duree) * 1000:.1f} ms")
+
+
+def _balayage(f0: float, f1: float, duree: float, taux: int) -> np.ndarray:
+    """Balayage de fréquence servant de « mot » synthétique"""
+    t = np.arange(int(duree * taux)) / taux
+    return 3000 * np.sin(2 * np.pi * (f0 * t + (f1 - f0) * t * t / (2 * duree)))
+
+
+def bench_filtre_local(taux: int = 16000, nb_enonces: int = 40):
+    """Appels distants évités et coût CPU du filtre local de mots-clés"""
+    aleatoire = np.random.default_rng(11)
+
+    def pcm(signal: np.ndarray) -> bytes:
+        signal = signal + aleatoire.normal(0, 100, len(signal))
+        return signal.astype(np.int16).tobytes()
+
+    filtre = FiltreMotsCles()
+    filtre.ajouter_modele("mot_eveil", pcm(_balayage(300, 1500, 0.5, taux)), taux, 2)
+
+    attendus = []
+    for i in range(nb_enonces):
+        silence = np.zeros(int(0.3 * taux))
+        if i % 4 == 0:
+            contenu, attendu = _balayage(300, 1500, aleatoire.uniform(0.4, 0.7), taux), True
+        elif i % 4 == 1:
+            contenu, attendu = _balayage(1500, 300, 0.6, taux), False
+        elif i % 4 == 2:
+            contenu, attendu = aleatoire.normal(0, 2000, taux), False
+        else:
+            contenu, attendu = _balayage(300, 1500, 0.1, taux), False
+        attendus.append((pcm(np.concatenate([silence, contenu, silence])), attendu))
+
+    erreurs = sum(filtre.accepter(donnees, taux, 2) != attendu for donnees, attendu in attendus)
+    print("Filtre local de mots-clés")
+    print(f"  {filtre.resume()}")
+    print(f"  décisions erronées : {erreurs}/{nb_enonces}")
+
+    # Toux et claquements: le pré-roll et la traîne du détecteur ne comptent pas comme parole
+    filtre_duree = FiltreMotsCles()
+    for duree, attendu in ((0.12, False), (0.15, False), (0.2, False), (0.5, True)):
+        salve = aleatoire.normal(0, 3000, int(duree * taux))
+        signal = pcm(np.concatenate([np.zeros(int(0.5 * taux)), salve, np.zeros(taux)]))
+        detecteur = DetecteurActiviteVocale(taux, 2, seuil_energie=300)
+        segments = []
+        for i in range(0, len(signal), 2048):
+            segments += detecteur.traiter(signal[i:i + 2048])
+        decisions = [
+            filtre_duree.accepter(segment.octets(), taux, 2, segment.duree_voisee)
+            for segment in segments
+        ]
+        print(f"  salve de {duree * 1000:.0f} ms : " + ", ".join(
+            f"segment {segment.duree:.2f} s dont {segment.duree_voisee:.2f} s de parole, "
+            f"{'transmis' if accepte else 'écarté'}" for segment, accepte in zip(segments, decisions)
+        ))
+        _verifier(decisions == [attendu], f"salve de {duree * 1000:.0f} ms: {decisions}, attendu [{attendu}]")
+
+
+def bench_lanceur(duree_navigateur: float = 0.15, nb_commandes: int = 20):
+    """Temps rendu à la boucle Tk, doublons et lots du lanceur de navigateur"""
+    urls = [f"https://exemple{i % 5}.com" for i in range(nb_commandes)]
+
+    navigateur = NavigateurEnregistreur(duree_navigateur)
+    debut = time.perf_counter()
+    for url in urls[:5]:
+        navigateur([url])
+    synchrone = (time.perf_counter() - debut) / 5
+
+    navigateur = NavigateurEnregistreur(duree_navigateur)
+    lanceur = LanceurNavigateur(navigateur, fenetre_doublons=2.0)
+    durees = []
+    for url in urls:
+        debut = time.perf_counter()
+        lanceur.ouvrir(url)
+        durees.append(time.perf_counter() - debut)
+    lanceur.ouvrir("https://a.com", "https://b.com", "https://c.com")
+    time.sleep(duree_navigateur * 3)
+    lanceur.arreter()
+
+    print(f"Lanceur de navigateur (ouverture simulée de {duree_navigateur * 1000:.0f} ms)")
+    print(f"  appel sur le thread Tk : {synchrone * 1000:.1f} ms en direct, "
+          f"{statistics.mean(durees) * 1e6:.0f} µs via le lanceur")
+    print(f"  {len(urls) + 3} demandes -> {len(navigateur.urls)} URL ouvertes "
+          f"({lanceur.ignores} doublons) en {len(navigateur.appels)} appels")
+
+
+def bench_historique(nb_entrees: int = 100_000, repetitions: int = 20):
+    """Requêtes sur un long historique, avec et sans les index"""
+    import sqlite3
+    import tempfile
+    from datetime import datetime, timedelta
+
+    aleatoire = random.Random(11)
+    sites = [f"site{i}" for i in range(50)]
+    maintenant = time.time()
+    # Un an d'historique, une entrée toutes les ~5 minutes
+    lignes = [(maintenant - aleatoire.uniform(0, 365 * 86400), *(
+        ("site", aleatoire.choice(sites)) if aleatoire.random() < 0.8
+        else ("recherche", f"requête {aleatoire.randrange(5000)}")
+    ), "https://exemple.com") for _ in range(nb_entrees)]
+
+    requetes = {
+        "rechercher(type, cible)": lambda h: h.rechercher("site", "site7", limite=20),
+        "rechercher(dernier jour)": lambda h: h.rechercher(debut=datetime.now() - timedelta(days=1)),
+        "frequences(sites)": lambda h: h.frequences("site"),
+        "frequences(dernière semaine)": lambda h: h.frequences(
+            "site", debut=datetime.now() - timedelta(days=7)),
+    }
+    print(f"Historique ({nb_entrees} entrées)")
+    with tempfile.TemporaryDirectory() as repertoire:
+        chemin = os.path.join(repertoire, "historique.db")
+        historique = HistoriqueCommandes(chemin)
+        connexion = sqlite3.connect(chemin)
+        with connexion:
+            connexion.executemany(
+                "INSERT INTO historique (horodatage, type, cible, url) VALUES (?, ?, ?, ?)", lignes
+            )
+        try:
+            avec = {nom: _chronometrer(lambda: requete(historique), repetitions)
+                    for nom, requete in requetes.items()}
+            with connexion:
+                connexion.execute("DROP INDEX idx_historique_horodatage")
+                connexion.execute("DROP INDEX idx_historique_type_cible")
+            sans = {nom: _chronometrer(lambda: requete(historique), repetitions)
+                    for nom, requete in requetes.items()}
+
+            # Lecture en mémoire: une entrée pas encore écrite est déjà visible
+            historique.ajouter("site", "site0", "https://exemple.com")
+            derniere = historique.rechercher(limite=1)
+        finally:
+            connexion.close()
+            historique.fermer()
+
+    print(f"  {'':<30} {'avec index':>12} {'sans index':>12}")
+    for nom in requetes:
+        print(f"  {nom:<30} {avec[nom]:>9.0f} µs {sans[nom]:>9.0f} µs")
+    _verifier(avec["rechercher(type, cible)"] < sans["rechercher(type, cible)"],
+              "l'index (type, cible) n'accélère pas rechercher")
+    _verifier(avec["frequences(dernière semaine)"] < sans["frequences(dernière semaine)"],
+              "l'index d'horodatage n'accélère pas frequences sur une période")
+    _verifier(len(derniere) == 1 and derniere[0].cible == "site0",
+              "rechercher() ne voit pas l'entrée que l'on vient d'ajouter")
+
+
+def bench_journalisation(nb_salves: int = 100, taille_salve: int = 50,
+                         taille_max: int = 256 * 1024):
+    """Coût d'un logger.info pour l'appelant: écriture directe ou file asynchrone
+
+    Les messages partent par salves espacées, comme les journaux d'une
+    commande vocale, pour laisser le thread d'écriture vider la file.
+    """
+    import logging
+    import tempfile
+
+    journal = logging.getLogger("bench")
+    nb_messages = nb_salves * taille_salve
+
+    def salves() -> float:
+        duree = 0.0
+        for salve in range(nb_salves):
+            debut = time.perf_counter()
+            for i in range(taille_salve):
+                journal.info(f"Site ouvert: exemple {salve}-{i}")
+            duree += time.perf_counter() - debut
+            time.sleep(0.002)
+        return duree
+
+    with tempfile.TemporaryDirectory() as repertoire:
+        chemin = os.path.join(repertoire, "direct.log")
+        direct = logging.FileHandler(chemin, encoding="utf-8")
+        direct.setFormatter(logging.Formatter(FORMAT_JOURNAL))
+        racine = logging.getLogger()
+        anciens, ancien_niveau = racine.handlers[:], racine.level
+        racine.handlers = [direct]
+        racine.setLevel(logging.INFO)
+        duree_directe = salves()
+        direct.close()
+
+        chemin = os.path.join(repertoire, "file.log")
+        ecouteur = configurer_journalisation(chemin, taille_max=taille_max, nb_archives=2)
+        # Sans la sortie console, pour ne mesurer que le fichier
+        ecouteur.handlers = ecouteur.handlers[:1]
+        duree_file = salves()
+        perdus = racine.handlers[0].perdus
+        ecouteur.stop()
+        occupation = sum(os.path.getsize(os.path.join(repertoire, nom))
+                         for nom in os.listdir(repertoire) if nom.startswith("file.log"))
+        racine.handlers, racine.level = anciens, ancien_niveau
+
+    print(f"Journalisation ({nb_messages} messages)")
+    print(f"  coût par appel : {duree_directe / nb_messages * 1e6:.1f} µs en direct, "
+          f"{duree_file / nb_messages * 1e6:.1f} µs via la file ({perdus} perdus)")
+    print(f"  disque avec rotation : {occupation / 1024:.0f} Kio "
+          f"(plafond {taille_max * 3 / 1024:.0f} Kio)")
+
+
+def bench_instrumentation(repetitions: int = 100000, nb_enonces: int = 40):
+    """Surcoût des mesures de latence, puis percentiles d'un pipeline simulé"""
+    print("Instrumentation des latences")
+    for actif in (False, True):
+        statistiques = StatistiquesLatence(actif=actif)
+        cout = _chronometrer(lambda: statistiques.enregistrer("etape", 0.001), repetitions)
+        print(f"  enregistrer ({'active' if actif else 'inactive'}) : {cout * 1000:.0f} ns")
+
+    statistiques = StatistiquesLatence()
+    navigateur = LanceurNavigateur(NavigateurEnregistreur(0.02), fenetre_doublons=0,
+                                   statistiques=statistiques)
+    aleatoire = random.Random(3)
+
+    def reconnaitre(audio: str) -> str:
+        time.sleep(aleatoire.uniform(0.05, 0.3))
+        return audio
+
+    def traiter(texte: str):
+        navigateur.ouvrir(f"https://exemple.com/{texte}")
+
+    pipeline = PipelineReconnaissance(reconnaitre, traiter, lambda e: None,
+                                      statistiques=statistiques)
+    for i in range(nb_enonces):
+        # Traîne du détecteur et filtre local entre la fin de la parole et la soumission
+        pipeline.soumettre(str(i), aleatoire.uniform(0.15, 0.25))
+        time.sleep(0.15)
+    while pipeline.en_attente:
+        time.sleep(0.05)
+    time.sleep(0.1)
+    pipeline.arreter()
+    navigateur.arreter()
+
+    for etape, p in statistiques.instantane().items():
+        print(f"  {etape:<15} p50 {p['p50']:>6.0f} ms  p95 {p['p95']:>6.0f} ms  p99 {p['p99']:>6.0f} ms")
+    correlation, etapes = statistiques.derniere_trace()
+    print(f"  commande #{correlation}: " + ", ".join(
+        f"{etape} {duree * 1000:.0f} ms" for etape, duree in etapes.items()
+    ))
+
+
+def bench_pipeline_sature(nb_enonces: int = 40, delai_service: float = 1.0,
+                          intervalle: float = 0.02):
+    """Service de reconnaissance bloqué: la capture ne doit jamais attendre la file"""
+    print(f"Pipeline saturé ({nb_enonces} énoncés toutes les {intervalle * 1000:.0f} ms, "
+          f"reconnaissance {delai_service * 1000:.0f} ms)")
+    traites = []
+
+    def reconnaitre(audio: str) -> str:
+        time.sleep(delai_service)
+        return audio
+
+    pipeline = PipelineReconnaissance(reconnaitre, traites.append, lambda e: None)
+    attentes = []
+    for i in range(nb_enonces):
+        debut = time.perf_counter()
+        pipeline.soumettre(str(i))
+        attentes.append(time.perf_counter() - debut)
+        time.sleep(intervalle)
+    fin = time.perf_counter() + 10 * delai_service
+    while pipeline.en_attente and time.perf_counter() < fin:
+        time.sleep(0.01)
+    pipeline.arreter(delai=1.0)
+
+    print(f"  soumission : max {max(attentes) * 1000:.2f} ms")
+    print(f"  traités {len(traites)}, abandonnés {pipeline.abandonnes}, "
+          f"en attente {pipeline.en_attente}")
+    _verifier(max(attentes) < 0.05, f"soumission bloquée {max(attentes) * 1000:.0f} ms")
+    _verifier(pipeline.abandonnes > 0, "aucun énoncé abandonné malgré la file pleine")
+    _verifier(len(traites) + pipeline.abandonnes == nb_enonces,
+              f"{nb_enonces - len(traites) - pipeline.abandonnes} énoncé(s) perdu(s) sans être comptés")
+    _verifier(traites == sorted(traites, key=int), "résultats traités dans le désordre")
+
+
+async def _charge_service(port: int, nb_clients: int, phrases: List[str]) -> float:
+    """Clients simultanés envoyant toutes leurs phrases d'affilée; retourne la durée"""
+    import asyncio
+
+    async def client():
+        lecteur, ecrivain = await asyncio.open_connection("127.0.0.1", port)
+        ecrivain.write("".join(f"{phrase}\n" for phrase in phrases).encode("utf-8"))
+        await ecrivain.drain()
+        for _ in phrases:
+            await lecteur.readline()
+        ecrivain.close()
+        await ecrivain.wait_closed()
+
+    debut = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(nb_clients)))
+    return time.perf_counter() - debut
+
+
+def bench_service(processus=(0, 1, 2, 4), nb_clients: int = 8, nb_phrases: int = 200,
+                  nb_mots_cles: int = 5000):
+    """Débit du service local selon le nombre de processus de calcul
+
+    Le registre de test compte nb_mots_cles mots-clés et les phrases sont
+    mal transcrites, pour que le rapprochement approximatif domine le coût.
+    """
+    import asyncio
+    import json
+    import tempfile
+
+    aleatoire = random.Random(5)
+    sites = [{"id": f"site{cle}", "nom": f"site{cle}", "url": f"https://site{cle}.com",
+              "mots_cles": list(mots)} for cle, mots in _generer_commandes(nb_mots_cles).items()]
+    for site_id, mots in _mots_cles_sites().items():
+        sites.append({"id": site_id.lower(), "nom": site_id, "url": "https://exemple.com",
+                      "mots_cles": list(mots)})
+    phrases = [aleatoire.choice(CORPUS_TRANSCRIPTIONS)[0] for _ in range(nb_phrases)]
+
+    print(f"Service local ({nb_clients} clients x {nb_phrases} phrases, {nb_mots_cles} mots-clés, "
+          f"{os.cpu_count()} cœurs)")
+    with tempfile.TemporaryDirectory() as repertoire:
+        chemin = os.path.join(repertoire, "commandes.json")
+        with open(chemin, "w", encoding="utf-8") as fichier:
+            json.dump({"sites": sites}, fichier)
+
+        async def mesurer(nb_processus: int) -> float:
+            service = ServiceCommandes(chemin, nb_processus)
+            port = await service.demarrer("127.0.0.1", 0)
+            try:
+                # Tour de chauffe: démarrage des processus, compilation des index
+                await _charge_service(port, max(1, nb_processus), phrases[:20])
+                return await _charge_service(port, nb_clients, phrases)
+            finally:
+                await service.fermer()
+
+        for nb_processus in processus:
+            duree = asyncio.run(mesurer(nb_processus))
+            print(f"  {nb_processus or 'sans'} processus : "
+                  f"{nb_clients * nb_phrases / duree:>8.0f} requêtes/s")
+
+    async def requetes_invalides() -> Tuple[List[dict], List[dict], List[dict]]:
+        """UTF-8 invalide puis ligne trop longue; exceptions non gérées de la boucle"""
+        erreurs_boucle = []
+        asyncio.get_running_loop().set_exception_handler(lambda _, contexte: erreurs_boucle.append(contexte))
+        service = ServiceCommandes()
+        port = await service.demarrer("127.0.0.1", 0)
+        reponses = []
+        try:
+            for donnees in (b"ouvre youtube\n\xff\xfe\nouvre github\n", b"a" * 100_000 + b"\n"):
+                lecteur, ecrivain = await asyncio.open_connection("127.0.0.1", port)
+                ecrivain.write(donnees)
+                await ecrivain.drain()
+                lignes = []
+                while True:
+                    ligne = await asyncio.wait_for(lecteur.readline(), 5.0)
+                    if not ligne:
+                        break
+                    lignes.append(json.loads(ligne))
+                    if len(lignes) == 3:
+                        break
+                reponses.append(lignes)
+                ecrivain.close()
+        finally:
+            await service.fermer()
+        return reponses[0], reponses[1], erreurs_boucle
+
+    illisible, trop_longue, erreurs_boucle = asyncio.run(requetes_invalides())
+    print(f"  requêtes invalides : {[r.get('cle') or r.get('erreur') for r in illisible]}, "
+          f"{[r.get('erreur') for r in trop_longue]}")
+    _verifier([r.get("cle") for r in illisible] == ["youtube", None, "github"]
+              and "erreur" in illisible[1], f"UTF-8 invalide: réponses {illisible}")
+    _verifier(len(trop_longue) == 1 and "erreur" in trop_longue[0],
+              f"ligne trop longue: réponses {trop_longue}")
+    _verifier(not erreurs_boucle, f"exceptions non gérées: {erreurs_boucle}")
+
+
+_SCRIPT_DEMARRAGE = """
+import time
+debut = time.perf_counter()
+import main
+fin_import = time.perf_counter()
+
+class Application(main.AssistantVocalApp):
+    def _parler(self, *args, **kwargs):
+        pass
+
+    def _apres_premier_affichage(self):
+        print(fin_import - debut, time.perf_counter() - debut)
+        self.root.quit()
+
+Application().root.mainloop()
+"""
+
+_SCRIPT_IMPORTS_DIFFERES = """
+import time
+debut = time.perf_counter()
+import pyttsx3, speech_recognition, numpy
+print(time.perf_counter() - debut)
+"""
+
+
+def bench_demarrage(repetitions: int = 5):
+    """Temps d'import et délai avant le premier affichage de la fenêtre"""
+    repertoire = os.path.dirname(os.path.abspath(__file__))
+
+    def executer(script: str) -> List[float]:
+        sortie = subprocess.run(
+            [sys.executable, "-c", script], cwd=repertoire,
+            capture_output=True, text=True, check=True
+        ).stdout
+        return [float(valeur) for valeur in sortie.split()[-2:]] if sortie else []
+
+    imports, affichages, differes = [], [], []
+    for _ in range(repetitions):
+        duree_import, premier_affichage = executer(_SCRIPT_DEMARRAGE)
+        imports.append(duree_import)
+        affichages.append(premier_affichage)
+        differes.append(executer(_SCRIPT_IMPORTS_DIFFERES)[-1])
+
+    print(f"Démarrage (médiane sur {repetitions} lancements)")
+    print(f"  import de main            : {statistics.median(imports) * 1000:.0f} ms")
+    print(f"  premier affichage         : {statistics.median(affichages) * 1000:.0f} ms")
+    print(f"  imports différés (TTS, reconnaissance, NumPy): "
+          f"{statistics.median(differes) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    bench_dispatch()
+    bench_flou()
+    bench_grammaire()
+    bench_speculation()
+    bench_endpointing(sys.argv[1] if len(sys.argv) > 1 else None)
+    bench_tampon_audio()
+    bench_pretraitement()
+    bench_disjoncteur()
+    bench_couverture()
+    bench_cycle_ecoute()
+    bench_filtre_local()
+    bench_lanceur()
+    bench_journalisation()
+    bench_historique()
+    bench_instrumentation()
+    bench_pipeline_sature()
+    bench_service()
+    bench_canal_interface()
+    bench_demarrage()
+    sys.exit(1 if ECHECS else 0)
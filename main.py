@@ -1,739 +1,3412 @@
-"""
-Assistant Vocal Intelligent
-Version Professionnelle - Optimisée
-"""
-import webbrowser
-import pyttsx3
-import speech_recognition as sr
-import threading
-import customtkinter as ctk
-import urllib.parse
-from dataclasses import dataclass
-from typing import Dict, Tuple, Callable, Optional, List
-import logging
-from enum import Enum
-from datetime import datetime
-import sys
-import os
-
-# Configuration du logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('assistant_vocal.log', encoding='utf-8'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
-logger = logging.getLogger(__name__)
-
-# Constantes
-class Sites(Enum):
-    """Sites web supportés par l'assistant"""
-    YOUTUBE = "YouTube"
-    WHATSAPP = "WhatsApp"
-    TIKTOK = "TikTok"
-    FACEBOOK = "Facebook"
-    GOOGLE = "Google"
-    GITHUB = "GitHub"
-
-URLS = {
-    Sites.YOUTUBE: "https://www.youtube.com",
-    Sites.WHATSAPP: "https://web.whatsapp.com",
-    Sites.TIKTOK: "https://www.tiktok.com",
-    Sites.FACEBOOK: "https://www.facebook.com",
-    Sites.GOOGLE: "https://www.google.com",
-    Sites.GITHUB: "https://github.com"
-}
-
-MOTEUR_RECHERCHE = "https://www.google.com/search?q="
-
-@dataclass
-class Commande:
-    """Représente une commande vocale"""
-    action: Optional[Callable]
-    description: str
-    mots_cles: Tuple[str, ...]
-    categorie: str = "general"
-
-class ModeApparence(Enum):
-    """Modes d'apparence de l'interface"""
-    SOMBRE = "dark"
-    CLAIR = "light"
-    SYSTEME = "system"
-
-class AssistantVocalApp:
-    """Application principale de l'assistant vocal"""
-
-    def __init__(self):
-        """Initialise l'application avec toutes les configurations"""
-        self._initialiser_parametres()
-        self._configurer_interface()
-        self._initialiser_moteur_vocal()
-        self._initialiser_variables_etat()
-        self._creer_widgets()
-        self._demarrer_assistant()
-
-    def _initialiser_parametres(self):
-        """Initialise les paramètres de l'application"""
-        self.mode_apparence = ModeApparence.SOMBRE
-        self.langue = "fr-FR"
-        self.vitesse_parole = 170
-        self.volume_parole = 0.9
-
-    def _configurer_interface(self):
-        """Configure l'interface graphique"""
-        ctk.set_appearance_mode(self.mode_apparence.value)
-        ctk.set_default_color_theme("blue")
-
-        self.root = ctk.CTk()
-        self.root.title("DonCharlesAssistant")
-        self.root.geometry("800x600")
-        self.root.resizable(False, False)
-
-        # Protection contre la fermeture brusque
-        self.root.protocol("WM_DELETE_WINDOW", self.quitter)
-
-        # Centre la fenêtre
-        self.root.update_idletasks()
-        width = self.root.winfo_width()
-        height = self.root.winfo_height()
-        x = (self.root.winfo_screenwidth() // 2) - (width // 2)
-        y = (self.root.winfo_screenheight() // 2) - (height // 2)
-        self.root.geometry(f'{width}x{height}+{x}+{y}')
-
-    def _initialiser_moteur_vocal(self):
-        """Initialise et configure le moteur de synthèse vocale"""
-        try:
-            self.engine = pyttsx3.init()
-
-            # Configuration des propriétés
-            self.engine.setProperty('rate', self.vitesse_parole)
-            self.engine.setProperty('volume', self.volume_parole)
-
-            # Chercher une voix appropriée
-            self._configurer_voix()
-
-            logger.info("Moteur vocal initialisé avec succès")
-
-        except Exception as e:
-            logger.error(f"Erreur d'initialisation du moteur vocal: {e}")
-            # Créer un moteur factice pour éviter les crashs
-            self.engine = type('obj', (object,), {
-                'say': lambda x: print(f"TTS: {x}"),
-                'runAndWait': lambda: None,
-                'setProperty': lambda x, y: None
-            })()
-
-    def _configurer_voix(self):
-        """Configure la voix de synthèse"""
-        try:
-            voices = self.engine.getProperty('voices')
-
-            # Priorité 1: Voix française
-            french_voices = [
-                v for v in voices
-                if any(fr_indicator in v.name.lower() for fr_indicator in ['fr', 'french', 'français'])
-            ]
-
-            if french_voices:
-                self.engine.setProperty('voice', french_voices[0].id)
-                logger.info(f"Voix française sélectionnée: {french_voices[0].name}")
-                return
-
-            # Priorité 2: Voix anglaise féminine
-            female_voices = [
-                v for v in voices
-                if 'female' in v.name.lower() or 'zira' in v.name.lower()
-            ]
-
-            if female_voices:
-                self.engine.setProperty('voice', female_voices[0].id)
-                logger.info(f"Voix féminine sélectionnée: {female_voices[0].name}")
-                return
-
-            # Priorité 3: Première voix disponible
-            if voices:
-                self.engine.setProperty('voice', voices[0].id)
-                logger.info(f"Voix par défaut sélectionnée: {voices[0].name}")
-
-        except Exception as e:
-            logger.warning(f"Configuration de voix échouée: {e}")
-
-    def _initialiser_variables_etat(self):
-        """Initialise les variables d'état de l'application"""
-        self.ecoute_active = False
-        self.thread_ecoute = None
-        self.reconnaissance_active = True
-        self.commandes_executees = []
-
-        # Initialisation des commandes
-        self._initialiser_commandes()
-
-    def _initialiser_commandes(self):
-        """Initialise le dictionnaire des commandes"""
-        self.commandes = {
-            Sites.YOUTUBE: Commande(
-                action=lambda: self._ouvrir_site(Sites.YOUTUBE),
-                description="Ouverture de YouTube",
-                mots_cles=("youtube", "ouverture youtube", "ouvre youtube", "lance youtube"),
-                categorie="sites"
-            ),
-            Sites.WHATSAPP: Commande(
-                action=lambda: self._ouvrir_site(Sites.WHATSAPP),
-                description="Ouverture de WhatsApp Web",
-                mots_cles=("whatsapp", "ouvrir whatsapp", "whatsapp web", "lance whatsapp"),
-                categorie="sites"
-            ),
-            Sites.TIKTOK: Commande(
-                action=lambda: self._ouvrir_site(Sites.TIKTOK),
-                description="Ouverture de TikTok",
-                mots_cles=("tiktok", "ouvre tiktok", "tiktok.com", "lance tiktok"),
-                categorie="sites"
-            ),
-            Sites.FACEBOOK: Commande(
-                action=lambda: self._ouvrir_site(Sites.FACEBOOK),
-                description="Ouverture de Facebook",
-                mots_cles=("facebook", "ouvre facebook", "fb", "lance facebook"),
-                categorie="sites"
-            ),
-            Sites.GOOGLE: Commande(
-                action=lambda: self._ouvrir_site(Sites.GOOGLE),
-                description="Ouverture de Google",
-                mots_cles=("google", "ouvre google", "lance google"),
-                categorie="sites"
-            ),
-            Sites.GITHUB: Commande(
-                action=lambda: self._ouvrir_site(Sites.GITHUB),
-                description="Ouverture de GitHub",
-                mots_cles=("github", "ouvre github", "git hub", "lance github"),
-                categorie="sites"
-            ),
-            "recherche": Commande(
-                action=None,
-                description="Recherche sur internet",
-                mots_cles=("rechercher", "chercher", "trouve", "search", "recherche", "cherche"),
-                categorie="recherche"
-            ),
-            "quitter": Commande(
-                action=lambda: self.root.after(100, self.quitter),
-                description="Fermeture de l'application",
-                mots_cles=("quitter", "arrêter", "stop", "ferme", "au revoir", "exit", "quitte"),
-                categorie="systeme"
-            ),
-            "aide": Commande(
-                action=lambda: self._afficher_aide(),
-                description="Affiche l'aide",
-                mots_cles=("aide", "help", "commandes", "que peux-tu faire", "comment utiliser"),
-                categorie="systeme"
-            )
-        }
-
-    def _creer_widgets(self):
-        """Crée tous les widgets de l'interface"""
-        # Configuration du grid principal
-        self.root.grid_columnconfigure(0, weight=1)
-
-        self._creer_en_tete()
-        self._creer_panel_sites()
-        self._creer_panel_recherche()
-        self._creer_panel_controle()
-        self._creer_console_statut()
-        self._creer_pied_page()
-
-    def _creer_en_tete(self):
-        """Crée l'en-tête de l'application"""
-        frame_titre = ctk.CTkFrame(self.root, corner_radius=10)
-        frame_titre.grid(row=0, column=0, padx=15, pady=(15, 5), sticky="ew")
-        frame_titre.grid_columnconfigure(0, weight=1)
-
-        titre = ctk.CTkLabel(
-            frame_titre,
-            text="🎙️ Assistant Vocal Intelligent",
-            font=("Arial", 26, "bold")
-        )
-        titre.grid(row=0, column=0, pady=15)
-
-        sous_titre = ctk.CTkLabel(
-            frame_titre,
-            text="Contrôle vocal de votre navigation web",
-            font=("Arial", 14),
-            text_color="gray"
-        )
-        sous_titre.grid(row=1, column=0, pady=(0, 10))
-
-    def _creer_panel_sites(self):
-        """Crée le panel des sites rapides"""
-        frame_sites = ctk.CTkFrame(self.root, corner_radius=10)
-        frame_sites.grid(row=1, column=0, padx=15, pady=5, sticky="ew")
-
-        label_sites = ctk.CTkLabel(
-            frame_sites,
-            text="📋 Sites Rapides",
-            font=("Arial", 16, "bold")
-        )
-        label_sites.pack(pady=(10, 5))
-
-        # Grille de boutons pour les sites
-        frame_boutons = ctk.CTkFrame(frame_sites)
-        frame_boutons.pack(pady=10, padx=10)
-
-        sites_a_afficher = [
-            (Sites.YOUTUBE, "🔴 YouTube", "#FF0000"),
-            (Sites.WHATSAPP, "🟢 WhatsApp", "#25D366"),
-            (Sites.TIKTOK, "⚫ TikTok", "#000000"),
-            (Sites.FACEBOOK, "🔵 Facebook", "#1877F2"),
-            (Sites.GOOGLE, "🔶 Google", "#4285F4"),
-            (Sites.GITHUB, "📊 GitHub", "#333333")
-        ]
-
-        for i, (site, texte, couleur) in enumerate(sites_a_afficher):
-            row = i // 3
-            col = i % 3
-
-            btn = ctk.CTkButton(
-                frame_boutons,
-                text=texte,
-                command=lambda s=site: self._ouvrir_site(s),
-                width=140,
-                height=40,
-                font=("Arial", 12),
-                fg_color=couleur,
-                hover_color=self._eclaircir_couleur(couleur),
-                corner_radius=8
-            )
-            btn.grid(row=row, column=col, padx=8, pady=8)
-
-    def _creer_panel_recherche(self):
-        """Crée le panel de recherche"""
-        frame_recherche = ctk.CTkFrame(self.root, corner_radius=10)
-        frame_recherche.grid(row=2, column=0, padx=15, pady=5, sticky="ew")
-
-        label_recherche = ctk.CTkLabel(
-            frame_recherche,
-            text="🔍 Recherche Web",
-            font=("Arial", 16, "bold")
-        )
-        label_recherche.pack(pady=(10, 5))
-
-        # Champ de recherche avec bouton
-        self.entry_recherche = ctk.CTkEntry(
-            frame_recherche,
-            width=450,
-            height=45,
-            placeholder_text="Entrez votre recherche ou dites 'Rechercher [mot-clé]'...",
-            font=("Arial", 13),
-            corner_radius=10
-        )
-        self.entry_recherche.pack(pady=10, padx=20)
-        self.entry_recherche.bind('<Return>', lambda e: self._effectuer_recherche())
-
-        btn_frame = ctk.CTkFrame(frame_recherche, fg_color="transparent")
-        btn_frame.pack(pady=(0, 10))
-
-        btn_rechercher = ctk.CTkButton(
-            btn_frame,
-            text="🔎 Lancer la recherche",
-            command=self._effectuer_recherche,
-            width=200,
-            height=40,
-            font=("Arial", 13, "bold"),
-            corner_radius=10
-        )
-        btn_rechercher.pack(side="left", padx=5)
-
-        btn_effacer = ctk.CTkButton(
-            btn_frame,
-            text="🗑️ Effacer",
-            command=lambda: self.entry_recherche.delete(0, 'end'),
-            width=100,
-            height=40,
-            font=("Arial", 12),
-            fg_color="gray",
-            hover_color="dark gray",
-            corner_radius=10
-        )
-        btn_effacer.pack(side="left", padx=5)
-
-    def _creer_panel_controle(self):
-        """Crée le panel de contrôle vocal"""
-        frame_controle = ctk.CTkFrame(self.root, corner_radius=10)
-        frame_controle.grid(row=3, column=0, padx=15, pady=5, sticky="ew")
-
-        self.btn_ecouter = ctk.CTkButton(
-            frame_controle,
-            text="🎤 Démarrer l'écoute vocale",
-            command=self._toggle_ecoute,
-            width=280,
-            height=50,
-            font=("Arial", 15, "bold"),
-            corner_radius=12
-        )
-        self.btn_ecouter.pack(pady=15)
-
-        # Indicateur d'activité
-        self.label_indicateur = ctk.CTkLabel(
-            frame_controle,
-            text="● Écoute inactive",
-            text_color="gray",
-            font=("Arial", 12)
-        )
-        self.label_indicateur.pack(pady=(0, 10))
-
-    def _creer_console_statut(self):
-        """Crée la console de statut"""
-        frame_console = ctk.CTkFrame(self.root, corner_radius=10)
-        frame_console.grid(row=4, column=0, padx=15, pady=5, sticky="nsew")
-
-        # Configuration pour l'expansion
-        self.root.grid_rowconfigure(4, weight=1)
-        frame_console.grid_columnconfigure(0, weight=1)
-        frame_console.grid_rowconfigure(0, weight=1)
-
-        label_console = ctk.CTkLabel(
-            frame_console,
-            text="📝 Journal d'activité",
-            font=("Arial", 14, "bold")
-        )
-        label_console.grid(row=0, column=0, padx=10, pady=5, sticky="w")
-
-        # Zone de texte pour les logs
-        self.text_console = ctk.CTkTextbox(
-            frame_console,
-            font=("Consolas", 11),
-            corner_radius=8
-        )
-        self.text_console.grid(row=1, column=0, padx=10, pady=(0, 10), sticky="nsew")
-        self.text_console.configure(state="disabled")
-
-    def _creer_pied_page(self):
-        """Crée le pied de page"""
-        frame_pied = ctk.CTkFrame(self.root, height=50, corner_radius=10)
-        frame_pied.grid(row=5, column=0, padx=15, pady=(5, 15), sticky="ew")
-
-        btn_quitter = ctk.CTkButton(
-            frame_pied,
-            text="🚪 Quitter l'application",
-            command=self.quitter,
-            width=200,
-            height=40,
-            font=("Arial", 13),
-            fg_color="#D32F2F",
-            hover_color="#B71C1C",
-            corner_radius=10
-        )
-        btn_quitter.pack(pady=10)
-
-        # Statut en bas
-        self.label_statut = ctk.CTkLabel(
-            frame_pied,
-            text="Prêt",
-            font=("Arial", 11),
-            text_color="green"
-        )
-        self.label_statut.pack(pady=(0, 5))
-
-    def _demarrer_assistant(self):
-        """Démarre l'assistant avec un message de bienvenue"""
-        message_accueil = (
-            f"Assistant vocal initialisé à {datetime.now().strftime('%H:%M:%S')}. "
-            "Prêt à recevoir vos commandes."
-        )
-        self._mettre_a_jour_console(message_accueil, "INFO")
-        self._mettre_a_jour_statut("Prêt")
-        self._parler("Assistant vocal initialisé. Je suis prêt à vous aider.")
-
-    def _ouvrir_site(self, site: Sites):
-        """Ouvre un site web spécifique"""
-        try:
-            if site in URLS:
-                url = URLS[site]
-                webbrowser.open(url)
-
-                message = f"Ouverture de {site.value}"
-                self._mettre_a_jour_console(message, "SUCCES")
-                self._mettre_a_jour_statut(f"Ouvert: {site.value}")
-                self._parler(message)
-
-                # Historique
-                self.commandes_executees.append({
-                    'type': 'site',
-                    'site': site.value,
-                    'url': url,
-                    'timestamp': datetime.now()
-                })
-
-                logger.info(f"Site ouvert: {site.value} ({url})")
-
-        except Exception as e:
-            erreur_msg = f"Erreur lors de l'ouverture de {site.value}: {str(e)}"
-            self._mettre_a_jour_console(erreur_msg, "ERREUR")
-            self._mettre_a_jour_statut("Erreur")
-            logger.error(erreur_msg)
-
-    def _effectuer_recherche(self, requete: Optional[str] = None):
-        """Effectue une recherche web"""
-        try:
-            if not requete:
-                requete = self.entry_recherche.get().strip()
-
-            if not requete:
-                self._mettre_a_jour_console("Requête vide", "AVERTISSEMENT")
-                self._mettre_a_jour_statut("Requête vide")
-                self._parler("Veuillez entrer une requête de recherche.")
-                return
-
-            requete_encodee = urllib.parse.quote(requete)
-            url_recherche = MOTEUR_RECHERCHE + requete_encodee
-            webbrowser.open(url_recherche)
-
-            message = f"Recherche: '{requete}'"
-            self._mettre_a_jour_console(message, "SUCCES")
-            self._mettre_a_jour_statut(f"Recherche: {requete[:20]}...")
-            self._parler(f"Recherche pour {requete}.")
-
-            # Historique
-            self.commandes_executees.append({
-                'type': 'recherche',
-                'requete': requete,
-                'url': url_recherche,
-                'timestamp': datetime.now()
-            })
-
-            logger.info(f"Recherche effectuée: {requete}")
-
-        except Exception as e:
-            erreur_msg = f"Erreur de recherche: {str(e)}"
-            self._mettre_a_jour_console(erreur_msg, "ERREUR")
-            self._mettre_a_jour_statut("Erreur recherche")
-            logger.error(erreur_msg)
-
-    def _toggle_ecoute(self):
-        """Active ou désactive l'écoute vocale"""
-        if self.ecoute_active:
-            self._arreter_ecoute()
-        else:
-            self._demarrer_ecoute()
-
-    def _demarrer_ecoute(self):
-        """Démarre l'écoute vocale"""
-        try:
-            self.ecoute_active = True
-            self.btn_ecouter.configure(
-                text="⏸️ Arrêter l'écoute",
-                fg_color="#D32F2F",
-                hover_color="#B71C1C"
-            )
-            self.label_indicateur.configure(
-                text="● Écoute active - Parlez maintenant",
-                text_color="green"
-            )
-
-            self._mettre_a_jour_console("Écoute vocale activée", "INFO")
-            self._mettre_a_jour_statut("Écoute active")
-            self._parler("Écoute activée. Je vous écoute.")
-
-            # Démarrer le thread d'écoute
-            self.thread_ecoute = threading.Thread(
-                target=self._boucle_ecoute,
-                daemon=True
-            )
-            self.thread_ecoute.start()
-
-        except Exception as e:
-            self._mettre_a_jour_console(f"Erreur démarrage écoute: {e}", "ERREUR")
-            self.ecoute_active = False
-
-    def _arreter_ecoute(self):
-        """Arrête l'écoute vocale"""
-        self.ecoute_active = False
-        self.btn_ecouter.configure(
-            text="🎤 Démarrer l'écoute",
-            fg_color=ctk.ThemeManager.theme["CTkButton"]["fg_color"],
-            hover_color=ctk.ThemeManager.theme["CTkButton"]["hover_color"]
-        )
-        self.label_indicateur.configure(
-            text="● Écoute inactive",
-            text_color="gray"
-        )
-
-        self._mettre_a_jour_console("Écoute vocale désactivée", "INFO")
-        self._mettre_a_jour_statut("Écoute inactive")
-
-    def _boucle_ecoute(self):
-        """Boucle principale d'écoute vocale"""
-        recognizer = sr.Recognizer()
-
-        with sr.Microphone() as source:
-            # Ajustement au bruit ambiant
-            recognizer.adjust_for_ambient_noise(source, duration=0.5)
-
-            while self.ecoute_active:
-                try:
-                    self.label_indicateur.configure(text="● Écoute active - En attente...")
-
-                    # Écoute avec timeout
-                    audio = recognizer.listen(
-                        source,
-                        timeout=5,
-                        phrase_time_limit=10
-                    )
-
-                    self.label_indicateur.configure(text="● Écoute active - Traitement...")
-
-                    # Reconnaissance
-                    texte = recognizer.recognize_google(
-                        audio,
-                        language=self.langue
-                    ).lower()
-
-                    self._mettre_a_jour_console(f"📢 Reconnu: {texte}", "COMMANDE")
-
-                    if not self._traiter_commande(texte):
-                        self._mettre_a_jour_console(
-                            "Commande non reconnue. Dites 'aide' pour la liste.",
-                            "AVERTISSEMENT"
-                        )
-                        self._parler("Je n'ai pas compris. Essayez une autre commande.")
-
-                except sr.WaitTimeoutError:
-                    continue
-                except sr.UnknownValueError:
-                    self._mettre_a_jour_console("Parole non reconnue", "AVERTISSEMENT")
-                except sr.RequestError as e:
-                    erreur_msg = f"Service reconnaissance: {e}"
-                    self._mettre_a_jour_console(erreur_msg, "ERREUR")
-                    self._parler("Problème de connexion internet.")
-                    logger.error(erreur_msg)
-                except Exception as e:
-                    erreur_msg = f"Erreur écoute: {e}"
-                    self._mettre_a_jour_console(erreur_msg, "ERREUR")
-                    logger.error(erreur_msg)
-
-    def _traiter_commande(self, texte: str) -> bool:
-        """Traite une commande vocale reconnue"""
-        texte_lower = texte.lower().strip()
-
-        # Recherche dans toutes les commandes
-        for cle, commande in self.commandes.items():
-            for mot_cle in commande.mots_cles:
-                if mot_cle in texte_lower:
-                    if commande.action:
-                        # Exécuter l'action
-                        self.root.after(0, commande.action)
-                        self._mettre_a_jour_console(
-                            f"Commande exécutée: {commande.description}",
-                            "SUCCES"
-                        )
-                        return True
-
-        # Recherche spécifique
-        if any(mot in texte_lower for mot in ["rechercher", "chercher", "recherche", "cherche"]):
-            # Extraire la requête après le mot-clé
-            mots = texte_lower.split()
-            for i, mot in enumerate(mots):
-                if mot in ["rechercher", "chercher", "recherche", "cherche"]:
-                    if i + 1 < len(mots):
-                        requete = " ".join(mots[i+1:])
-                        if requete:
-                            self.root.after(0, lambda r=requete: self._effectuer_recherche(r))
-                            return True
-
-        return False
-
-    def _afficher_aide(self):
-        """Affiche l'aide des commandes disponibles"""
-        sites = [site.value for site in Sites]
-        message = (
-            f"Commandes disponibles:\n"
-            f"- Sites: {', '.join(sites)}\n"
-            f"- Recherche: 'rechercher [votre recherche]'\n"
-            f"- Autres: 'aide', 'quitter'"
-        )
-
-        self._mettre_a_jour_console("Affichage de l'aide", "INFO")
-        self._parler(f"Vous pouvez dire: ouvrir {', ou '.join(sites)}. Ou effectuer une recherche.")
-
-    def _mettre_a_jour_console(self, message: str, niveau: str = "INFO"):
-        """Ajoute un message à la console"""
-        couleurs = {
-            "INFO": "white",
-            "SUCCES": "#4CAF50",
-            "ERREUR": "#F44336",
-            "AVERTISSEMENT": "#FF9800",
-            "COMMANDE": "#2196F3"
-        }
-
-        couleur = couleurs.get(niveau, "white")
-        timestamp = datetime.now().strftime("%H:%M:%S")
-
-        self.text_console.configure(state="normal")
-        self.text_console.insert(
-            "end",
-            f"[{timestamp}] {message}\n",
-            niveau
-        )
-        self.text_console.tag_config(niveau, foreground=couleur)
-        self.text_console.see("end")
-        self.text_console.configure(state="disabled")
-
-    def _mettre_a_jour_statut(self, message: str):
-        """Met à jour le statut en bas de l'interface"""
-        self.label_statut.configure(text=message)
-
-    def _parler(self, message: str):
-        """Prononce un message vocalement"""
-        try:
-            if self.reconnaissance_active:
-                self.engine.say(message)
-                self.engine.runAndWait()
-        except Exception as e:
-            logger.warning(f"Synthèse vocale échouée: {e}")
-            # Fallback: afficher dans la console
-            self._mettre_a_jour_console(f"(TTS) {message}", "INFO")
-
-    def _eclaircir_couleur(self, couleur: str) -> str:
-        """Éclaircit une couleur hexadécimale"""
-        # Conversion simplifiée - retourne une couleur plus claire
-        return couleur  # Pour l'instant, retourne la même couleur
-
-    def quitter(self):
-        """Ferme l'application proprement"""
-        self._arreter_ecoute()
-        self._mettre_a_jour_console("Fermeture de l'application...", "INFO")
-        self._mettre_a_jour_statut("Fermeture...")
-
-        logger.info("Application fermée proprement")
-
-        # Petite pause pour laisser les messages s'afficher
-        self.root.after(500, self.root.quit)
-        self.root.after(600, self.root.destroy)
-
-
-def main():
-    """Point d'entrée principal de l'application"""
-    try:
-        logger.info("=" * 50)
-        logger.info("Démarrage de l'Assistant Vocal")
-        logger.info("=" * 50)
-
-        app = AssistantVocalApp()
-        app.root.mainloop()
-
-    except KeyboardInterrupt:
-        logger.info("Application interrompue par l'utilisateur")
-    except Exception as e:
-        logger.critical(f"Erreur critique: {e}", exc_info=True)
-        # Message d'erreur utilisateur
-        ctk.CTk().withdraw()
-        ctk.CTkMessageBox(
-            title="Erreur Critique",
-            message=f"L'application a rencontré une erreur:\n{str(e)}",
-            icon="cancel"
-        )
-    finally:
-        logger.info("Application terminée")
-
-
-if __name__ == "__main__":
+"""
+Assistant Vocal Intelligent
+Version Professionnelle - Optimisée
+"""
+import webbrowser
+import threading
+import time
+import queue
+import random
+import customtkinter as ctk
+import hashlib
+import itertools
+import json
+import sqlite3
+import wave
+from collections import deque, OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Tuple, Callable, Optional, List
+import logging
+import logging.handlers
+from enum import Enum, IntEnum
+from datetime import datetime
+import sys
+import os
+
+from noyau import (
+    FICHIER_COMMANDES, ChangementsRegistre, Commande, Intention, MoteurCommandes, Site
+)
+
+logger = logging.getLogger(__name__)
+
+# Constantes
+# État, cache, historique et journal à côté du code, quel que soit le répertoire courant
+REPERTOIRE_APPLICATION = os.path.dirname(os.path.abspath(__file__))
+FICHIER_ETAT = os.path.join(REPERTOIRE_APPLICATION, "assistant_vocal_etat.json")
+REPERTOIRE_CACHE_PAROLE = os.path.join(REPERTOIRE_APPLICATION, "cache_parole")
+FICHIER_HISTORIQUE = os.path.join(REPERTOIRE_APPLICATION, "assistant_vocal_historique.db")
+FICHIER_JOURNAL = os.path.join(REPERTOIRE_APPLICATION, "assistant_vocal.log")
+FORMAT_JOURNAL = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+COULEURS_NIVEAUX = {
+    "INFO": "white",
+    "SUCCES": "#4CAF50",
+    "ERREUR": "#F44336",
+    "AVERTISSEMENT": "#FF9800",
+    "COMMANDE": "#2196F3"
+}
+
+class FormateurJson(logging.Formatter):
+    """Un enregistrement JSON par ligne, pour l'analyse automatique des journaux"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        donnees = {
+            "instant": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "niveau": record.levelname,
+            "module": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            donnees["exception"] = self.formatException(record.exc_info)
+        return json.dumps(donnees, ensure_ascii=False)
+
+
+class FileJournal(logging.handlers.QueueHandler):
+    """Dépose les enregistrements dans une file bornée, sans les formater
+
+    Le formatage et les écritures disque sont faits par le thread du
+    QueueListener; quand la file est pleine, l'enregistrement est perdu
+    plutôt que de bloquer l'appelant.
+    """
+
+    def __init__(self, file: queue.Queue):
+        super().__init__(file)
+        self.perdus = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.perdus += 1
+
+
+class EcouteurJournal(logging.handlers.QueueListener):
+    """Thread d'écriture des journaux; l'arrêt attend une place dans la file pleine"""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+def configurer_journalisation(fichier: str = FICHIER_JOURNAL, niveau: int = logging.INFO,
+                              taille_max: int = 5 * 1024 * 1024, nb_archives: int = 3,
+                              rotation_quotidienne: bool = False, format_json: bool = False,
+                              capacite: int = 10000) -> EcouteurJournal:
+    """Installe la journalisation asynchrone; retourne l'écouteur à arrêter en fin de programme
+
+    Le fichier tourne à taille_max octets (ou à minuit avec
+    rotation_quotidienne) en conservant nb_archives anciens fichiers.
+    """
+    if rotation_quotidienne:
+        sortie_fichier = logging.handlers.TimedRotatingFileHandler(
+            fichier, when="midnight", backupCount=nb_archives, encoding="utf-8"
+        )
+    else:
+        sortie_fichier = logging.handlers.RotatingFileHandler(
+            fichier, maxBytes=taille_max, backupCount=nb_archives, encoding="utf-8"
+        )
+    sortie_fichier.setFormatter(FormateurJson() if format_json else logging.Formatter(FORMAT_JOURNAL))
+    sortie_console = logging.StreamHandler(sys.stdout)
+    sortie_console.setFormatter(logging.Formatter(FORMAT_JOURNAL))
+
+    file = queue.Queue(capacite)
+    ecouteur = EcouteurJournal(
+        file, sortie_fichier, sortie_console, respect_handler_level=True
+    )
+    racine = logging.getLogger()
+    for gestionnaire in list(racine.handlers):
+        racine.removeHandler(gestionnaire)
+    racine.addHandler(FileJournal(file))
+    racine.setLevel(niveau)
+    ecouteur.start()
+    return ecouteur
+
+
+class EtatPersistant:
+    """Petit magasin clé/valeur JSON conservé entre deux lancements"""
+
+    def __init__(self, chemin: str = FICHIER_ETAT):
+        self.chemin = chemin
+        self._verrou = threading.Lock()
+        try:
+            with open(chemin, encoding="utf-8") as fichier:
+                self._valeurs = json.load(fichier)
+        except (OSError, ValueError):
+            self._valeurs = {}
+
+    def lire(self, cle: str, defaut=None):
+        """Retourne la valeur enregistrée pour la clé"""
+        return self._valeurs.get(cle, defaut)
+
+    def ecrire(self, cle: str, valeur):
+        """Enregistre une valeur et sauvegarde le fichier de façon atomique"""
+        with self._verrou:
+            self._valeurs[cle] = valeur
+            temporaire = self.chemin + ".tmp"
+            try:
+                with open(temporaire, "w", encoding="utf-8") as fichier:
+                    json.dump(self._valeurs, fichier, ensure_ascii=False, indent=2)
+                os.replace(temporaire, self.chemin)
+            except OSError as e:
+                logger.warning(f"Sauvegarde de l'état impossible: {e}")
+
+
+class EntreeHistorique:
+    """Commande exécutée (enregistrement compact)"""
+
+    __slots__ = ("type", "cible", "url", "horodatage")
+
+    def __init__(self, type: str, cible: str, url: str, horodatage: float):
+        self.type = type
+        self.cible = cible
+        self.url = url
+        self.horodatage = horodatage
+
+    @property
+    def date(self) -> datetime:
+        return datetime.fromtimestamp(self.horodatage)
+
+    def __repr__(self):
+        return f"EntreeHistorique({self.type!r}, {self.cible!r}, {self.date:%Y-%m-%d %H:%M:%S})"
+
+
+class HistoriqueCommandes:
+    """Historique des commandes: fin récente en mémoire, journal SQLite sur disque
+
+    Les ajouts ne font qu'empiler l'entrée; un thread d'écriture les
+    enregistre par lots, dans une transaction par lot. Les requêtes par type,
+    cible et période s'appuient sur des index. Les dernières entrées sans
+    filtre sont lues en mémoire (`recentes`), y compris celles que le thread
+    d'écriture n'a pas encore enregistrées.
+    """
+
+    def __init__(self, chemin: str = FICHIER_HISTORIQUE, taille_memoire: int = 200,
+                 taille_lot: int = 64, periode_ecriture: float = 1.0):
+        self.chemin = chemin
+        self.recentes: deque = deque(maxlen=taille_memoire)
+        self._taille_lot = taille_lot
+        self._periode_ecriture = periode_ecriture
+        self._file: queue.Queue = queue.Queue()
+
+        self._lecture = sqlite3.connect(chemin, check_same_thread=False)
+        self._verrou_lecture = threading.Lock()
+        with self._lecture:
+            self._lecture.execute("PRAGMA journal_mode=WAL")
+            self._lecture.execute(
+                "CREATE TABLE IF NOT EXISTS historique ("
+                "id INTEGER PRIMARY KEY, horodatage REAL NOT NULL, "
+                "type TEXT NOT NULL, cible TEXT NOT NULL, url TEXT NOT NULL)"
+            )
+            self._lecture.execute(
+                "CREATE INDEX IF NOT EXISTS idx_historique_horodatage ON historique (horodatage)"
+            )
+            self._lecture.execute(
+                "CREATE INDEX IF NOT EXISTS idx_historique_type_cible "
+                "ON historique (type, cible, horodatage)"
+            )
+
+        self._ecrivain = threading.Thread(target=self._ecrire, name="historique", daemon=True)
+        self._ecrivain.start()
+
+    def ajouter(self, type: str, cible: str, url: str):
+        """Enregistre une commande exécutée (ne bloque jamais)"""
+        entree = EntreeHistorique(type, cible, url, time.time())
+        self.recentes.append(entree)
+        self._file.put(entree)
+
+    def _ecrire(self):
+        """Thread d'écriture: insère les entrées par lots"""
+        connexion = sqlite3.connect(self.chemin)
+        actif = True
+        while actif:
+            lot = []
+            try:
+                entree = self._file.get(timeout=self._periode_ecriture)
+                while True:
+                    if entree is None:
+                        actif = False
+                        break
+                    lot.append(entree)
+                    if len(lot) >= self._taille_lot:
+                        break
+                    entree = self._file.get_nowait()
+            except queue.Empty:
+                pass
+
+            if lot:
+                try:
+                    with connexion:
+                        connexion.executemany(
+                            "INSERT INTO historique (horodatage, type, cible, url) VALUES (?, ?, ?, ?)",
+                            [(e.horodatage, e.type, e.cible, e.url) for e in lot]
+                        )
+                except sqlite3.Error as e:
+                    logger.error(f"Écriture de l'historique échouée: {e}")
+        connexion.close()
+
+    def rechercher(self, type: Optional[str] = None, cible: Optional[str] = None,
+                   debut: Optional[datetime] = None, fin: Optional[datetime] = None,
+                   limite: int = 100) -> List[EntreeHistorique]:
+        """Entrées enregistrées, des plus récentes aux plus anciennes"""
+        conditions, parametres = self._filtres(type, cible, debut, fin)
+        recentes = self.recentes.copy()
+        if not conditions and limite <= len(recentes):
+            return list(reversed(recentes))[:limite]
+        requete = "SELECT type, cible, url, horodatage FROM historique"
+        if conditions:
+            requete += " WHERE " + " AND ".join(conditions)
+        requete += " ORDER BY horodatage DESC LIMIT ?"
+        with self._verrou_lecture:
+            lignes = self._lecture.execute(requete, parametres + [limite]).fetchall()
+        return [EntreeHistorique(*ligne) for ligne in lignes]
+
+    def frequences(self, type: str = "site", debut: Optional[datetime] = None,
+                   fin: Optional[datetime] = None, limite: int = 5) -> List[Tuple[str, int]]:
+        """Cibles les plus fréquentes d'un type (ex. sites les plus ouverts)"""
+        conditions, parametres = self._filtres(type, None, debut, fin)
+        requete = "SELECT cible, COUNT(*) AS nombre FROM historique"
+        if conditions:
+            requete += " WHERE " + " AND ".join(conditions)
+        requete += " GROUP BY cible ORDER BY nombre DESC LIMIT ?"
+        with self._verrou_lecture:
+            return self._lecture.execute(requete, parametres + [limite]).fetchall()
+
+    @staticmethod
+    def _filtres(type, cible, debut, fin) -> Tuple[List[str], list]:
+        conditions, parametres = [], []
+        for colonne, operateur, valeur in (
+            ("type", "=", type),
+            ("cible", "=", cible),
+            ("horodatage", ">=", debut.timestamp() if debut else None),
+            ("horodatage", "<", fin.timestamp() if fin else None),
+        ):
+            if valeur is not None:
+                conditions.append(f"{colonne} {operateur} ?")
+                parametres.append(valeur)
+        return conditions, parametres
+
+    def fermer(self, delai: float = 2.0):
+        """Écrit les entrées en attente et ferme la base"""
+        self._file.put(None)
+        self._ecrivain.join(delai)
+        with self._verrou_lecture:
+            self._lecture.close()
+
+
+class StatistiquesLatence:
+    """Latences par étape du traitement d'une commande
+
+    Chaque étape alimente une fenêtre glissante des dernières mesures, d'où
+    sont tirés p50, p95 et p99. Les étapes d'une même commande partagent un
+    identifiant de corrélation, porté d'un thread à l'autre par
+    avec_correlation(). Inactives, les mesures se réduisent à un test.
+    """
+
+    def __init__(self, actif: bool = True, fenetre: int = 500, nb_traces: int = 50):
+        self.actif = actif
+        self._fenetre = fenetre
+        self._nb_traces = nb_traces
+        self._verrou = threading.Lock()
+        self._etapes: Dict[str, deque] = {}
+        # étape -> [nombre, maximum] depuis le démarrage
+        self._totaux: Dict[str, List[float]] = {}
+        self._traces: OrderedDict = OrderedDict()
+        self._compteur = itertools.count(1)
+        self._local = threading.local()
+
+    def nouvelle_commande(self) -> Optional[int]:
+        """Attribue un identifiant de corrélation à une commande"""
+        return next(self._compteur) if self.actif else None
+
+    def correlation_courante(self) -> Optional[int]:
+        """Identifiant de la commande traitée par le thread appelant"""
+        return getattr(self._local, "correlation", None)
+
+    def avec_correlation(self, fonction: Callable, correlation: Optional[int]) -> Callable:
+        """Enveloppe une fonction pour qu'elle s'exécute sous l'identifiant donné"""
+        if not self.actif or correlation is None:
+            return fonction
+
+        def executer(*args, **kwargs):
+            precedente = getattr(self._local, "correlation", None)
+            self._local.correlation = correlation
+            try:
+                return fonction(*args, **kwargs)
+            finally:
+                self._local.correlation = precedente
+
+        return executer
+
+    def enregistrer(self, etape: str, duree: float, correlation: Optional[int] = None):
+        """Enregistre la durée (en secondes) d'une étape"""
+        if not self.actif:
+            return
+        if correlation is None:
+            correlation = getattr(self._local, "correlation", None)
+        with self._verrou:
+            mesures = self._etapes.get(etape)
+            if mesures is None:
+                mesures = self._etapes[etape] = deque(maxlen=self._fenetre)
+                self._totaux[etape] = [0, 0.0]
+            mesures.append(duree)
+            totaux = self._totaux[etape]
+            totaux[0] += 1
+            totaux[1] = max(totaux[1], duree)
+
+            if correlation is not None:
+                trace = self._traces.get(correlation)
+                if trace is None:
+                    trace = self._traces[correlation] = {}
+                    if len(self._traces) > self._nb_traces:
+                        self._traces.popitem(last=False)
+                trace[etape] = trace.get(etape, 0.0) + duree
+
+    def instantane(self) -> Dict[str, Dict[str, float]]:
+        """Percentiles (en ms) de la fenêtre glissante de chaque étape"""
+        with self._verrou:
+            fenetres = {etape: sorted(mesures) for etape, mesures in self._etapes.items()}
+            totaux = {etape: list(valeurs) for etape, valeurs in self._totaux.items()}
+        return {
+            etape: {
+                "n": totaux[etape][0],
+                "p50": self._percentile(mesures, 0.50),
+                "p95": self._percentile(mesures, 0.95),
+                "p99": self._percentile(mesures, 0.99),
+                "max": totaux[etape][1] * 1000,
+            }
+            for etape, mesures in fenetres.items()
+        }
+
+    @staticmethod
+    def _percentile(mesures: List[float], q: float) -> float:
+        return mesures[min(len(mesures) - 1, int(q * len(mesures)))] * 1000
+
+    def derniere_trace(self) -> Optional[Tuple[int, Dict[str, float]]]:
+        """Durées par étape (en secondes) de la dernière commande suivie"""
+        with self._verrou:
+            if not self._traces:
+                return None
+            correlation = next(reversed(self._traces))
+            return correlation, dict(self._traces[correlation])
+
+    def resume(self) -> str:
+        """Résumé lisible: percentiles par étape"""
+        return ", ".join(
+            f"{etape} p50 {p['p50']:.0f} ms / p95 {p['p95']:.0f} ms / p99 {p['p99']:.0f} ms (n={p['n']})"
+            for etape, p in self.instantane().items()
+        )
+
+    def ecrire_metriques(self, chemin: str):
+        """Sauvegarde les percentiles dans un fichier JSON (remplacement atomique)"""
+        temporaire = chemin + ".tmp"
+        try:
+            with open(temporaire, "w", encoding="utf-8") as fichier:
+                json.dump({
+                    "instant": datetime.now().isoformat(timespec="seconds"),
+                    "etapes_ms": self.instantane(),
+                }, fichier, ensure_ascii=False, indent=2)
+            os.replace(temporaire, chemin)
+        except OSError as e:
+            logger.warning(f"Écriture des métriques impossible: {e}")
+
+
+class PrioriteParole(IntEnum):
+    """Priorités des messages vocaux"""
+    BASSE = 0
+    NORMALE = 1
+    HAUTE = 2
+
+@dataclass
+class MessageParole:
+    """Message en attente de synthèse vocale"""
+    texte: str
+    priorite: PrioriteParole = PrioriteParole.NORMALE
+    ephemere: bool = False
+    sequence: int = 0
+    correlation: Optional[int] = None
+    depot: float = 0.0
+
+class CacheParole:
+    """Cache disque des phrases synthétisées, adressé par contenu
+
+    La clé dérive du texte, de la voix, du débit et du volume. Au-delà de la
+    taille maximale, les fichiers les moins récemment joués sont évincés.
+    Utilisé uniquement depuis le thread de synthèse.
+    """
+
+    def __init__(self, repertoire: str = REPERTOIRE_CACHE_PAROLE, taille_max: int = 20 * 1024 * 1024):
+        self.repertoire = repertoire
+        self.taille_max = taille_max
+        self._entrees: "OrderedDict[str, int]" = OrderedDict()
+        self._taille = 0
+
+        os.makedirs(repertoire, exist_ok=True)
+        fichiers = []
+        for nom in os.listdir(repertoire):
+            if nom.endswith(".wav"):
+                infos = os.stat(os.path.join(repertoire, nom))
+                fichiers.append((infos.st_mtime, nom[:-4], infos.st_size))
+        # Ordre LRU reconstitué à partir des dates de dernière lecture
+        for _, cle, taille in sorted(fichiers):
+            self._entrees[cle] = taille
+            self._taille += taille
+        self._evincer()
+
+    @staticmethod
+    def cle(texte: str, voix, debit, volume) -> str:
+        """Clé de contenu d'une phrase pour une configuration de voix"""
+        return hashlib.sha1(json.dumps([texte, voix, debit, volume]).encode("utf-8")).hexdigest()
+
+    def __contains__(self, cle: str) -> bool:
+        return cle in self._entrees
+
+    def chemin(self, cle: str) -> str:
+        return os.path.join(self.repertoire, cle + ".wav")
+
+    def obtenir(self, cle: str) -> Optional[str]:
+        """Chemin du fichier en cache, ou None"""
+        if cle not in self._entrees:
+            return None
+        self._entrees.move_to_end(cle)
+        try:
+            os.utime(self.chemin(cle))
+        except OSError:
+            pass
+        return self.chemin(cle)
+
+    def ajouter(self, cle: str, temporaire: str) -> bool:
+        """Intègre au cache un fichier WAV fraîchement rendu"""
+        try:
+            with wave.open(temporaire, "rb") as fichier:
+                if not fichier.getnframes():
+                    raise wave.Error("fichier vide")
+            os.replace(temporaire, self.chemin(cle))
+        except (OSError, EOFError, wave.Error) as e:
+            logger.debug(f"Rendu de phrase inutilisable: {e}")
+            if os.path.exists(temporaire):
+                os.remove(temporaire)
+            return False
+
+        taille = os.path.getsize(self.chemin(cle))
+        self._taille += taille - self._entrees.pop(cle, 0)
+        self._entrees[cle] = taille
+        self._evincer()
+        return True
+
+    def _evincer(self):
+        while self._taille > self.taille_max and self._entrees:
+            cle, taille = self._entrees.popitem(last=False)
+            self._taille -= taille
+            try:
+                os.remove(self.chemin(cle))
+            except OSError:
+                pass
+
+
+class FileParole:
+    """Synthèse vocale dans un thread dédié, seul propriétaire du moteur pyttsx3
+
+    Les appels à dire() ne font qu'empiler le message et retournent
+    immédiatement; la file est bornée et ordonnée par priorité. Avec un
+    CacheParole, les phrases déjà rendues sont jouées directement depuis le
+    disque et les phrases fixes ou répétées sont rendues pendant les temps
+    morts.
+    """
+
+    def __init__(self, fabrique_moteur: Callable, capacite: int = 8,
+                 en_cas_echec: Optional[Callable[[str], None]] = None,
+                 cache: Optional[CacheParole] = None, repetitions_avant_cache: int = 2,
+                 demarrage_differe: bool = False,
+                 statistiques: Optional[StatistiquesLatence] = None):
+        self._fabrique_moteur = fabrique_moteur
+        self._statistiques = statistiques
+        self._capacite = capacite
+        self._en_cas_echec = en_cas_echec
+        self._cache = cache
+        self._repetitions_avant_cache = repetitions_avant_cache
+        self._attente: List[MessageParole] = []
+        self._a_rendre: deque = deque()
+        self._manques: Dict[str, int] = {}
+        self._condition = threading.Condition()
+        self._interruption = threading.Event()
+        self._sequence = 0
+        self._moteur = None
+        self._audio = None
+        self._cle_voix: Optional[tuple] = None
+        self._en_cours: Optional[MessageParole] = None
+        self._active = True
+
+        self._thread = threading.Thread(target=self._boucle, name="parole", daemon=True)
+        if not demarrage_differe:
+            self._thread.start()
+
+    def demarrer(self):
+        """Démarre le thread de synthèse (création du moteur comprise)"""
+        if not self._thread.is_alive():
+            self._thread.start()
+
+    def dire(self, texte: str, priorite: PrioriteParole = PrioriteParole.NORMALE,
+             ephemere: bool = False, interrompre: bool = False) -> bool:
+        """Met un message en file; retourne False s'il a été rejeté"""
+        with self._condition:
+            if not self._active:
+                return False
+
+            # Les messages éphémères en attente sont périmés, les doublons inutiles
+            attente = [m for m in self._attente if not m.ephemere and m.texte != texte]
+
+            if interrompre:
+                attente = [m for m in attente if m.priorite > priorite]
+                # Le thread de synthèse s'interrompt au mot suivant (_sur_mot)
+                if self._en_cours is not None and self._en_cours.priorite <= priorite:
+                    self._interruption.set()
+
+            if len(attente) >= self._capacite:
+                moins_urgent = min(attente, key=lambda m: (m.priorite, -m.sequence))
+                if moins_urgent.priorite > priorite:
+                    self._attente = attente
+                    return False
+                attente.remove(moins_urgent)
+
+            self._sequence += 1
+            correlation = self._statistiques.correlation_courante() if self._statistiques else None
+            attente.append(MessageParole(
+                texte, priorite, ephemere, self._sequence, correlation, time.perf_counter()
+            ))
+            self._attente = attente
+            self._condition.notify()
+
+        return True
+
+    def precharger(self, textes: List[str]):
+        """Demande le rendu en cache de phrases, pendant les temps morts"""
+        if self._cache is None:
+            return
+        with self._condition:
+            self._a_rendre.extend(textes)
+            self._condition.notify()
+
+    def _sur_mot(self, nom, position, longueur):
+        """Rappel pyttsx3 (thread de synthèse): coupe l'énoncé si une interruption est demandée
+
+        stop() n'est fiable que depuis le thread qui exécute runAndWait().
+        """
+        if self._interruption.is_set():
+            try:
+                self._moteur.stop()
+            except Exception as e:
+                logger.debug(f"Interruption de la synthèse impossible: {e}")
+
+    def _boucle(self):
+        """Boucle du thread de synthèse"""
+        try:
+            self._moteur = self._fabrique_moteur()
+        except Exception as e:
+            logger.error(f"Moteur vocal indisponible: {e}")
+        if hasattr(self._moteur, "connect"):
+            self._moteur.connect('started-word', self._sur_mot)
+        self._preparer_cache()
+
+        while True:
+            with self._condition:
+                while self._active and not self._attente and not self._a_rendre:
+                    self._condition.wait()
+                if not self._active:
+                    return
+                if not self._attente:
+                    # Temps mort: rendu d'une phrase en cache
+                    texte = self._a_rendre.popleft()
+                    message = None
+                else:
+                    message = min(self._attente, key=lambda m: (-m.priorite, m.sequence))
+                    self._attente.remove(message)
+                    self._en_cours = message
+                    self._interruption.clear()
+
+            if message is None:
+                self._rendre(texte)
+                continue
+
+            if self._statistiques:
+                # Attente avant que la réponse commence à être prononcée
+                self._statistiques.enregistrer(
+                    "parole", time.perf_counter() - message.depot, message.correlation
+                )
+
+            try:
+                chemin = self._chemin_en_cache(message.texte)
+                if chemin:
+                    self._jouer(chemin)
+                else:
+                    self._moteur.say(message.texte)
+                    self._moteur.runAndWait()
+                    self._compter_manque(message.texte)
+            except Exception as e:
+                logger.warning(f"Synthèse vocale échouée: {e}")
+                if self._en_cas_echec:
+                    self._en_cas_echec(message.texte)
+            finally:
+                with self._condition:
+                    self._en_cours = None
+
+    def _preparer_cache(self):
+        """Active le cache si le moteur et la sortie audio le permettent"""
+        if self._cache is None:
+            return
+        try:
+            import pyaudio
+            self._audio = pyaudio.PyAudio()
+            self._cle_voix = tuple(
+                self._moteur.getProperty(nom) for nom in ("voice", "rate", "volume")
+            )
+        except Exception as e:
+            logger.info(f"Cache de phrases désactivé: {e}")
+            self._cache = None
+
+    def _chemin_en_cache(self, texte: str) -> Optional[str]:
+        if self._cache is None:
+            return None
+        return self._cache.obtenir(self._cache.cle(texte, *self._cle_voix))
+
+    def _compter_manque(self, texte: str):
+        """Programme le rendu des phrases qui reviennent souvent"""
+        if self._cache is None:
+            return
+        self._manques[texte] = self._manques.get(texte, 0) + 1
+        if self._manques[texte] == self._repetitions_avant_cache:
+            del self._manques[texte]
+            self._a_rendre.append(texte)
+
+    def _rendre(self, texte: str):
+        """Synthétise une phrase dans le cache"""
+        if self._cache is None:
+            return
+        cle = self._cache.cle(texte, *self._cle_voix)
+        if cle in self._cache:
+            return
+        temporaire = self._cache.chemin(cle) + ".tmp.wav"
+        try:
+            self._moteur.save_to_file(texte, temporaire)
+            self._moteur.runAndWait()
+            self._cache.ajouter(cle, temporaire)
+        except Exception as e:
+            logger.debug(f"Rendu en cache échoué pour '{texte}': {e}")
+
+    def _jouer(self, chemin: str, taille_bloc: int = 1024):
+        """Joue un fichier WAV en flux, interruptible entre deux blocs"""
+        with wave.open(chemin, "rb") as fichier:
+            flux = self._audio.open(
+                format=self._audio.get_format_from_width(fichier.getsampwidth()),
+                channels=fichier.getnchannels(),
+                rate=fichier.getframerate(),
+                output=True
+            )
+            try:
+                donnees = fichier.readframes(taille_bloc)
+                while donnees and not self._interruption.is_set():
+                    flux.write(donnees)
+                    donnees = fichier.readframes(taille_bloc)
+            finally:
+                flux.stop_stream()
+                flux.close()
+
+    def arreter(self):
+        """Vide la file et arrête le thread de synthèse"""
+        with self._condition:
+            self._active = False
+            self._attente.clear()
+            self._a_rendre.clear()
+            self._interruption.set()
+            self._condition.notify_all()
+
+
+class CanalInterface:
+    """Canal unique et thread-safe des mises à jour de l'interface
+
+    Aucun thread de travail ne touche directement aux widgets: les mises à
+    jour sont déposées dans une file que la boucle Tk vide à cadence fixe,
+    dans un budget de temps borné. Les configurations successives d'un même
+    widget sont fusionnées et les lignes de console insérées en un seul lot.
+    """
+
+    _CONFIGURER = 0
+    _CONSOLE = 1
+    _APPEL = 2
+
+    def __init__(self, root, afficher_lignes: Callable[[List[Tuple[str, str]]], None],
+                 periode_ms: int = 33, budget_ms: float = 8.0):
+        self.root = root
+        self._afficher_lignes = afficher_lignes
+        self._periode_ms = periode_ms
+        self._budget = budget_ms / 1000
+        self._evenements = deque()
+        self.root.after(self._periode_ms, self._vider)
+
+    def configurer(self, widget, **options):
+        """Demande la configuration d'un widget (seul le dernier état compte)"""
+        self._evenements.append((self._CONFIGURER, widget, options))
+
+    def console(self, ligne: str, niveau: str):
+        """Ajoute une ligne à la console"""
+        self._evenements.append((self._CONSOLE, ligne, niveau))
+
+    def appeler(self, fonction: Callable):
+        """Exécute une fonction dans le thread de l'interface"""
+        self._evenements.append((self._APPEL, fonction, None))
+
+    def _vider(self):
+        """Applique les événements en attente (appelé par la boucle Tk)"""
+        evenements = self._evenements
+        limite = time.perf_counter() + self._budget
+        configurations: Dict[object, dict] = {}
+        lignes: List[Tuple[str, str]] = []
+        appels: List[Callable] = []
+
+        traites = 0
+        while evenements:
+            # deque.popleft est atomique: pas de verrou côté producteurs
+            genre, cible, donnees = evenements.popleft()
+            if genre == self._CONFIGURER:
+                configurations.setdefault(cible, {}).update(donnees)
+            elif genre == self._CONSOLE:
+                lignes.append((cible, donnees))
+            else:
+                appels.append(cible)
+
+            traites += 1
+            if traites % 256 == 0 and time.perf_counter() > limite:
+                break
+
+        for widget, options in configurations.items():
+            self._executer(widget.configure, **options)
+        if lignes:
+            self._executer(self._afficher_lignes, lignes)
+        for fonction in appels:
+            self._executer(fonction)
+
+        self.root.after(1 if evenements else self._periode_ms, self._vider)
+
+    @staticmethod
+    def _executer(fonction: Callable, *args, **kwargs):
+        try:
+            fonction(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"Mise à jour de l'interface échouée: {e}")
+
+
+class JournalConsole:
+    """Journal d'activité borné
+
+    Le widget n'affiche que les dernières lignes; les plus anciennes sont
+    supprimées par lots, pour un coût d'ajout constant.
+    """
+
+    def __init__(self, textbox, lignes_affichees: int = 300, lot_suppression: int = 100):
+        self.textbox = textbox
+        self._lignes_affichees = lignes_affichees
+        self._lot_suppression = lot_suppression
+        self._nb_lignes = 0
+
+        # Tags configurés une seule fois par niveau
+        for niveau, couleur in COULEURS_NIVEAUX.items():
+            self.textbox.tag_config(niveau, foreground=couleur)
+
+    def ajouter(self, lignes: List[Tuple[str, str]]):
+        """Ajoute un lot de lignes (texte, niveau) à l'affichage"""
+        # Inutile d'insérer ce qui sortirait aussitôt de la fenêtre
+        lignes = lignes[-self._lignes_affichees:]
+
+        self.textbox.configure(state="normal")
+        for texte, niveau in lignes:
+            self.textbox.insert("end", texte, niveau)
+            # Un message peut s'étendre sur plusieurs lignes du widget
+            self._nb_lignes += texte.count("\n")
+
+        excedent = self._nb_lignes - self._lignes_affichees
+        if excedent >= self._lot_suppression:
+            self.textbox.delete("1.0", f"{excedent + 1}.0")
+            self._nb_lignes -= excedent
+
+        self.textbox.see("end")
+        self.textbox.configure(state="disabled")
+
+
+class ErreurReconnaissance(Exception):
+    """Échec d'un moteur de reconnaissance"""
+
+class ParoleNonReconnue(ErreurReconnaissance):
+    """Le moteur n'a reconnu aucune parole"""
+
+class ServiceIndisponible(ErreurReconnaissance):
+    """Le service de reconnaissance n'a pas pu répondre"""
+
+class DelaiDepasse(ServiceIndisponible):
+    """Le moteur n'a pas répondu dans le délai imparti"""
+
+class CircuitOuvert(ServiceIndisponible):
+    """Appel refusé par le disjoncteur: le service est tenu pour indisponible"""
+
+class ReconnaissanceAnnulee(ErreurReconnaissance):
+    """La reconnaissance a été annulée"""
+
+
+class MoteurReconnaissance:
+    """Interface d'un moteur de reconnaissance vocale
+
+    Les sous-classes implémentent _reconnaitre(); reconnaitre() y ajoute un
+    délai maximal et l'annulation coopérative via un threading.Event. Celles
+    qui livrent des hypothèses intermédiaires (hypotheses_intermediaires)
+    implémentent aussi _reconnaitre_progressif(), qui les transmet à
+    en_hypothese(texte, confiance) avant de retourner le résultat final.
+    """
+
+    nom = "abstrait"
+    hypotheses_intermediaires = False
+
+    def reconnaitre(self, audio, langue: str, delai: Optional[float] = None,
+                    annulation: Optional[threading.Event] = None,
+                    en_hypothese: Optional[Callable[[str, float], None]] = None) -> str:
+        """Retourne la transcription de l'audio"""
+        annulation = annulation or threading.Event()
+        if annulation.is_set():
+            raise ReconnaissanceAnnulee(self.nom)
+        if en_hypothese is not None and self.hypotheses_intermediaires:
+            travail = lambda: self._reconnaitre_progressif(audio, langue, annulation, en_hypothese)
+        else:
+            travail = lambda: self._reconnaitre(audio, langue, annulation)
+        if delai is None:
+            return travail()
+
+        resultat = {}
+        termine = threading.Event()
+
+        def executer():
+            try:
+                resultat["texte"] = travail()
+            except Exception as e:
+                resultat["erreur"] = e
+            finally:
+                termine.set()
+
+        threading.Thread(target=executer, name=f"moteur-{self.nom}", daemon=True).start()
+
+        limite = time.perf_counter() + delai
+        while not termine.wait(min(0.05, max(0.0, limite - time.perf_counter()))):
+            if annulation.is_set():
+                raise ReconnaissanceAnnulee(self.nom)
+            if time.perf_counter() >= limite:
+                # Le travail en cours est prié de s'arrêter au plus tôt
+                annulation.set()
+                raise DelaiDepasse(f"{self.nom}: pas de réponse en {delai:.1f} s")
+
+        if "erreur" in resultat:
+            raise resultat["erreur"]
+        return resultat["texte"]
+
+    def _reconnaitre(self, audio, langue: str, annulation: threading.Event) -> str:
+        raise NotImplementedError
+
+    def _reconnaitre_progressif(self, audio, langue: str, annulation: threading.Event,
+                                en_hypothese: Callable[[str, float], None]) -> str:
+        return self._reconnaitre(audio, langue, annulation)
+
+
+class MoteurGoogle(MoteurReconnaissance):
+    """Reconnaissance via l'API Google Web Speech (speech_recognition)
+
+    Avec un PretraitementAudio, l'énoncé est rogné, normalisé et ramené à
+    16 kHz mono avant l'envoi.
+    """
+
+    nom = "google"
+
+    def __init__(self, pretraitement: Optional["PretraitementAudio"] = None):
+        self.pretraitement = pretraitement
+
+    def _reconnaitre(self, audio, langue: str, annulation: threading.Event) -> str:
+        import speech_recognition as sr
+
+        if self.pretraitement is not None:
+            audio = self.pretraitement.audio(audio)
+        try:
+            return sr.Recognizer().recognize_google(audio, language=langue)
+        except sr.UnknownValueError as e:
+            raise ParoleNonReconnue(self.nom) from e
+        except sr.RequestError as e:
+            raise ServiceIndisponible(str(e)) from e
+
+
+class MoteurLocal(MoteurReconnaissance):
+    """Moteur hors ligne et déterministe pour les tests et les benchmarks
+
+    Chaque enregistrement est identifié par l'empreinte de ses échantillons
+    PCM; pour un répertoire, la transcription de `nom.wav` est lue dans
+    `nom.txt`. Une latence artificielle peut simuler un service distant.
+    """
+
+    nom = "local"
+
+    def __init__(self, repertoire: Optional[str] = None,
+                 transcriptions: Optional[Dict[bytes, str]] = None, latence: float = 0.0):
+        self.latence = latence
+        self._transcriptions: Dict[str, str] = {}
+        if repertoire:
+            self.charger_repertoire(repertoire)
+        for donnees, texte in (transcriptions or {}).items():
+            self.associer(donnees, texte)
+
+    @staticmethod
+    def empreinte(audio) -> str:
+        """Empreinte des échantillons bruts (bytes ou sr.AudioData)"""
+        if not isinstance(audio, (bytes, bytearray, memoryview)):
+            audio = audio.get_raw_data()
+        return hashlib.sha1(audio).hexdigest()
+
+    @staticmethod
+    def lire_wav(chemin: str) -> bytes:
+        """Lit les échantillons PCM d'un fichier WAV"""
+        with wave.open(chemin, "rb") as fichier:
+            return fichier.readframes(fichier.getnframes())
+
+    def associer(self, audio, texte: str):
+        """Associe un enregistrement à sa transcription"""
+        self._transcriptions[self.empreinte(audio)] = texte
+
+    def charger_repertoire(self, repertoire: str):
+        """Charge toutes les paires nom.wav / nom.txt d'un répertoire"""
+        for nom in sorted(os.listdir(repertoire)):
+            base, extension = os.path.splitext(nom)
+            chemin_texte = os.path.join(repertoire, base + ".txt")
+            if extension.lower() == ".wav" and os.path.exists(chemin_texte):
+                with open(chemin_texte, encoding="utf-8") as fichier:
+                    texte = fichier.read().strip()
+                self.associer(self.lire_wav(os.path.join(repertoire, nom)), texte)
+
+    def _reconnaitre(self, audio, langue: str, annulation: threading.Event) -> str:
+        if self.latence and annulation.wait(self.latence):
+            raise ReconnaissanceAnnulee(self.nom)
+        texte = self._transcriptions.get(self.empreinte(audio))
+        if texte is None:
+            raise ParoleNonReconnue(self.nom)
+        return texte
+
+
+class MoteurProgressif(MoteurReconnaissance):
+    """Hypothèses intermédiaires simulées, pour les tests et les benchmarks
+
+    Le moteur enveloppé donne la transcription finale; les hypothèses en
+    sont les préfixes, un mot de plus toutes les `duree_par_mot` secondes
+    jusqu'à la phrase entière, puis le résultat final arrive `delai_final`
+    secondes après le dernier mot, comme d'un service en flux. `revisions` fixe, pour une transcription
+    finale, les hypothèses à livrer à la place des préfixes (hypothèse
+    corrigée par le service).
+    """
+
+    nom = "progressif"
+    hypotheses_intermediaires = True
+
+    def __init__(self, moteur: MoteurReconnaissance, duree_par_mot: float = 0.1,
+                 delai_final: float = 0.3, confiance: float = 0.9,
+                 revisions: Optional[Dict[str, List[str]]] = None):
+        self.moteur = moteur
+        self.duree_par_mot = duree_par_mot
+        self.delai_final = delai_final
+        self.confiance = confiance
+        self.revisions = revisions or {}
+
+    def _reconnaitre(self, audio, langue: str, annulation: threading.Event) -> str:
+        return self.moteur.reconnaitre(audio, langue, annulation=annulation)
+
+    def _reconnaitre_progressif(self, audio, langue: str, annulation: threading.Event,
+                                en_hypothese: Callable[[str, float], None]) -> str:
+        texte = self._reconnaitre(audio, langue, annulation)
+        mots = texte.split()
+        hypotheses = self.revisions.get(texte) or [
+            " ".join(mots[:i]) for i in range(1, len(mots) + 1)
+        ]
+        for hypothese in hypotheses:
+            if annulation.wait(self.duree_par_mot):
+                raise ReconnaissanceAnnulee(self.nom)
+            en_hypothese(hypothese, self.confiance)
+        if annulation.wait(self.delai_final):
+            raise ReconnaissanceAnnulee(self.nom)
+        return texte
+
+
+class MoteurCouverture(MoteurReconnaissance):
+    """Requêtes couvertes: si le moteur principal n'a pas répondu à temps,
+    la même requête part vers un moteur de secours et la première réponse
+    valide l'emporte; l'autre est annulée.
+
+    Un principal indisponible déclenche aussitôt le secours. `couvertures`
+    compte les requêtes confiées au secours, dans les deux cas.
+    """
+
+    nom = "couverture"
+
+    def __init__(self, principal: MoteurReconnaissance, secours: MoteurReconnaissance,
+                 delai_couverture: float = 1.0):
+        self.principal = principal
+        self.secours = secours
+        self.delai_couverture = delai_couverture
+        self.couvertures = 0
+
+    def _reconnaitre(self, audio, langue: str, annulation: threading.Event) -> str:
+        resultats: queue.Queue = queue.Queue()
+        annulations = []
+
+        def lancer(moteur: MoteurReconnaissance):
+            annulation_moteur = threading.Event()
+            annulations.append(annulation_moteur)
+
+            def executer():
+                try:
+                    texte = moteur.reconnaitre(audio, langue, annulation=annulation_moteur)
+                    resultats.put((texte, None))
+                except Exception as e:
+                    resultats.put((None, e))
+
+            threading.Thread(target=executer, name=f"moteur-{moteur.nom}", daemon=True).start()
+
+        lancer(self.principal)
+        en_cours = 1
+        couverture = time.perf_counter() + self.delai_couverture
+        try:
+            while True:
+                if annulation.is_set():
+                    raise ReconnaissanceAnnulee(self.nom)
+                if len(annulations) == 1 and time.perf_counter() >= couverture:
+                    self._couvrir(lancer)
+                    en_cours += 1
+                try:
+                    texte, erreur = resultats.get(timeout=0.02)
+                except queue.Empty:
+                    continue
+                en_cours -= 1
+                if erreur is None:
+                    return texte
+                if not isinstance(erreur, ServiceIndisponible):
+                    # "Aucune parole" est une réponse définitive
+                    raise erreur
+                if len(annulations) == 1:
+                    # Le principal a échoué: le secours part sans attendre
+                    self._couvrir(lancer)
+                    en_cours += 1
+                elif en_cours == 0:
+                    raise erreur
+        finally:
+            for annulation_moteur in annulations:
+                annulation_moteur.set()
+
+    def _couvrir(self, lancer: Callable[[MoteurReconnaissance], None]):
+        self.couvertures += 1
+        lancer(self.secours)
+
+
+class EtatCircuit(Enum):
+    """États du disjoncteur de reconnaissance"""
+    FERME = "fermé"
+    OUVERT = "ouvert"
+    SEMI_OUVERT = "semi-ouvert"
+
+
+class Disjoncteur:
+    """Disjoncteur à attente exponentielle devant un service distant
+
+    Fermé, les appels passent. Après `seuil_echecs` échecs consécutifs il
+    s'ouvre et refuse tout appel pendant un délai qui double à chaque
+    ouverture (plafonné, avec une gigue qui évite de revenir en cadence).
+    Le délai écoulé, un seul appel de sonde passe (semi-ouvert): son succès
+    referme le circuit, son échec le rouvre pour plus longtemps.
+
+    Un appelant qui confie l'appel à un autre thread réserve la sonde avec
+    reserver_sonde() avant de le soumettre: le circuit passe aussitôt
+    semi-ouvert et les soumissions suivantes sont refusées. La réservation
+    expire après `delai_sonde` si l'appel réservé n'arrive jamais.
+
+    en_changement(ancien, nouveau) est appelé hors verrou, depuis le thread
+    qui a provoqué le changement d'état.
+    """
+
+    def __init__(self, seuil_echecs: int = 2, delai_initial: float = 2.0, delai_max: float = 60.0,
+                 facteur: float = 2.0, gigue: float = 0.5, delai_sonde: float = 10.0,
+                 en_changement: Optional[Callable[[EtatCircuit, EtatCircuit], None]] = None,
+                 horloge: Callable[[], float] = time.monotonic):
+        self.seuil_echecs = seuil_echecs
+        self.delai_sonde = delai_sonde
+        self.delai_initial = delai_initial
+        self.delai_max = delai_max
+        self.facteur = facteur
+        self.gigue = gigue
+        self._en_changement = en_changement
+        self._horloge = horloge
+
+        self._verrou = threading.Lock()
+        self._etat = EtatCircuit.FERME
+        self._echecs = 0
+        self._ouvertures = 0
+        self._reouverture = 0.0
+        # Échéance de la sonde réservée et pas encore partie (None: aucune)
+        self._reservation: Optional[float] = None
+        self.delai_courant = 0.0
+        self.refus = 0
+
+    @property
+    def etat(self) -> EtatCircuit:
+        return self._etat
+
+    @property
+    def delai_restant(self) -> float:
+        """Secondes avant que la prochaine sonde puisse partir"""
+        if self._etat is not EtatCircuit.OUVERT:
+            return 0.0
+        return max(0.0, self._reouverture - self._horloge())
+
+    @property
+    def refuse_appels(self) -> bool:
+        """Vrai si un appel serait refusé maintenant (ne réserve pas la sonde)"""
+        with self._verrou:
+            return self._etat is not EtatCircuit.FERME and not self._sonde_possible()
+
+    def _sonde_possible(self) -> bool:
+        """Délai écoulé sans sonde en cours, ou réservation expirée (sous le verrou)"""
+        if self._etat is EtatCircuit.OUVERT:
+            return self._horloge() >= self._reouverture
+        return self._reservation is not None and self._horloge() >= self._reservation
+
+    def _prendre_sonde(self) -> bool:
+        """Passe semi-ouvert pour une sonde (sous le verrou); vrai s'il faut le notifier"""
+        ancien = self._etat
+        self._etat = EtatCircuit.SEMI_OUVERT
+        return ancien is EtatCircuit.OUVERT
+
+    def reserver_sonde(self) -> bool:
+        """Vrai si un appel peut être soumis: circuit fermé, ou sonde réservée pour lui"""
+        with self._verrou:
+            if self._etat is EtatCircuit.FERME:
+                return True
+            if not self._sonde_possible():
+                self.refus += 1
+                return False
+            notifier = self._prendre_sonde()
+            self._reservation = self._horloge() + self.delai_sonde
+        if notifier:
+            self._notifier(EtatCircuit.OUVERT, EtatCircuit.SEMI_OUVERT)
+        return True
+
+    def autoriser(self) -> bool:
+        """Vrai si l'appel peut partir; le premier après le délai (ou réservé) sert de sonde"""
+        with self._verrou:
+            if self._etat is EtatCircuit.FERME:
+                return True
+            if self._reservation is not None and self._horloge() < self._reservation:
+                # L'appel réservé part
+                self._reservation = None
+                return True
+            if not self._sonde_possible():
+                self.refus += 1
+                return False
+            notifier = self._prendre_sonde()
+            self._reservation = None
+        if notifier:
+            self._notifier(EtatCircuit.OUVERT, EtatCircuit.SEMI_OUVERT)
+        return True
+
+    def succes(self):
+        """Le service a répondu"""
+        with self._verrou:
+            self._echecs = 0
+            ancien = self._etat
+            if ancien is EtatCircuit.FERME:
+                return
+            self._etat = EtatCircuit.FERME
+            self._reservation = None
+            self._ouvertures = 0
+        self._notifier(ancien, EtatCircuit.FERME)
+
+    def echec(self):
+        """Le service n'a pas répondu (erreur réseau, délai dépassé)"""
+        with self._verrou:
+            self._echecs += 1
+            ancien = self._etat
+            # Un appel parti avant l'ouverture ne prolonge pas l'attente
+            if ancien is EtatCircuit.OUVERT:
+                return
+            if ancien is EtatCircuit.FERME and self._echecs < self.seuil_echecs:
+                return
+            delai = min(self.delai_max, self.delai_initial * self.facteur ** self._ouvertures)
+            # Gigue: entre (1 - gigue) et 100 % du délai
+            self.delai_courant = delai * (1 - self.gigue * random.random())
+            self._ouvertures += 1
+            self._reouverture = self._horloge() + self.delai_courant
+            self._etat = EtatCircuit.OUVERT
+            self._reservation = None
+        self._notifier(ancien, EtatCircuit.OUVERT)
+
+    def liberer(self):
+        """La sonde s'est terminée sans verdict (annulation): une autre pourra partir"""
+        with self._verrou:
+            if self._etat is EtatCircuit.SEMI_OUVERT:
+                self._etat = EtatCircuit.OUVERT
+                self._reservation = None
+
+    def _notifier(self, ancien: EtatCircuit, nouveau: EtatCircuit):
+        logger.info(f"Disjoncteur de reconnaissance: {ancien.value} -> {nouveau.value}")
+        if self._en_changement:
+            self._en_changement(ancien, nouveau)
+
+
+class MoteurDisjoncteur(MoteurReconnaissance):
+    """Moteur protégé par un disjoncteur
+
+    Pendant une panne, les appels sont refusés sur-le-champ (CircuitOuvert)
+    au lieu de solliciter le service: ni réseau, ni thread bloqué. Les délais
+    dépassés comptent comme des échecs; « aucune parole » prouve que le
+    service répond.
+    """
+
+    nom = "disjoncteur"
+
+    def __init__(self, moteur: MoteurReconnaissance, disjoncteur: Optional[Disjoncteur] = None):
+        self.moteur = moteur
+        self.disjoncteur = disjoncteur or Disjoncteur()
+
+    @property
+    def hypotheses_intermediaires(self) -> bool:
+        return self.moteur.hypotheses_intermediaires
+
+    # reconnaitre() est surchargé pour compter aussi les délais dépassés
+    def reconnaitre(self, audio, langue: str, delai: Optional[float] = None,
+                    annulation: Optional[threading.Event] = None,
+                    en_hypothese: Optional[Callable[[str, float], None]] = None) -> str:
+        if not self.disjoncteur.autoriser():
+            raise CircuitOuvert(
+                f"{self.moteur.nom}: nouvel essai dans {self.disjoncteur.delai_restant:.1f} s"
+            )
+        try:
+            texte = self.moteur.reconnaitre(audio, langue, delai, annulation, en_hypothese)
+        except ServiceIndisponible:
+            self.disjoncteur.echec()
+            raise
+        except ParoleNonReconnue:
+            self.disjoncteur.succes()
+            raise
+        except Exception:
+            self.disjoncteur.liberer()
+            raise
+        self.disjoncteur.succes()
+        return texte
+
+
+class TamponAudio:
+    """Tampon circulaire préalloué d'échantillons PCM
+
+    Chaque bloc capturé y est recopié une seule fois, en double (miroir):
+    toute fenêtre d'au plus `capacite` échantillons est alors contiguë et se
+    lit comme une vue NumPy ou un memoryview, sans copie. Les positions sont
+    absolues (échantillons écrits depuis le début); une fenêtre reste valable
+    tant que moins de `capacite` échantillons ont été écrits après son début.
+    """
+
+    _TYPES = {1: "int8", 2: "int16", 4: "int32"}
+
+    def __init__(self, taux_echantillonnage: int, largeur_echantillon: int = 2, duree: float = 30.0):
+        import numpy as np
+
+        self.taux_echantillonnage = taux_echantillonnage
+        self.largeur_echantillon = largeur_echantillon
+        self.capacite = max(1, int(taux_echantillonnage * duree))
+        self._donnees = np.zeros(2 * self.capacite, dtype=self._TYPES[largeur_echantillon])
+        self.ecrits = 0
+
+    def ecrire(self, bloc) -> int:
+        """Ajoute un bloc PCM; retourne la nouvelle position de fin"""
+        import numpy as np
+
+        echantillons = np.frombuffer(bloc, dtype=self._donnees.dtype)
+        capacite = self.capacite
+        if len(echantillons) > capacite:
+            self.ecrits += len(echantillons) - capacite
+            echantillons = echantillons[-capacite:]
+        debut = self.ecrits % capacite
+        fin = debut + len(echantillons)
+        self._donnees[debut:fin] = echantillons
+        # Miroir: data[i] == data[i + capacite] pour toute position
+        if fin <= capacite:
+            self._donnees[debut + capacite:fin + capacite] = echantillons
+        else:
+            coupure = capacite - debut
+            self._donnees[debut + capacite:] = echantillons[:coupure]
+            self._donnees[:fin - capacite] = echantillons[coupure:]
+        self.ecrits += len(echantillons)
+        return self.ecrits
+
+    def valide(self, debut: int) -> bool:
+        """Vrai si les échantillons à partir de `debut` n'ont pas été recouverts"""
+        return self.ecrits - debut <= self.capacite
+
+    def vue(self, debut: int, fin: int) -> "np.ndarray":
+        """Vue (sans copie) sur les échantillons [debut, fin)"""
+        if not self.valide(debut) or not debut <= fin <= self.ecrits:
+            raise ValueError(f"Fenêtre [{debut}, {fin}) hors du tampon (écrits: {self.ecrits})")
+        position = debut % self.capacite
+        return self._donnees[position:position + fin - debut]
+
+
+class SegmentAudio:
+    """Énoncé désigné par ses positions dans le tampon audio, sans copie
+
+    duree_voisee couvre la parole seule (de la première à la dernière trame
+    au-dessus du seuil), sans le pré-roll ni la traîne; fin_parole est la
+    position de la fin de cette dernière trame.
+    """
+
+    __slots__ = ("tampon", "debut", "fin", "duree_voisee", "fin_parole")
+
+    def __init__(self, tampon: TamponAudio, debut: int, fin: int,
+                 duree_voisee: Optional[float] = None, fin_parole: Optional[int] = None):
+        self.tampon = tampon
+        self.debut = debut
+        self.fin = fin
+        self.duree_voisee = self.duree if duree_voisee is None else duree_voisee
+        self.fin_parole = fin if fin_parole is None else fin_parole
+
+    @property
+    def valide(self) -> bool:
+        """Faux si le tampon a recouvert l'énoncé depuis sa capture"""
+        return self.tampon.valide(self.debut)
+
+    @property
+    def duree(self) -> float:
+        return (self.fin - self.debut) / self.tampon.taux_echantillonnage
+
+    def depuis_fin_parole(self, reception: float) -> float:
+        """Secondes écoulées depuis la fin de la parole
+
+        `reception` est l'instant (perf_counter) où le dernier bloc écrit
+        dans le tampon a été reçu: l'audio capturé depuis la fin de la
+        parole s'y ajoute.
+        """
+        apres = (self.tampon.ecrits - self.fin_parole) / self.tampon.taux_echantillonnage
+        return apres + time.perf_counter() - reception
+
+    def vue(self) -> "np.ndarray":
+        """Échantillons de l'énoncé (vue NumPy sur le tampon)"""
+        return self.tampon.vue(self.debut, self.fin)
+
+    def octets(self) -> memoryview:
+        """PCM brut de l'énoncé (memoryview sur le tampon)"""
+        return memoryview(self.vue()).cast("B")
+
+    def __bytes__(self) -> bytes:
+        return self.vue().tobytes()
+
+    def audio(self):
+        """sr.AudioData adossé au tampon, pour les moteurs de reconnaissance"""
+        import speech_recognition as sr
+
+        return sr.AudioData(self.octets(), self.tampon.taux_echantillonnage, self.tampon.largeur_echantillon)
+
+    def ecrire_wav(self, chemin: str):
+        """Enregistre l'énoncé dans un fichier WAV"""
+        with wave.open(chemin, "wb") as fichier:
+            fichier.setnchannels(1)
+            fichier.setsampwidth(self.tampon.largeur_echantillon)
+            fichier.setframerate(self.tampon.taux_echantillonnage)
+            fichier.writeframes(self.octets())
+
+
+class DetecteurActiviteVocale:
+    """Détection d'activité vocale en flux, fondée sur l'énergie des trames
+
+    Les blocs capturés sont écrits dans un TamponAudio; l'énergie RMS des
+    trames nouvelles est calculée d'un coup avec NumPy sur une vue du tampon
+    (même échelle que Recognizer.energy_threshold). Un énoncé démarre après
+    quelques trames au-dessus du seuil, en reculant du pré-roll, et se
+    termine dès que le silence dépasse la traîne (hangover). Les énoncés
+    sont rendus comme des SegmentAudio: ni les trames ni l'énoncé ne sont
+    recopiés.
+
+    En mode adaptatif, le seuil suit le bruit de fond mesuré sur les trames
+    hors parole, comme le seuil dynamique de speech_recognition.
+    """
+
+    _TYPES = TamponAudio._TYPES
+
+    def __init__(self, taux_echantillonnage: int, largeur_echantillon: int = 2,
+                 seuil_energie: float = 300.0, duree_trame: float = 0.02,
+                 pre_roll: float = 0.3, hangover: float = 0.15, duree_min: float = 0.1,
+                 duree_max: float = 10.0, trames_declenchement: int = 2,
+                 adaptatif: bool = True, amortissement: float = 0.15, ratio: float = 1.5,
+                 seuil_min: float = 50.0, duree_tampon: float = 30.0):
+        self.taux_echantillonnage = taux_echantillonnage
+        self.largeur_echantillon = largeur_echantillon
+        self.seuil_energie = seuil_energie
+        self.duree_trame = duree_trame
+        self.adaptatif = adaptatif
+        self.seuil_min = seuil_min
+        self._ratio = ratio
+        # Amortissement exprimé par seconde, ramené à la durée d'une trame
+        self._amortissement = amortissement ** duree_trame
+
+        self._type = self._TYPES[largeur_echantillon]
+        self._echantillons_trame = max(1, int(taux_echantillonnage * duree_trame))
+        self._trames_hangover = max(1, round(hangover / duree_trame))
+        self._trames_min = round(duree_min / duree_trame)
+        self._trames_max = max(1, round(duree_max / duree_trame))
+        self._trames_declenchement = trames_declenchement
+        trames_pre_roll = max(trames_declenchement, round(pre_roll / duree_trame))
+        self._echantillons_pre_roll = trames_pre_roll * self._echantillons_trame
+
+        # Le tampon couvre au moins un énoncé complet et son pré-roll
+        self.tampon = TamponAudio(taux_echantillonnage, largeur_echantillon,
+                                  max(duree_tampon, duree_max + pre_roll + 1.0))
+        self._travail: Optional["np.ndarray"] = None
+        self._energies: Optional["np.ndarray"] = None
+        self._analyse = 0
+        self._plancher = 0
+        self._debut: Optional[int] = None
+        self._consecutives = 0
+        self._silence = 0
+        self._voisees = 0
+        # Parole effective de l'énoncé en cours (positions absolues)
+        self._debut_voix = 0
+        self._fin_voix = 0
+
+    @property
+    def en_parole(self) -> bool:
+        """Vrai si un énoncé est en cours"""
+        return self._debut is not None
+
+    def energies(self, donnees) -> "np.ndarray":
+        """Énergie RMS de chaque trame complète (bytes ou tableau d'échantillons)
+
+        Le calcul se fait dans des tableaux de travail réutilisés d'un bloc à
+        l'autre: le résultat n'est valable que jusqu'à l'appel suivant.
+        """
+        import numpy as np
+
+        if not isinstance(donnees, np.ndarray):
+            donnees = np.frombuffer(donnees, dtype=self._type)
+        n = self._echantillons_trame
+        nb_trames = len(donnees) // n
+        if self._travail is None or len(self._travail) < nb_trames:
+            self._travail = np.empty((nb_trames, n), dtype=np.float32)
+            self._energies = np.empty(nb_trames, dtype=np.float32)
+        carres, energies = self._travail[:nb_trames], self._energies[:nb_trames]
+        np.copyto(carres, donnees[:nb_trames * n].reshape(nb_trames, n))
+        np.multiply(carres, carres, out=carres)
+        np.add.reduce(carres, axis=1, out=energies)
+        energies /= n
+        return np.sqrt(energies, out=energies)
+
+    def traiter(self, bloc: bytes) -> List[SegmentAudio]:
+        """Consomme un bloc PCM et retourne les énoncés terminés"""
+        ecrits = self.tampon.ecrire(bloc)
+        n = self._echantillons_trame
+        nb_trames = (ecrits - self._analyse) // n
+        if not nb_trames:
+            return []
+
+        debut_analyse = self._analyse
+        self._analyse += nb_trames * n
+        energies = self.energies(self.tampon.vue(debut_analyse, self._analyse)).tolist()
+        enonces = []
+        for i, energie in enumerate(energies):
+            fin_trame = debut_analyse + (i + 1) * n
+            voisee = energie > self.seuil_energie
+
+            if self._debut is None:
+                if self.adaptatif and not voisee:
+                    self._adapter_seuil(energie)
+                self._consecutives = self._consecutives + 1 if voisee else 0
+                if self._consecutives >= self._trames_declenchement:
+                    # Début de parole: le pré-roll garde l'attaque du premier mot
+                    self._debut = max(fin_trame - self._echantillons_pre_roll, self._plancher,
+                                      ecrits - self.tampon.capacite)
+                    self._voisees = self._consecutives
+                    self._debut_voix = fin_trame - self._consecutives * n
+                    self._fin_voix = fin_trame
+                    self._consecutives = 0
+                    self._silence = 0
+                continue
+
+            if voisee:
+                self._silence = 0
+                self._voisees += 1
+                self._fin_voix = fin_trame
+            else:
+                self._silence += 1
+
+            if (self._silence >= self._trames_hangover
+                    or (fin_trame - self._debut) // n >= self._trames_max):
+                enonce = self._clore(fin_trame)
+                if enonce:
+                    enonces.append(enonce)
+        return enonces
+
+    def _adapter_seuil(self, energie: float):
+        """Rapproche le seuil du bruit de fond mesuré sur une trame hors parole"""
+        cible = energie * self._ratio
+        seuil = self.seuil_energie * self._amortissement + cible * (1 - self._amortissement)
+        self.seuil_energie = max(self.seuil_min, seuil)
+
+    def _clore(self, fin: int) -> Optional[SegmentAudio]:
+        debut, voisees = self._debut, self._voisees
+        self._debut = None
+        self._plancher = fin
+        self._voisees = 0
+        self._silence = 0
+        if debut is not None and voisees >= self._trames_min:
+            duree_voisee = (self._fin_voix - self._debut_voix) / self.taux_echantillonnage
+            return SegmentAudio(self.tampon, debut, fin, duree_voisee, self._fin_voix)
+        return None
+
+    def vider(self) -> Optional[SegmentAudio]:
+        """Clôt l'énoncé en cours; None s'il est trop court"""
+        return self._clore(self._analyse)
+
+
+class PretraitementAudio:
+    """Prépare un énoncé avant son envoi au service de reconnaissance distant
+
+    En une passe NumPy: passage en mono, rognage des silences de bord (avec
+    une marge qui garde l'attaque du premier mot), porte de bruit légère
+    sur les trames faibles, normalisation du gain vers une crête cible et
+    rééchantillonnage à 16 kHz par FFT (la troncature du spectre fait office
+    de filtre anti-repliement). Moins d'échantillons envoyés: requête plus
+    légère et moins d'audio à traiter côté serveur.
+    """
+
+    def __init__(self, taux_sortie: int = 16000, duree_trame: float = 0.01,
+                 seuil_rognage_db: float = -35.0, marge: float = 0.1,
+                 seuil_porte_db: float = -45.0, attenuation_porte: float = 0.1,
+                 crete_cible: float = 0.5, gain_max: float = 4.0):
+        self.taux_sortie = taux_sortie
+        self.duree_trame = duree_trame
+        self.seuil_rognage = 10 ** (seuil_rognage_db / 20)
+        self.marge = marge
+        self.seuil_porte = 10 ** (seuil_porte_db / 20)
+        self.attenuation_porte = attenuation_porte
+        self.crete_cible = crete_cible
+        self.gain_max = gain_max
+
+    def traiter(self, echantillons: "np.ndarray", taux: int, nb_canaux: int = 1) -> "np.ndarray":
+        """Échantillons entiers entrelacés -> int16 mono au taux de sortie"""
+        import numpy as np
+
+        pleine_echelle = float(np.iinfo(echantillons.dtype).max)
+        signal = echantillons.astype(np.float32)
+        if nb_canaux > 1:
+            signal = signal[:len(signal) // nb_canaux * nb_canaux].reshape(-1, nb_canaux).mean(axis=1)
+        signal /= pleine_echelle
+
+        n = max(1, int(taux * self.duree_trame))
+        nb_trames = len(signal) // n
+        if nb_trames:
+            trames = signal[:nb_trames * n].reshape(nb_trames, n)
+            energies = np.sqrt(np.einsum("ij,ij->i", trames, trames) / n)
+            reference = energies.max()
+            if reference > 0:
+                # Seuils relatifs à la trame la plus forte, au-dessus du bruit de fond
+                plancher = float(np.percentile(energies, 10))
+                seuil_rognage = max(reference * self.seuil_rognage, min(2 * plancher, reference / 4))
+                seuil_porte = max(reference * self.seuil_porte, min(1.5 * plancher, reference / 8))
+
+                # Rognage: de la première à la dernière trame audible, marge comprise
+                audibles = np.flatnonzero(energies > seuil_rognage)
+                marge = int(self.marge * taux)
+                debut = max(0, audibles[0] * n - marge)
+                fin = min(len(signal), (audibles[-1] + 1) * n + marge)
+
+                # Porte de bruit: gain par trame, interpolé entre centres de trames
+                gains = np.where(energies > seuil_porte, 1.0, self.attenuation_porte)
+                centres = np.arange(nb_trames) * n + n / 2
+                signal = signal[debut:fin] * np.interp(np.arange(debut, fin), centres, gains).astype(np.float32)
+
+        crete = float(np.abs(signal).max()) if len(signal) else 0.0
+        if crete > 0:
+            signal *= min(self.gain_max, self.crete_cible / crete)
+
+        if taux != self.taux_sortie and len(signal):
+            nb_sortie = max(1, round(len(signal) * self.taux_sortie / taux))
+            spectre = np.fft.rfft(signal)[:nb_sortie // 2 + 1]
+            signal = np.fft.irfft(spectre, nb_sortie) * (nb_sortie / len(signal))
+
+        return np.clip(signal * 32767, -32768, 32767).astype(np.int16)
+
+    def audio(self, audio):
+        """sr.AudioData prétraité, prêt à l'envoi"""
+        import numpy as np
+        import speech_recognition as sr
+
+        largeur = audio.sample_width
+        donnees = audio.frame_data
+        if largeur == 3:
+            # Pas de type NumPy sur 24 bits: élargi à 32 bits
+            donnees, largeur = audio.get_raw_data(convert_width=4), 4
+        echantillons = np.frombuffer(donnees, dtype=TamponAudio._TYPES[largeur])
+        return sr.AudioData(self.traiter(echantillons, audio.sample_rate).tobytes(), self.taux_sortie, 2)
+
+
+class FiltreMotsCles:
+    """Filtre local placé devant la reconnaissance distante
+
+    Écarte d'abord les sons trop brefs (toux, claquements), d'après la durée
+    de parole effective quand elle est connue. Si des modèles
+    audio de mots-clés (ou d'un mot d'éveil) ont été enregistrés, un énoncé
+    n'est transmis que s'il contient l'un d'eux: ses caractéristiques
+    log-mel sont comparées à chaque modèle par DTW de sous-séquence,
+    vectorisée ligne par ligne avec NumPy.
+    """
+
+    def __init__(self, duree_min: float = 0.25, seuil: float = 0.3, nb_bandes: int = 26):
+        self.duree_min = duree_min
+        self.seuil = seuil
+        self.nb_bandes = nb_bandes
+        self.modeles: List[Tuple[str, "np.ndarray"]] = []
+
+        self.enonces = 0
+        self.ecartes = 0
+        self.duree_audio = 0.0
+        self.duree_calcul = 0.0
+
+    def charger_repertoire(self, repertoire: str):
+        """Enregistre comme modèles tous les fichiers WAV d'un répertoire"""
+        for nom in sorted(os.listdir(repertoire)):
+            if nom.lower().endswith(".wav"):
+                with wave.open(os.path.join(repertoire, nom), "rb") as fichier:
+                    pcm = fichier.readframes(fichier.getnframes())
+                    self.ajouter_modele(
+                        os.path.splitext(nom)[0], pcm,
+                        fichier.getframerate(), fichier.getsampwidth()
+                    )
+
+    def ajouter_modele(self, nom: str, pcm: bytes, taux: int, largeur: int):
+        """Ajoute un modèle de mot-clé"""
+        self.modeles.append((nom, self.caracteristiques(pcm, taux, largeur)))
+
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _banc_mel(taux: int, taille_fft: int, nb_bandes: int) -> "np.ndarray":
+        """Banc de filtres triangulaires sur l'échelle mel (jusqu'à 8 kHz)"""
+        import numpy as np
+
+        def vers_mel(f):
+            return 2595 * np.log10(1 + f / 700)
+
+        def depuis_mel(m):
+            return 700 * (10 ** (m / 2595) - 1)
+
+        bornes = depuis_mel(np.linspace(0, vers_mel(min(taux / 2, 8000)), nb_bandes + 2))
+        cases = np.floor((taille_fft + 1) * bornes / taux).astype(int)
+        banc = np.zeros((nb_bandes, taille_fft // 2 + 1), dtype=np.float32)
+        for b in range(nb_bandes):
+            gauche, centre, droite = cases[b], max(cases[b + 1], cases[b] + 1), max(cases[b + 2], cases[b] + 2)
+            banc[b, gauche:centre] = (np.arange(gauche, centre) - gauche) / (centre - gauche)
+            banc[b, centre:droite] = (droite - np.arange(centre, droite)) / (droite - centre)
+        return banc
+
+    def caracteristiques(self, pcm: bytes, taux: int, largeur: int) -> "np.ndarray":
+        """Log-mel par trame de 25 ms (pas de 10 ms), centrées et normées"""
+        import numpy as np
+
+        signal = np.frombuffer(pcm, dtype=DetecteurActiviteVocale._TYPES[largeur]).astype(np.float32)
+        fenetre, pas = int(0.025 * taux), int(0.010 * taux)
+        if len(signal) < fenetre:
+            return np.zeros((0, self.nb_bandes), dtype=np.float32)
+
+        nb_trames = 1 + (len(signal) - fenetre) // pas
+        indices = np.arange(fenetre)[None, :] + pas * np.arange(nb_trames)[:, None]
+        trames = signal[indices] * np.hamming(fenetre).astype(np.float32)
+        taille_fft = 1 << (fenetre - 1).bit_length()
+        spectre = np.abs(np.fft.rfft(trames, taille_fft)) ** 2
+        log_mel = np.log(spectre @ self._banc_mel(taux, taille_fft, self.nb_bandes).T + 1e-6)
+
+        log_mel -= log_mel.mean(axis=0)
+        log_mel /= np.linalg.norm(log_mel, axis=1, keepdims=True) + 1e-6
+        return log_mel
+
+    @staticmethod
+    def distance(modele: "np.ndarray", trames: "np.ndarray") -> float:
+        """Coût DTW moyen du meilleur alignement du modèle dans l'énoncé
+
+        Pas autorisés: (1, 0), (1, 1) et (1, 2), ce qui permet de calculer
+        chaque ligne d'un coup à partir de la précédente.
+        """
+        import numpy as np
+
+        if not len(modele) or not len(trames):
+            return float("inf")
+        couts = 1 - modele @ trames.T
+        ligne = couts[0].copy()
+        for i in range(1, len(modele)):
+            precedente = ligne
+            ligne = precedente.copy()
+            ligne[1:] = np.minimum(ligne[1:], precedente[:-1])
+            ligne[2:] = np.minimum(ligne[2:], precedente[:-2])
+            ligne += couts[i]
+        return float(ligne.min() / len(modele))
+
+    def accepter(self, pcm: bytes, taux: int, largeur: int,
+                 duree_voisee: Optional[float] = None) -> bool:
+        """Vrai si l'énoncé mérite d'être envoyé à la reconnaissance
+
+        duree_voisee (SegmentAudio.duree_voisee) exclut le pré-roll et la
+        traîne du détecteur; à défaut, toute la durée du PCM compte.
+        """
+        debut = time.perf_counter()
+        duree = len(pcm) / (taux * largeur)
+        self.enonces += 1
+        self.duree_audio += duree
+
+        accepte = (duree if duree_voisee is None else duree_voisee) >= self.duree_min
+        if accepte and self.modeles:
+            trames = self.caracteristiques(pcm, taux, largeur)
+            accepte = any(self.distance(modele, trames) <= self.seuil for _, modele in self.modeles)
+
+        if not accepte:
+            self.ecartes += 1
+        self.duree_calcul += time.perf_counter() - debut
+        return accepte
+
+    def resume(self) -> str:
+        """Appels distants évités et coût CPU par seconde d'audio"""
+        cout = self.duree_calcul / self.duree_audio * 1000 if self.duree_audio else 0.0
+        return (
+            f"{self.ecartes}/{self.enonces} énoncés écartés localement "
+            f"(appels distants évités), {cout:.1f} ms CPU par seconde d'audio"
+        )
+
+
+class PipelineReconnaissance:
+    """Capture et reconnaissance en pipeline
+
+    Les énoncés capturés sont confiés à un pool de threads de reconnaissance
+    pendant que le micro continue d'écouter. Un thread de distribution traite
+    les résultats dans l'ordre de capture.
+
+    L'événement `annulation` est levé par arreter(annuler=True); la fonction
+    de reconnaissance doit le transmettre au moteur pour que les requêtes en
+    cours s'interrompent.
+
+    Chaque énoncé soumis reçoit un identifiant, indépendant des mesures de
+    latence: enonce_courant() le rend pendant sa reconnaissance comme
+    pendant son traitement.
+
+    soumettre() ne bloque jamais la capture: quand `capacite` énoncés
+    attendent déjà leur résultat (reconnaissance bloquée, service lent), le
+    plus ancien est abandonné et compté dans `abandonnes`.
+    """
+
+    _enonces = itertools.count(1)
+    _local = threading.local()
+
+    def __init__(self, reconnaitre: Callable, traiter: Callable[[str], None],
+                 en_cas_erreur: Callable[[Exception], None], nb_workers: int = 2,
+                 capacite: int = 8, statistiques: Optional[StatistiquesLatence] = None,
+                 apres_resultat: Optional[Callable[[], None]] = None,
+                 annulation: Optional[threading.Event] = None):
+        self._reconnaitre = reconnaitre
+        self._traiter = traiter
+        self._en_cas_erreur = en_cas_erreur
+        self._apres_resultat = apres_resultat
+        self.statistiques = statistiques or StatistiquesLatence()
+        self.annulation = annulation or threading.Event()
+
+        self._executeur = ThreadPoolExecutor(
+            max_workers=nb_workers,
+            thread_name_prefix="reconnaissance"
+        )
+        self.capacite = capacite
+        self._file: queue.Queue = queue.Queue(maxsize=capacite)
+        self._verrou = threading.Lock()
+        self._en_attente = 0
+        self.soumis = 0
+        self.abandonnes = 0
+        self._fermeture = threading.Event()
+
+        self._distributeur = threading.Thread(
+            target=self._distribuer,
+            name="distribution",
+            daemon=True
+        )
+        self._distributeur.start()
+
+    @property
+    def en_attente(self) -> int:
+        """Nombre d'énoncés capturés dont le résultat n'est pas encore traité"""
+        return self._en_attente
+
+    def soumettre(self, audio, delai_capture: Optional[float] = None):
+        """Confie un énoncé capturé à la reconnaissance
+
+        delai_capture: secondes entre la fin de la parole et la soumission
+        (traîne du détecteur, filtre local); None pour un énoncé sans audio.
+        """
+        correlation = self.statistiques.nouvelle_commande()
+        if delai_capture is not None:
+            self.statistiques.enregistrer("capture", delai_capture, correlation)
+        with self._verrou:
+            self._en_attente += 1
+            self.soumis += 1
+        enonce = next(self._enonces)
+        futur = self._executeur.submit(
+            self._reconnaitre_mesure, audio, time.perf_counter(), correlation, enonce
+        )
+        element = (futur, correlation, enonce)
+        while True:
+            try:
+                self._file.put_nowait(element)
+                return
+            except queue.Full:
+                pass
+            # File pleine: le plus ancien énoncé laisse sa place, la capture continue
+            try:
+                self._abandonner(self._file.get_nowait())
+            except queue.Empty:
+                pass
+
+    def _abandonner(self, element):
+        """Écarte un énoncé en file sans le traiter"""
+        if element is None:
+            return
+        futur, correlation, enonce = element
+        futur.cancel()
+        with self._verrou:
+            self._en_attente -= 1
+            self.abandonnes += 1
+        logger.info(f"File de reconnaissance pleine: énoncé #{enonce} abandonné")
+        if self._apres_resultat:
+            self._apres_resultat()
+
+    @classmethod
+    def enonce_courant(cls) -> Optional[int]:
+        """Identifiant de l'énoncé reconnu ou traité par le thread appelant"""
+        return getattr(cls._local, "enonce", None)
+
+    def _reconnaitre_mesure(self, audio, depot: float, correlation: Optional[int],
+                            enonce: int) -> str:
+        debut = time.perf_counter()
+        self.statistiques.enregistrer("file", debut - depot, correlation)
+        self._local.enonce = enonce
+        try:
+            if self.annulation.is_set():
+                raise ReconnaissanceAnnulee("pipeline")
+            return self.statistiques.avec_correlation(self._reconnaitre, correlation)(audio)
+        finally:
+            self._local.enonce = None
+            self.statistiques.enregistrer("reconnaissance", time.perf_counter() - debut, correlation)
+
+    def _distribuer(self):
+        """Traite les résultats dans l'ordre de capture"""
+        while True:
+            element = self._file.get()
+            if element is None:
+                return
+            futur, correlation, enonce = element
+            try:
+                texte = futur.result()
+                if self.annulation.is_set():
+                    continue
+                debut = time.perf_counter()
+                self._local.enonce = enonce
+                # Les étapes suivantes (interface, navigateur, parole) héritent de l'identifiant
+                self.statistiques.avec_correlation(self._traiter, correlation)(texte)
+                self.statistiques.enregistrer("traitement", time.perf_counter() - debut, correlation)
+            except Exception as e:
+                # Après annulation, les échecs des requêtes interrompues sont attendus
+                if not self.annulation.is_set():
+                    self._en_cas_erreur(e)
+            finally:
+                self._local.enonce = None
+                with self._verrou:
+                    self._en_attente -= 1
+                if self._apres_resultat:
+                    self._apres_resultat()
+            # Arrêt demandé alors que la file était pleine: elle est maintenant vidée
+            if self._fermeture.is_set() and self._file.empty():
+                return
+
+    def arreter(self, annuler: bool = False, delai: Optional[float] = None) -> bool:
+        """Arrête le pipeline
+
+        Par défaut, les énoncés déjà capturés sont encore traités. Avec
+        annuler, ceux en file sont abandonnés et les requêtes en cours
+        interrompues. Avec un délai, attend au plus `delai` secondes la fin du
+        thread de distribution; retourne faux s'il tourne encore.
+        """
+        if annuler:
+            self.annulation.set()
+        self._executeur.shutdown(wait=False, cancel_futures=annuler)
+        # Jamais bloquant: si la file est pleine, le distributeur s'arrête après l'avoir vidée
+        self._fermeture.set()
+        try:
+            self._file.put_nowait(None)
+        except queue.Full:
+            pass
+        if delai is not None:
+            self._distributeur.join(delai)
+            return not self._distributeur.is_alive()
+        return True
+
+
+def ouvrir_dans_navigateur(urls: List[str]):
+    """Ouvre des URL en un seul appel au navigateur quand il le permet
+
+    Les navigateurs lancés directement (Firefox, Chrome...) acceptent
+    plusieurs URL sur leur ligne de commande; les autres contrôleurs
+    (xdg-open, navigateur par défaut du système) sont appelés par URL.
+    """
+    if len(urls) > 1:
+        try:
+            controleur = webbrowser.get()
+        except webbrowser.Error:
+            controleur = None
+        if isinstance(controleur, webbrowser.UnixBrowser):
+            import subprocess
+            subprocess.Popen([controleur.name, *urls], stdout=subprocess.DEVNULL,
+                             stderr=subprocess.DEVNULL, start_new_session=True)
+            return
+    for url in urls:
+        webbrowser.open(url, new=2)
+
+
+def prechauffer_navigateur():
+    """Résout une fois pour toutes le navigateur par défaut (recherche des exécutables)"""
+    try:
+        webbrowser.get()
+    except webbrowser.Error as e:
+        logger.debug(f"Aucun navigateur par défaut: {e}")
+
+
+class NavigateurEnregistreur:
+    """Navigateur de substitution: enregistre les appels au lieu d'ouvrir des onglets"""
+
+    def __init__(self, duree_simulee: float = 0.0):
+        self.duree_simulee = duree_simulee
+        self.appels: List[Tuple[float, Tuple[str, ...]]] = []
+
+    def __call__(self, urls: List[str]):
+        self.appels.append((time.perf_counter(), tuple(urls)))
+        if self.duree_simulee:
+            time.sleep(self.duree_simulee)
+
+    @property
+    def urls(self) -> List[str]:
+        return [url for _, lot in self.appels for url in lot]
+
+
+class LanceurNavigateur:
+    """Ouvre les URL dans un thread dédié, sans bloquer la boucle Tk
+
+    Une URL déjà demandée dans la fenêtre de déduplication est ignorée (le
+    moteur entend parfois deux fois la même commande). Les URL d'un même
+    énoncé (un appel à ouvrir(), ou plusieurs dans un bloc `with lot()`),
+    ainsi que toutes celles en attente quand le thread se libère, partent
+    en un seul appel au navigateur.
+
+    prechauffer() fait exécuter `prechauffer` par le thread, une seule fois,
+    avant la première ouverture: rien ne s'affiche, l'ouverture suivante
+    trouve le navigateur déjà résolu.
+    """
+
+    def __init__(self, ouvrir: Callable[[List[str]], None] = ouvrir_dans_navigateur,
+                 fenetre_doublons: float = 2.0,
+                 en_cas_echec: Optional[Callable[[List[str], Exception], None]] = None,
+                 statistiques: Optional[StatistiquesLatence] = None,
+                 prechauffer: Optional[Callable[[], None]] = prechauffer_navigateur):
+        self._ouvrir = ouvrir
+        self._prechauffer = prechauffer
+        self._a_prechauffer = False
+        self._statistiques = statistiques
+        self.fenetre_doublons = fenetre_doublons
+        self._en_cas_echec = en_cas_echec
+        self._derniers: Dict[str, float] = {}
+        # (url, identifiant de corrélation, instant de la demande)
+        self._attente: List[Tuple[str, Optional[int], float]] = []
+        self._condition = threading.Condition()
+        self._active = True
+        self._lots = 0
+        self.ignores = 0
+
+        self._thread = threading.Thread(target=self._boucle, name="navigateur", daemon=True)
+        self._thread.start()
+
+    def ouvrir(self, *urls: str) -> List[str]:
+        """Planifie l'ouverture; retourne les URL retenues après déduplication"""
+        maintenant = time.monotonic()
+        correlation = self._statistiques.correlation_courante() if self._statistiques else None
+        retenues = []
+        with self._condition:
+            if not self._active:
+                return retenues
+            # Oubli des demandes sorties de la fenêtre
+            self._derniers = {
+                url: instant for url, instant in self._derniers.items()
+                if maintenant - instant < self.fenetre_doublons
+            }
+            for url in urls:
+                if url in self._derniers:
+                    self.ignores += 1
+                    continue
+                self._derniers[url] = maintenant
+                retenues.append(url)
+            if retenues:
+                depot = time.perf_counter()
+                self._attente.extend((url, correlation, depot) for url in retenues)
+                self._condition.notify()
+        return retenues
+
+    def prechauffer(self):
+        """Demande le préchauffage du navigateur (sans effet après le premier)"""
+        with self._condition:
+            if self._prechauffer is None or not self._active:
+                return
+            self._a_prechauffer = True
+            self._condition.notify()
+
+    @contextmanager
+    def lot(self):
+        """Regroupe les ouvertures demandées dans le bloc en un seul appel"""
+        with self._condition:
+            self._lots += 1
+        try:
+            yield self
+        finally:
+            with self._condition:
+                self._lots -= 1
+                self._condition.notify()
+
+    def _boucle(self):
+        """Boucle du thread navigateur"""
+        while True:
+            with self._condition:
+                while self._active and not self._a_prechauffer and (not self._attente or self._lots):
+                    self._condition.wait()
+                if not self._active:
+                    return
+                prechauffer = None
+                if self._a_prechauffer:
+                    # Une seule fois, avant les ouvertures en attente
+                    self._a_prechauffer = False
+                    prechauffer, self._prechauffer = self._prechauffer, None
+                else:
+                    demandes, self._attente = self._attente, []
+
+            if prechauffer:
+                try:
+                    prechauffer()
+                except Exception as e:
+                    logger.debug(f"Préchauffage du navigateur impossible: {e}")
+                continue
+
+            lot = [url for url, _, _ in demandes]
+            try:
+                self._ouvrir(lot)
+            except Exception as e:
+                logger.error(f"Ouverture du navigateur impossible ({', '.join(lot)}): {e}")
+                if self._en_cas_echec:
+                    self._en_cas_echec(lot, e)
+            if self._statistiques:
+                fin = time.perf_counter()
+                for _, correlation, depot in demandes:
+                    self._statistiques.enregistrer("navigateur", fin - depot, correlation)
+
+    def arreter(self):
+        """Arrête le thread; les ouvertures non encore lancées sont abandonnées"""
+        with self._condition:
+            self._active = False
+            self._attente.clear()
+            self._condition.notify_all()
+
+
+class Speculateur:
+    """Préparation spéculative des commandes sur les hypothèses intermédiaires
+
+    Dès qu'une hypothèse assez sûre contient le mot-clé exact d'un site,
+    preparer(intention, url) lance ce qui est bon marché et sans effet
+    visible: navigateur préchauffé, URL résolue, annonce rendue en cache.
+    Seul le résultat final déclenche l'action; confirmer() relève alors les
+    préparations confirmées ou abandonnées et rend les URL déjà résolues.
+    Les énoncés sont distingués par leur identifiant
+    (PipelineReconnaissance.enonce_courant()).
+    """
+
+    def __init__(self, moteur_commandes: MoteurCommandes,
+                 preparer: Callable[[Intention, Optional[str]], None],
+                 confiance_min: float = 0.8, capacite: int = 16):
+        self.moteur_commandes = moteur_commandes
+        self._preparer = preparer
+        self.confiance_min = confiance_min
+        self.capacite = capacite
+        self._verrou = threading.Lock()
+        # Identifiant d'énoncé -> {site préparé: (instant de la préparation, URL)}
+        self._en_cours: OrderedDict = OrderedDict()
+        self.preparations = 0
+        self.confirmees = 0
+        self.abandonnees = 0
+        # Avance prise sur le résultat final par les préparations confirmées (s)
+        self.avances: deque = deque(maxlen=500)
+
+    def hypothese(self, enonce: int, texte: str, confiance: float) -> List[Intention]:
+        """Prépare les sites nommés par une hypothèse; retourne ceux préparés pour la première fois"""
+        if confiance < self.confiance_min:
+            return []
+        nouvelles = []
+        for intention in self.moteur_commandes.intentions(texte):
+            if intention.categorie != "sites" or intention.approchee:
+                continue
+            url = self.moteur_commandes.url(intention)
+            with self._verrou:
+                preparees = self._en_cours.get(enonce)
+                if preparees is None:
+                    if len(self._en_cours) >= self.capacite:
+                        # Énoncé resté sans résultat final (erreur, annulation)
+                        self.abandonnees += len(self._en_cours.popitem(last=False)[1])
+                    preparees = self._en_cours[enonce] = {}
+                if intention.cle in preparees:
+                    continue
+                preparees[intention.cle] = (time.perf_counter(), url)
+                self.preparations += 1
+            nouvelles.append(intention)
+            try:
+                self._preparer(intention, url)
+            except Exception as e:
+                logger.debug(f"Préparation de {intention.cle} impossible: {e}")
+        return nouvelles
+
+    def confirmer(self, enonce: Optional[int], intentions: List[Intention]) -> Dict[str, Optional[str]]:
+        """Résultat final de l'énoncé: retourne les URL préparées des sites confirmés"""
+        if enonce is None:
+            return {}
+        with self._verrou:
+            preparees = self._en_cours.pop(enonce, None)
+            if not preparees:
+                return {}
+            maintenant = time.perf_counter()
+            cles = {intention.cle for intention in intentions}
+            confirmees = {}
+            for cle, (instant, url) in preparees.items():
+                if cle in cles:
+                    confirmees[cle] = url
+                    self.avances.append(maintenant - instant)
+            self.confirmees += len(confirmees)
+            self.abandonnees += len(preparees) - len(confirmees)
+        return confirmees
+
+    def resume(self) -> str:
+        """Préparations confirmées, abandonnées et avance médiane"""
+        avances = sorted(self.avances)
+        avance = avances[len(avances) // 2] * 1000 if avances else 0.0
+        return (f"{self.preparations} préparation(s), {self.confirmees} confirmée(s), "
+                f"{self.abandonnees} abandonnée(s), avance médiane {avance:.0f} ms")
+
+
+class CycleEcoute:
+    """Cycle de vie de l'écoute: un seul thread de capture, annulable
+
+    demarrer() et arreter() peuvent être appelés dans n'importe quel ordre
+    et à n'importe quelle cadence: les sessions s'enchaînent dans un même
+    thread, qui exécute boucle(arret) tant que l'écoute est voulue. Une
+    session doit rendre la main peu après que `arret` est levé; le thread
+    se termine quand l'écoute n'est plus voulue.
+    """
+
+    def __init__(self, boucle: Callable[[threading.Event], None], nom: str = "ecoute"):
+        self._boucle = boucle
+        self._nom = nom
+        self._verrou = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._arret: Optional[threading.Event] = None
+        self._voulu = False
+        self.sessions = 0
+
+    @property
+    def actif(self) -> bool:
+        """Vrai si l'écoute est voulue (la session peut encore démarrer)"""
+        return self._voulu
+
+    def demarrer(self):
+        """Demande l'écoute; sans effet si une session tourne déjà"""
+        with self._verrou:
+            self._voulu = True
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._executer, name=self._nom, daemon=True)
+                self._thread.start()
+
+    def arreter(self, delai: Optional[float] = None) -> bool:
+        """Interrompt la session en cours
+
+        Sans délai, retourne aussitôt; avec un délai, attend au plus `delai`
+        secondes la fin du thread et retourne faux s'il tourne encore.
+        """
+        with self._verrou:
+            self._voulu = False
+            if self._arret is not None:
+                self._arret.set()
+            thread = self._thread
+        if thread is None or delai is None:
+            return True
+        thread.join(delai)
+        return not thread.is_alive()
+
+    def _executer(self):
+        while True:
+            with self._verrou:
+                if not self._voulu:
+                    self._thread = None
+                    self._arret = None
+                    return
+                arret = self._arret = threading.Event()
+            self.sessions += 1
+            try:
+                self._boucle(arret)
+            except Exception as e:
+                logger.error(f"Session d'écoute interrompue: {e}")
+
+
+class ModeApparence(Enum):
+    """Modes d'apparence de l'interface"""
+    SOMBRE = "dark"
+    CLAIR = "light"
+    SYSTEME = "system"
+
+class AssistantVocalApp:
+    """Application principale de l'assistant vocal"""
+
+    def __init__(self):
+        """Initialise l'application avec toutes les configurations"""
+        self._initialiser_parametres()
+        self._configurer_interface()
+        self._initialiser_moteur_vocal()
+        self._initialiser_variables_etat()
+        self._creer_widgets()
+        self._demarrer_assistant()
+
+        # Les sous-systèmes lourds attendent que la fenêtre soit affichée
+        self.root.after_idle(lambda: self.root.after(0, self._apres_premier_affichage))
+
+    def _apres_premier_affichage(self):
+        """Charge en arrière-plan ce qui n'est pas nécessaire au premier affichage"""
+        logger.info("Fenêtre affichée")
+        self.parole.demarrer()
+        # Les annonces fixes sont rendues en cache pendant les temps morts
+        self.parole.precharger(self._phrases_fixes())
+        threading.Thread(target=self._prechauffer_reconnaissance, name="prechauffage", daemon=True).start()
+        threading.Thread(target=self._surveiller_registre, name="registre", daemon=True).start()
+        if self.fichier_metriques:
+            threading.Thread(target=self._ecrire_metriques, name="metriques", daemon=True).start()
+        if self.panneau_diagnostics:
+            self._rafraichir_diagnostics()
+
+    def _prechauffer_reconnaissance(self):
+        """Importe à l'avance la reconnaissance vocale et NumPy"""
+        try:
+            import speech_recognition
+            import numpy
+        except ImportError as e:
+            logger.warning(f"Reconnaissance vocale indisponible: {e}")
+
+    def _initialiser_parametres(self):
+        """Initialise les paramètres de l'application"""
+        self.mode_apparence = ModeApparence.SOMBRE
+        self.langue = "fr-FR"
+        self.vitesse_parole = 170
+        self.volume_parole = 0.9
+        self.etat = EtatPersistant()
+        self.lignes_console = 300
+        self.taille_cache_parole = 20 * 1024 * 1024
+        self.workers_reconnaissance = 2
+        self.delai_reconnaissance = 8.0
+        # Attente maximale de la fin des reconnaissances annulées à l'arrêt de l'écoute
+        self.delai_arret_ecoute = 0.1
+        self.pre_roll = 0.3
+        self.hangover_parole = 0.15
+        # Audio capturé gardé en mémoire (VAD, reconnaissance, enregistrement le lisent sans copie)
+        self.duree_tampon_audio = 30.0
+        # Répertoire où enregistrer les énoncés soumis; None: aucun enregistrement
+        self.repertoire_enregistrements: Optional[str] = None
+        # Rognage, normalisation et 16 kHz mono avant l'envoi au service distant
+        self.pretraitement_audio = True
+        # Moteur hors ligne (paires nom.wav / nom.txt); None: Google seul
+        self.repertoire_moteur_local: Optional[str] = None
+        # Avec un moteur local: Google est couvert par lui après ce délai (ou dès
+        # un échec); None: moteur local seul
+        self.delai_couverture: Optional[float] = 1.0
+        # Circuit ouvert: "attendre" garde les derniers énoncés pour la reprise, "abandonner" les ignore
+        self.politique_circuit_ouvert = "attendre"
+        self.capacite_attente_circuit = 5
+        self.age_max_attente_circuit = 20.0
+        # Hypothèses intermédiaires (moteurs qui en livrent): préparation des sites dès le mot-clé
+        self.speculation_active = True
+        self.confiance_speculation = 0.8
+        self.seuil_flou = 0.55
+        # Répertoire de modèles WAV (mots-clés ou mot d'éveil) du filtre local
+        self.repertoire_filtre_local: Optional[str] = None
+        # Filtre local: None l'active seulement avec des modèles; True ajoute aussi le
+        # filtre de durée seul (écarte toute commande brève, comme « aide » dit vite)
+        self.filtre_local_actif: Optional[bool] = None
+        # Parole effective minimale d'un énoncé transmis par le filtre local
+        self.duree_min_filtre_local = 0.25
+        self.fenetre_doublons_navigateur = 2.0
+        self.ouvrir_navigateur: Callable[[List[str]], None] = ouvrir_dans_navigateur
+        self.fichier_historique = FICHIER_HISTORIQUE
+        # Mesure des latences par étape; panneau et fichier de métriques en option
+        self.instrumentation_active = True
+        self.panneau_diagnostics = False
+        self.fichier_metriques: Optional[str] = None
+        self.periode_metriques = 30.0
+        self.statistiques = StatistiquesLatence(actif=self.instrumentation_active)
+
+    def _configurer_interface(self):
+        """Configure l'interface graphique"""
+        ctk.set_appearance_mode(self.mode_apparence.value)
+        ctk.set_default_color_theme("blue")
+
+        self.root = ctk.CTk()
+        self.root.title("DonCharlesAssistant")
+        self.root.geometry("800x600")
+        self.root.resizable(False, False)
+
+        # Protection contre la fermeture brusque
+        self.root.protocol("WM_DELETE_WINDOW", self.quitter)
+
+        # Toutes les mises à jour de widgets passent par ce canal
+        self.ui = CanalInterface(self.root, self._afficher_lignes_console)
+
+        # Centre la fenêtre
+        self.root.update_idletasks()
+        width = self.root.winfo_width()
+        height = self.root.winfo_height()
+        x = (self.root.winfo_screenwidth() // 2) - (width // 2)
+        y = (self.root.winfo_screenheight() // 2) - (height // 2)
+        self.root.geometry(f'{width}x{height}+{x}+{y}')
+
+    def _initialiser_moteur_vocal(self):
+        """Démarre le thread de synthèse vocale"""
+        self.parole = FileParole(
+            self._creer_moteur_vocal,
+            en_cas_echec=self._signaler_echec_parole,
+            cache=CacheParole(REPERTOIRE_CACHE_PAROLE, self.taille_cache_parole),
+            demarrage_differe=True,
+            statistiques=self.statistiques
+        )
+
+    def _creer_moteur_vocal(self):
+        """Crée et configure le moteur de synthèse (dans le thread de synthèse)"""
+        try:
+            import pyttsx3
+            engine = pyttsx3.init()
+
+            # Configuration des propriétés
+            engine.setProperty('rate', self.vitesse_parole)
+            engine.setProperty('volume', self.volume_parole)
+
+            # Chercher une voix appropriée
+            self._configurer_voix(engine)
+
+            logger.info("Moteur vocal initialisé avec succès")
+            return engine
+
+        except Exception as e:
+            logger.error(f"Erreur d'initialisation du moteur vocal: {e}")
+            # Créer un moteur factice pour éviter les crashs
+            return type('obj', (object,), {
+                'say': lambda _, x: print(f"TTS: {x}"),
+                'runAndWait': lambda _: None,
+                'setProperty': lambda _, x, y: None,
+                'stop': lambda _: None
+            })()
+
+    def _configurer_voix(self, engine):
+        """Configure la voix de synthèse (la voix retenue est mémorisée)"""
+        # La voix choisie lors d'un lancement précédent évite l'énumération
+        voix_memorisee = self.etat.lire("voix")
+        if voix_memorisee:
+            try:
+                engine.setProperty('voice', voix_memorisee)
+                logger.info(f"Voix mémorisée sélectionnée: {voix_memorisee}")
+                return
+            except Exception as e:
+                logger.warning(f"Voix mémorisée indisponible: {e}")
+
+        try:
+            voices = engine.getProperty('voices')
+
+            # Priorité 1: Voix française
+            french_voices = [
+                v for v in voices
+                if any(fr_indicator in v.name.lower() for fr_indicator in ['fr', 'french', 'français'])
+            ]
+
+            if french_voices:
+                engine.setProperty('voice', french_voices[0].id)
+                self.etat.ecrire("voix", french_voices[0].id)
+                logger.info(f"Voix française sélectionnée: {french_voices[0].name}")
+                return
+
+            # Priorité 2: Voix anglaise féminine
+            female_voices = [
+                v for v in voices
+                if 'female' in v.name.lower() or 'zira' in v.name.lower()
+            ]
+
+            if female_voices:
+                engine.setProperty('voice', female_voices[0].id)
+                self.etat.ecrire("voix", female_voices[0].id)
+                logger.info(f"Voix féminine sélectionnée: {female_voices[0].name}")
+                return
+
+            # Priorité 3: Première voix disponible
+            if voices:
+                engine.setProperty('voice', voices[0].id)
+                self.etat.ecrire("voix", voices[0].id)
+                logger.info(f"Voix par défaut sélectionnée: {voices[0].name}")
+
+        except Exception as e:
+            logger.warning(f"Configuration de voix échouée: {e}")
+
+    def _initialiser_variables_etat(self):
+        """Initialise les variables d'état de l'application"""
+        self.ecoute_active = False
+        # Annonces des actions d'une phrase à plusieurs commandes (thread de l'interface)
+        self._annonces_lot: Optional[List[str]] = None
+        # Un seul thread de capture, quelle que soit la cadence des bascules
+        self.cycle_ecoute = CycleEcoute(self._boucle_ecoute)
+        self._pipeline = None
+        # Pendant une panne, le disjoncteur refuse les appels sans solliciter le service
+        self.disjoncteur = Disjoncteur(en_changement=self._signaler_etat_circuit)
+        self.moteur_reconnaissance = self._creer_moteur_reconnaissance()
+        self._enonces_en_attente: deque = deque(maxlen=self.capacite_attente_circuit)
+        self.reconnaissance_active = True
+        self.historique = HistoriqueCommandes(self.fichier_historique)
+        self.navigateur = LanceurNavigateur(
+            self.ouvrir_navigateur,
+            fenetre_doublons=self.fenetre_doublons_navigateur,
+            en_cas_echec=self._signaler_echec_navigateur,
+            statistiques=self.statistiques
+        )
+
+        # Initialisation des commandes
+        self._initialiser_commandes()
+
+    def _initialiser_commandes(self):
+        """Initialise les commandes à partir du registre"""
+        self.boutons_sites: Dict[str, ctk.CTkButton] = {}
+        self.frame_boutons = None
+        self._arret_surveillance = threading.Event()
+        self.moteur_commandes = MoteurCommandes(FICHIER_COMMANDES, self.seuil_flou)
+        self.moteur_commandes.charger()
+        self.speculateur = Speculateur(
+            self.moteur_commandes, self._preparer_intention, self.confiance_speculation
+        )
+
+    @property
+    def sites(self) -> Dict[str, Site]:
+        """Sites du registre, dans l'ordre d'affichage"""
+        return self.moteur_commandes.sites
+
+    @property
+    def commandes(self) -> Dict[str, Commande]:
+        return self.moteur_commandes.commandes
+
+    def _surveiller_registre(self, periode: float = 1.0):
+        """Recharge le registre à chaque modification du fichier (thread dédié)"""
+        while not self._arret_surveillance.wait(periode):
+            debut = time.perf_counter()
+            # Les index sont mis à jour ici, sous le verrou du moteur de commandes
+            changements = self.moteur_commandes.recharger_si_modifie()
+            if changements is not None:
+                duree = time.perf_counter() - debut
+                self.ui.appeler(lambda c=changements, d=duree: self._appliquer_registre_modifie(c, d))
+
+    def _ecrire_metriques(self):
+        """Écrit périodiquement les percentiles de latence (thread dédié)"""
+        while not self._arret_surveillance.wait(self.periode_metriques):
+            self.statistiques.ecrire_metriques(self.fichier_metriques)
+
+    def _rafraichir_diagnostics(self, periode_ms: int = 1000):
+        """Affiche les percentiles par étape et la dernière commande (thread Tk)"""
+        lignes = [
+            f"{etape:<15}p50 {p['p50']:>6.0f}  p95 {p['p95']:>6.0f}  p99 {p['p99']:>6.0f} ms  (n={p['n']})"
+            for etape, p in self.statistiques.instantane().items()
+        ]
+        derniere = self.statistiques.derniere_trace()
+        if derniere:
+            correlation, etapes = derniere
+            lignes.append(f"#{correlation}: " + ", ".join(
+                f"{etape} {duree * 1000:.0f}" for etape, duree in etapes.items()
+            ))
+        if self.speculateur.preparations:
+            lignes.append(f"Spéculation: {self.speculateur.resume()}")
+        self.label_diagnostics.configure(text="\n".join(lignes) or "Aucune mesure")
+        if not self._arret_surveillance.is_set():
+            self.root.after(periode_ms, self._rafraichir_diagnostics)
+
+    def _appliquer_registre_modifie(self, changements: ChangementsRegistre, duree: float):
+        """Met les boutons à jour après un rechargement du registre et le signale"""
+        if self.frame_boutons is not None:
+            self._mettre_a_jour_boutons_sites(changements)
+        self._mettre_a_jour_console(
+            f"Registre rechargé: {len(changements.sites_modifies)} site(s) modifié(s), "
+            f"{len(changements.sites_retires)} retiré(s) en {duree * 1000:.1f} ms",
+            "INFO"
+        )
+        self.parole.precharger([self._annonce_ouverture(site) for site in changements.sites_modifies.values()])
+
+    def ajouter_commande(self, cle, commande: Commande):
+        """Ajoute ou remplace une commande et met l'index à jour"""
+        self.moteur_commandes.ajouter_commande(cle, commande)
+
+    def retirer_commande(self, cle):
+        """Retire une commande et met l'index à jour"""
+        self.moteur_commandes.retirer_commande(cle)
+
+    def _creer_widgets(self):
+        """Crée tous les widgets de l'interface"""
+        # Configuration du grid principal
+        self.root.grid_columnconfigure(0, weight=1)
+
+        self._creer_en_tete()
+        self._creer_panel_sites()
+        self._creer_panel_recherche()
+        self._creer_panel_controle()
+        self._creer_console_statut()
+        self._creer_pied_page()
+
+    def _creer_en_tete(self):
+        """Crée l'en-tête de l'application"""
+        frame_titre = ctk.CTkFrame(self.root, corner_radius=10)
+        frame_titre.grid(row=0, column=0, padx=15, pady=(15, 5), sticky="ew")
+        frame_titre.grid_columnconfigure(0, weight=1)
+
+        titre = ctk.CTkLabel(
+            frame_titre,
+            text="🎙️ Assistant Vocal Intelligent",
+            font=("Arial", 26, "bold")
+        )
+        titre.grid(row=0, column=0, pady=15)
+
+        sous_titre = ctk.CTkLabel(
+            frame_titre,
+            text="Contrôle vocal de votre navigation web",
+            font=("Arial", 14),
+            text_color="gray"
+        )
+        sous_titre.grid(row=1, column=0, pady=(0, 10))
+
+    def _creer_panel_sites(self):
+        """Crée le panel des sites rapides"""
+        frame_sites = ctk.CTkFrame(self.root, corner_radius=10)
+        frame_sites.grid(row=1, column=0, padx=15, pady=5, sticky="ew")
+
+        label_sites = ctk.CTkLabel(
+            frame_sites,
+            text="📋 Sites Rapides",
+            font=("Arial", 16, "bold")
+        )
+        label_sites.pack(pady=(10, 5))
+
+        # Grille de boutons pour les sites
+        self.frame_boutons = ctk.CTkFrame(frame_sites)
+        self.frame_boutons.pack(pady=10, padx=10)
+
+        for site in self.sites.values():
+            self._creer_bouton_site(site)
+        self._placer_boutons_sites()
+
+    def _creer_bouton_site(self, site: Site):
+        """Crée (ou recrée) le bouton d'un site"""
+        ancien = self.boutons_sites.pop(site.id, None)
+        if ancien is not None:
+            ancien.destroy()
+        if not site.texte_bouton:
+            return
+
+        self.boutons_sites[site.id] = ctk.CTkButton(
+            self.frame_boutons,
+            text=site.texte_bouton,
+            command=lambda s=site.id: self._ouvrir_site(s),
+            width=140,
+            height=40,
+            font=("Arial", 12),
+            fg_color=site.couleur,
+            hover_color=self._eclaircir_couleur(site.couleur),
+            corner_radius=8
+        )
+
+    def _placer_boutons_sites(self):
+        """Place les boutons dans la grille, dans l'ordre du registre"""
+        boutons = [self.boutons_sites[s] for s in self.sites if s in self.boutons_sites]
+        for i, btn in enumerate(boutons):
+            row = i // 3
+            col = i % 3
+            btn.grid(row=row, column=col, padx=8, pady=8)
+
+    def _mettre_a_jour_boutons_sites(self, changements: ChangementsRegistre):
+        """Ne recrée que les boutons des sites modifiés"""
+        for site_id in changements.sites_retires:
+            bouton = self.boutons_sites.pop(site_id, None)
+            if bouton is not None:
+                bouton.destroy()
+        for site in changements.sites_modifies.values():
+            self._creer_bouton_site(site)
+        if changements.sites_modifies or changements.sites_retires or changements.ordre:
+            self._placer_boutons_sites()
+
+    def _creer_panel_recherche(self):
+        """Crée le panel de recherche"""
+        frame_recherche = ctk.CTkFrame(self.root, corner_radius=10)
+        frame_recherche.grid(row=2, column=0, padx=15, pady=5, sticky="ew")
+
+        label_recherche = ctk.CTkLabel(
+            frame_recherche,
+            text="🔍 Recherche Web",
+            font=("Arial", 16, "bold")
+        )
+        label_recherche.pack(pady=(10, 5))
+
+        # Champ de recherche avec bouton
+        self.entry_recherche = ctk.CTkEntry(
+            frame_recherche,
+            width=450,
+            height=45,
+            placeholder_text="Entrez votre recherche ou dites 'Rechercher [mot-clé]'...",
+            font=("Arial", 13),
+            corner_radius=10
+        )
+        self.entry_recherche.pack(pady=10, padx=20)
+        self.entry_recherche.bind('<Return>', lambda e: self._effectuer_recherche())
+
+        btn_frame = ctk.CTkFrame(frame_recherche, fg_color="transparent")
+        btn_frame.pack(pady=(0, 10))
+
+        btn_rechercher = ctk.CTkButton(
+            btn_frame,
+            text="🔎 Lancer la recherche",
+            command=self._effectuer_recherche,
+            width=200,
+            height=40,
+            font=("Arial", 13, "bold"),
+            corner_radius=10
+        )
+        btn_rechercher.pack(side="left", padx=5)
+
+        btn_effacer = ctk.CTkButton(
+            btn_frame,
+            text="🗑️ Effacer",
+            command=lambda: self.entry_recherche.delete(0, 'end'),
+            width=100,
+            height=40,
+            font=("Arial", 12),
+            fg_color="gray",
+            hover_color="dark gray",
+            corner_radius=10
+        )
+        btn_effacer.pack(side="left", padx=5)
+
+    def _creer_panel_controle(self):
+        """Crée le panel de contrôle vocal"""
+        frame_controle = ctk.CTkFrame(self.root, corner_radius=10)
+        frame_controle.grid(row=3, column=0, padx=15, pady=5, sticky="ew")
+
+        self.btn_ecouter = ctk.CTkButton(
+            frame_controle,
+            text="🎤 Démarrer l'écoute vocale",
+            command=self._toggle_ecoute,
+            width=280,
+            height=50,
+            font=("Arial", 15, "bold"),
+            corner_radius=12
+        )
+        self.btn_ecouter.pack(pady=15)
+
+        # Indicateur d'activité
+        self.label_indicateur = ctk.CTkLabel(
+            frame_controle,
+            text="● Écoute inactive",
+            text_color="gray",
+            font=("Arial", 12)
+        )
+        self.label_indicateur.pack(pady=(0, 10))
+
+        if self.panneau_diagnostics:
+            self.label_diagnostics = ctk.CTkLabel(
+                frame_controle,
+                text="",
+                font=("Consolas", 10),
+                text_color="gray",
+                justify="left"
+            )
+            self.label_diagnostics.pack(pady=(0, 10))
+
+    def _creer_console_statut(self):
+        """Crée la console de statut"""
+        frame_console = ctk.CTkFrame(self.root, corner_radius=10)
+        frame_console.grid(row=4, column=0, padx=15, pady=5, sticky="nsew")
+
+        # Configuration pour l'expansion
+        self.root.grid_rowconfigure(4, weight=1)
+        frame_console.grid_columnconfigure(0, weight=1)
+        frame_console.grid_rowconfigure(0, weight=1)
+
+        label_console = ctk.CTkLabel(
+            frame_console,
+            text="📝 Journal d'activité",
+            font=("Arial", 14, "bold")
+        )
+        label_console.grid(row=0, column=0, padx=10, pady=5, sticky="w")
+
+        # Zone de texte pour les logs
+        self.text_console = ctk.CTkTextbox(
+            frame_console,
+            font=("Consolas", 11),
+            corner_radius=8
+        )
+        self.text_console.grid(row=1, column=0, padx=10, pady=(0, 10), sticky="nsew")
+        self.text_console.configure(state="disabled")
+
+        self.journal = JournalConsole(
+            self.text_console,
+            lignes_affichees=self.lignes_console
+        )
+
+    def _creer_pied_page(self):
+        """Crée le pied de page"""
+        frame_pied = ctk.CTkFrame(self.root, height=50, corner_radius=10)
+        frame_pied.grid(row=5, column=0, padx=15, pady=(5, 15), sticky="ew")
+
+        btn_quitter = ctk.CTkButton(
+            frame_pied,
+            text="🚪 Quitter l'application",
+            command=self.quitter,
+            width=200,
+            height=40,
+            font=("Arial", 13),
+            fg_color="#D32F2F",
+            hover_color="#B71C1C",
+            corner_radius=10
+        )
+        btn_quitter.pack(pady=10)
+
+        # Statut en bas
+        self.label_statut = ctk.CTkLabel(
+            frame_pied,
+            text="Prêt",
+            font=("Arial", 11),
+            text_color="green"
+        )
+        self.label_statut.pack(pady=(0, 5))
+
+    def _demarrer_assistant(self):
+        """Démarre l'assistant avec un message de bienvenue"""
+        message_accueil = (
+            f"Assistant vocal initialisé à {datetime.now().strftime('%H:%M:%S')}. "
+            "Prêt à recevoir vos commandes."
+        )
+        self._mettre_a_jour_console(message_accueil, "INFO")
+        self._mettre_a_jour_statut("Prêt")
+        self._parler("Assistant vocal initialisé. Je suis prêt à vous aider.", ephemere=True)
+
+    def _phrases_fixes(self) -> List[str]:
+        """Annonces prononcées à l'identique d'une commande à l'autre"""
+        return [
+            "Assistant vocal initialisé. Je suis prêt à vous aider.",
+            "Écoute activée. Je vous écoute.",
+            "Je n'ai pas compris. Essayez une autre commande.",
+            "Problème de connexion internet.",
+            "Veuillez entrer une requête de recherche.",
+            self._texte_aide(),
+        ] + [self._annonce_ouverture(site) for site in self.sites.values()]
+
+    @staticmethod
+    def _annonce_ouverture(site: Site) -> str:
+        """Annonce prononcée à l'ouverture d'un site (même texte pour le cache de parole)"""
+        return f"Ouverture de {site.nom}"
+
+    def _ouvrir_site(self, site_id: str, url: Optional[str] = None):
+        """Ouvre un site web du registre (url: déjà résolue par la spéculation)"""
+        site = self.sites.get(site_id)
+        if site is None:
+            self._mettre_a_jour_console(f"Site inconnu: {site_id}", "AVERTISSEMENT")
+            return
+
+        try:
+            url = url or site.url
+            if not self.navigateur.ouvrir(url):
+                self._mettre_a_jour_console(f"{site.nom} vient déjà d'être ouvert", "INFO")
+                return
+
+            message = self._annonce_ouverture(site)
+            self._mettre_a_jour_console(message, "SUCCES")
+            self._mettre_a_jour_statut(f"Ouvert: {site.nom}")
+            self._annoncer(message)
+
+            # Historique
+            self.historique.ajouter('site', site.nom, url)
+
+            logger.info(f"Site ouvert: {site.nom} ({url})")
+
+        except Exception as e:
+            erreur_msg = f"Erreur lors de l'ouverture de {site.nom}: {str(e)}"
+            self._mettre_a_jour_console(erreur_msg, "ERREUR")
+            self._mettre_a_jour_statut("Erreur")
+            logger.error(erreur_msg)
+
+    def _effectuer_recherche(self, requete: Optional[str] = None):
+        """Effectue une recherche web"""
+        try:
+            if not requete:
+                requete = self.entry_recherche.get().strip()
+
+            if not requete:
+                self._mettre_a_jour_console("Requête vide", "AVERTISSEMENT")
+                self._mettre_a_jour_statut("Requête vide")
+                self._parler("Veuillez entrer une requête de recherche.")
+                return
+
+            url_recherche = self.moteur_commandes.url_recherche(requete)
+            if not self.navigateur.ouvrir(url_recherche):
+                self._mettre_a_jour_console(f"Recherche '{requete}' déjà lancée", "INFO")
+                return
+
+            message = f"Recherche: '{requete}'"
+            self._mettre_a_jour_console(message, "SUCCES")
+            self._mettre_a_jour_statut(f"Recherche: {requete[:20]}...")
+            self._annoncer(f"Recherche pour {requete}")
+
+            # Historique
+            self.historique.ajouter('recherche', requete, url_recherche)
+
+            logger.info(f"Recherche effectuée: {requete}")
+
+        except Exception as e:
+            erreur_msg = f"Erreur de recherche: {str(e)}"
+            self._mettre_a_jour_console(erreur_msg, "ERREUR")
+            self._mettre_a_jour_statut("Erreur recherche")
+            logger.error(erreur_msg)
+
+    def _toggle_ecoute(self):
+        """Active ou désactive l'écoute vocale"""
+        if self.ecoute_active:
+            self._arreter_ecoute()
+        else:
+            self._demarrer_ecoute()
+
+    def _demarrer_ecoute(self):
+        """Démarre l'écoute vocale"""
+        try:
+            self.ecoute_active = True
+            self.ui.configurer(
+                self.btn_ecouter,
+                text="⏸️ Arrêter l'écoute",
+                fg_color="#D32F2F",
+                hover_color="#B71C1C"
+            )
+            self.ui.configurer(
+                self.label_indicateur,
+                text="● Écoute active - Parlez maintenant",
+                text_color="green"
+            )
+
+            self._mettre_a_jour_console("Écoute vocale activée", "INFO")
+            self._mettre_a_jour_statut("Écoute active")
+            self._parler("Écoute activée. Je vous écoute.", ephemere=True)
+
+            # Reprend la session en cours d'arrêt plutôt que d'ouvrir un second micro
+            self.cycle_ecoute.demarrer()
+
+        except Exception as e:
+            self._mettre_a_jour_console(f"Erreur démarrage écoute: {e}", "ERREUR")
+            self.ecoute_active = False
+
+    def _arreter_ecoute(self):
+        """Arrête l'écoute vocale (capture et reconnaissances en cours), sans attendre"""
+        self.ecoute_active = False
+        self.cycle_ecoute.arreter()
+        self.ui.configurer(
+            self.btn_ecouter,
+            text="🎤 Démarrer l'écoute",
+            fg_color=ctk.ThemeManager.theme["CTkButton"]["fg_color"],
+            hover_color=ctk.ThemeManager.theme["CTkButton"]["hover_color"]
+        )
+        self.ui.configurer(
+            self.label_indicateur,
+            text="● Écoute inactive",
+            text_color="gray"
+        )
+
+        self._mettre_a_jour_console("Écoute vocale désactivée", "INFO")
+        self._mettre_a_jour_statut("Écoute inactive")
+
+    def _boucle_ecoute(self, arret: threading.Event):
+        """Session d'écoute (thread de capture unique) jusqu'à ce que `arret` soit levé
+
+        Chaque lecture du micro dure un bloc: l'arrêt est pris en compte en
+        moins d'un bloc. `arret` annule aussi les reconnaissances en cours,
+        pendant que la dernière lecture se termine.
+        """
+        pipeline = self._creer_pipeline(arret)
+
+        try:
+            with self._ouvrir_microphone() as source:
+                # Le seuil calibré lors d'une session précédente évite d'attendre
+                seuil = self.etat.lire("seuil_energie")
+                detecteur = self._creer_detecteur(source.SAMPLE_RATE, source.SAMPLE_WIDTH, seuil or 300.0)
+                if seuil is None and not self._calibrer(source, detecteur, arret):
+                    return
+                filtre = self._creer_filtre_local()
+                self._rafraichir_indicateur()
+
+                while not arret.is_set():
+                    try:
+                        bloc = source.stream.read(source.CHUNK)
+                        self._traiter_bloc(bloc, detecteur, filtre, pipeline)
+
+                    except Exception as e:
+                        erreur_msg = f"Erreur écoute: {e}"
+                        self._mettre_a_jour_console(erreur_msg, "ERREUR")
+                        logger.error(erreur_msg)
+
+                # Le seuil adapté au fil de la session sert au prochain démarrage
+                self.etat.ecrire("seuil_energie", round(detecteur.seuil_energie, 1))
+
+                if filtre and filtre.enonces:
+                    self._mettre_a_jour_console(f"Filtre local: {filtre.resume()}", "INFO")
+                    logger.info(f"Filtre local: {filtre.resume()}")
+        finally:
+            if not pipeline.arreter(annuler=True, delai=self.delai_arret_ecoute):
+                logger.warning("Reconnaissances encore en cours après l'arrêt de l'écoute")
+            # Énoncés d'une écoute terminée: ils ne repartiront pas à la reprise
+            self._enonces_en_attente.clear()
+            resume = pipeline.statistiques.resume()
+            if resume:
+                self._mettre_a_jour_console(f"Latences: {resume}", "INFO")
+                logger.info(f"Latences par étape: {resume}")
+
+    def _ouvrir_microphone(self):
+        """Micro de capture (gestionnaire de contexte de speech_recognition)"""
+        import speech_recognition as sr
+
+        return sr.Microphone()
+
+    def _calibrer(self, source, detecteur: DetecteurActiviteVocale, arret: threading.Event,
+                  duree: float = 0.5) -> bool:
+        """Règle le seuil sur le bruit ambiant; faux si l'écoute a été arrêtée entre-temps
+
+        Même règle que Recognizer.adjust_for_ambient_noise (énergie du bruit
+        x 1,5), mais lue bloc par bloc pour rester interruptible.
+        """
+        energies = []
+        nb_blocs = max(1, round(duree * source.SAMPLE_RATE / source.CHUNK))
+        for _ in range(nb_blocs):
+            if arret.is_set():
+                return False
+            energies.extend(detecteur.energies(source.stream.read(source.CHUNK)).tolist())
+        if energies:
+            detecteur.seuil_energie = max(detecteur.seuil_min, 1.5 * sum(energies) / len(energies))
+        self.etat.ecrire("seuil_energie", round(detecteur.seuil_energie, 1))
+        return True
+
+    def _creer_pipeline(self, annulation: Optional[threading.Event] = None) -> PipelineReconnaissance:
+        """Pipeline reconnaissance -> traitement alimenté par la capture
+
+        Lever `annulation` interrompt les reconnaissances en cours.
+        """
+        annulation = annulation or threading.Event()
+        self._pipeline = PipelineReconnaissance(
+            lambda audio: self._reconnaitre(audio, annulation),
+            self._traiter_texte_reconnu,
+            self._signaler_erreur_reconnaissance,
+            nb_workers=self.workers_reconnaissance,
+            statistiques=self.statistiques,
+            apres_resultat=self._rafraichir_indicateur,
+            annulation=annulation
+        )
+        return self._pipeline
+
+    def _reconnaitre(self, audio, annulation: Optional[threading.Event] = None) -> str:
+        """Étape de reconnaissance du pipeline (thread du pool)"""
+        segment = audio
+        if isinstance(segment, SegmentAudio):
+            # Énoncé resté en file plus longtemps que le tampon audio
+            if not segment.valide:
+                raise ParoleNonReconnue("tampon audio recouvert")
+            audio = segment.audio()
+        en_hypothese = None
+        enonce = PipelineReconnaissance.enonce_courant()
+        if (self.speculation_active and enonce is not None
+                and self.moteur_reconnaissance.hypotheses_intermediaires):
+            en_hypothese = lambda texte, confiance: self.speculateur.hypothese(
+                enonce, texte.lower(), confiance
+            )
+        try:
+            return self.moteur_reconnaissance.reconnaitre(
+                audio, self.langue, delai=self.delai_reconnaissance, annulation=annulation,
+                en_hypothese=en_hypothese
+            ).lower()
+        except CircuitOuvert:
+            # Circuit ouvert entre la capture et la reconnaissance
+            if isinstance(segment, SegmentAudio) and self._circuit_retient_enonces:
+                self._mettre_en_attente(segment)
+            raise
+
+    def _preparer_intention(self, intention: Intention, url: Optional[str]):
+        """Préparation sans effet visible d'un site entendu dans une hypothèse (thread du moteur)"""
+        site = self.sites.get(intention.cle)
+        if site is None or url is None:
+            return
+        self.navigateur.prechauffer()
+        self.parole.precharger([self._annonce_ouverture(site)])
+        logger.debug(f"Préparation spéculative: {site.nom} ({url})")
+
+    def _creer_moteur_reconnaissance(self) -> MoteurReconnaissance:
+        """Moteur de reconnaissance selon les paramètres (Google, local ou couvert)"""
+        google = MoteurDisjoncteur(
+            MoteurGoogle(PretraitementAudio() if self.pretraitement_audio else None),
+            self.disjoncteur
+        )
+        if not self.repertoire_moteur_local:
+            return google
+        local = MoteurLocal(self.repertoire_moteur_local)
+        if self.delai_couverture is None:
+            return local
+        return MoteurCouverture(google, local, self.delai_couverture)
+
+    @property
+    def _circuit_retient_enonces(self) -> bool:
+        """Circuit ouvert: les énoncés attendent la reprise, faute d'autre moteur"""
+        return isinstance(self.moteur_reconnaissance, MoteurDisjoncteur)
+
+    def _creer_detecteur(self, taux: int, largeur: int, seuil: float) -> DetecteurActiviteVocale:
+        """Détecteur de fin d'énoncé réglé selon les paramètres"""
+        return DetecteurActiviteVocale(
+            taux,
+            largeur,
+            seuil_energie=seuil,
+            pre_roll=self.pre_roll,
+            hangover=self.hangover_parole,
+            duree_max=10,
+            duree_tampon=self.duree_tampon_audio
+        )
+
+    def _creer_filtre_local(self) -> Optional[FiltreMotsCles]:
+        """Filtre local devant la reconnaissance distante, s'il est activé"""
+        actif = self.filtre_local_actif
+        if actif is None:
+            actif = bool(self.repertoire_filtre_local)
+        if not actif:
+            return None
+        filtre = FiltreMotsCles(duree_min=self.duree_min_filtre_local)
+        if self.repertoire_filtre_local:
+            filtre.charger_repertoire(self.repertoire_filtre_local)
+        return filtre
+
+    def _traiter_bloc(self, bloc: bytes, detecteur: DetecteurActiviteVocale,
+                      filtre: Optional[FiltreMotsCles], pipeline: PipelineReconnaissance):
+        """Passe un bloc capturé au détecteur et soumet les énoncés terminés"""
+        reception = time.perf_counter()
+        if self._enonces_en_attente:
+            self._relancer_enonces_en_attente(pipeline, reception)
+
+        taux, largeur = detecteur.taux_echantillonnage, detecteur.largeur_echantillon
+        # L'énoncé part dès la fin de la parole, sans attendre la pause
+        for segment in detecteur.traiter(bloc):
+            # Toux, télévision...: inutile de solliciter le service distant
+            if filtre and not filtre.accepter(segment.octets(), taux, largeur, segment.duree_voisee):
+                continue
+            if self.repertoire_enregistrements:
+                self._enregistrer_enonce(segment)
+            # Circuit rouvrable: cet énoncé sert de sonde, les suivants attendent son verdict
+            if self._circuit_retient_enonces and not self.disjoncteur.reserver_sonde():
+                self._mettre_en_attente(segment)
+                continue
+            pipeline.soumettre(segment, segment.depuis_fin_parole(reception))
+            self._rafraichir_indicateur()
+
+    def _mettre_en_attente(self, segment: SegmentAudio):
+        """Circuit ouvert: garde l'énoncé pour la reprise ou l'ignore, selon la politique"""
+        if self.politique_circuit_ouvert == "attendre":
+            self._enonces_en_attente.append((time.monotonic(), segment))
+            self._mettre_a_jour_console("Service indisponible: énoncé mis en attente", "AVERTISSEMENT")
+        else:
+            self._mettre_a_jour_console("Service indisponible: énoncé ignoré", "AVERTISSEMENT")
+
+    def _relancer_enonces_en_attente(self, pipeline: PipelineReconnaissance, reception: float):
+        """Soumet les énoncés gardés pendant la panne dès que le circuit le permet"""
+        if self.disjoncteur.refuse_appels:
+            return
+        limite = time.monotonic() - self.age_max_attente_circuit
+        # Énoncés périmés ou recouverts par le tampon en tête de file: abandonnés
+        while self._enonces_en_attente:
+            depot, segment = self._enonces_en_attente[0]
+            if depot >= limite and segment.valide:
+                break
+            self._enonces_en_attente.popleft()
+        if not self._enonces_en_attente:
+            return
+        # Circuit fermé: tout repart; sinon un seul énoncé, pour qui la sonde est réservée
+        ferme = self.disjoncteur.etat is EtatCircuit.FERME
+        if not ferme and not self.disjoncteur.reserver_sonde():
+            return
+        restants = len(self._enonces_en_attente) if ferme else 1
+        while restants and self._enonces_en_attente:
+            depot, segment = self._enonces_en_attente.popleft()
+            if depot < limite or not segment.valide:
+                continue
+            pipeline.soumettre(segment, segment.depuis_fin_parole(reception))
+            restants -= 1
+        self._rafraichir_indicateur()
+
+    def _enregistrer_enonce(self, segment: SegmentAudio):
+        """Enregistre un énoncé soumis en WAV (lu directement dans le tampon)"""
+        chemin = os.path.join(self.repertoire_enregistrements,
+                              f"enonce_{datetime.now():%Y%m%d_%H%M%S}_{segment.debut}.wav")
+        try:
+            os.makedirs(self.repertoire_enregistrements, exist_ok=True)
+            segment.ecrire_wav(chemin)
+        except OSError as e:
+            logger.warning(f"Enregistrement de l'énoncé impossible: {e}")
+
+    def _rafraichir_indicateur(self):
+        """Met à jour l'indicateur selon l'état du pipeline"""
+        if self._pipeline is not None and self._pipeline.en_attente:
+            self.ui.configurer(self.label_indicateur, text="● Écoute active - Traitement...")
+        elif self.ecoute_active:
+            self.ui.configurer(self.label_indicateur, text="● Écoute active - En attente...")
+
+    def _traiter_texte_reconnu(self, texte: str):
+        """Traite un texte reconnu (thread de distribution du pipeline)"""
+        self._mettre_a_jour_console(f"📢 Reconnu: {texte}", "COMMANDE")
+
+        if not self._traiter_commande(texte):
+            self._mettre_a_jour_console(
+                "Commande non reconnue. Dites 'aide' pour la liste.",
+                "AVERTISSEMENT"
+            )
+            self._parler("Je n'ai pas compris. Essayez une autre commande.")
+
+    def _signaler_erreur_reconnaissance(self, e: Exception):
+        """Signale un échec de reconnaissance (thread de distribution du pipeline)"""
+        if isinstance(e, (ReconnaissanceAnnulee, CircuitOuvert)):
+            return
+        if isinstance(e, ParoleNonReconnue):
+            self._mettre_a_jour_console("Parole non reconnue", "AVERTISSEMENT")
+        elif isinstance(e, ServiceIndisponible):
+            erreur_msg = f"Service reconnaissance: {e}"
+            self._mettre_a_jour_console(erreur_msg, "ERREUR")
+            # Avec un disjoncteur, l'annonce vocale accompagne ses changements d'état
+            if not isinstance(self.moteur_reconnaissance, MoteurDisjoncteur):
+                self._parler("Problème de connexion internet.", PrioriteParole.HAUTE)
+            logger.error(erreur_msg)
+        else:
+            erreur_msg = f"Erreur reconnaissance: {e}"
+            self._mettre_a_jour_console(erreur_msg, "ERREUR")
+            logger.error(erreur_msg)
+
+    def _signaler_etat_circuit(self, ancien: EtatCircuit, nouveau: EtatCircuit):
+        """Une seule annonce par changement d'état du disjoncteur (thread du pool)"""
+        if nouveau is EtatCircuit.OUVERT:
+            self._mettre_a_jour_console(
+                f"Service de reconnaissance indisponible, nouvel essai dans "
+                f"{self.disjoncteur.delai_courant:.1f} s", "ERREUR"
+            )
+            self._mettre_a_jour_statut("Service de reconnaissance indisponible")
+            # Sonde en échec: le circuit reste coupé, inutile de le répéter à voix haute
+            if ancien is EtatCircuit.FERME:
+                self._parler("Problème de connexion internet.", PrioriteParole.HAUTE)
+        elif nouveau is EtatCircuit.SEMI_OUVERT:
+            self._mettre_a_jour_console("Nouvel essai du service de reconnaissance", "INFO")
+        else:
+            self._mettre_a_jour_console("Service de reconnaissance rétabli", "SUCCES")
+            self._mettre_a_jour_statut("Écoute active" if self.ecoute_active else "Écoute inactive")
+            self._parler("Connexion rétablie.", PrioriteParole.HAUTE)
+
+    def _executer_sur_interface(self, action: Callable):
+        """Confie une action au thread Tk en mesurant le passage par root.after"""
+        if not self.statistiques.actif:
+            self.ui.appeler(action)
+            return
+        correlation = self.statistiques.correlation_courante()
+        depot = time.perf_counter()
+
+        def executer():
+            self.statistiques.enregistrer("interface", time.perf_counter() - depot, correlation)
+            action()
+
+        self.ui.appeler(self.statistiques.avec_correlation(executer, correlation))
+
+    def _traiter_commande(self, texte: str) -> bool:
+        """Traite une commande vocale reconnue (une ou plusieurs intentions)"""
+        intentions = []
+        actions = []
+        analyse = self.moteur_commandes.intentions(texte)
+        # Le résultat final tranche: les préparations sur hypothèse sont confirmées ou abandonnées
+        urls_preparees = self.speculateur.confirmer(PipelineReconnaissance.enonce_courant(), analyse)
+        for intention in analyse:
+            action = self._action_intention(intention, urls_preparees.get(intention.cle))
+            if action is not None:
+                intentions.append(intention)
+                actions.append(action)
+        if not actions:
+            return False
+
+        if len(actions) == 1:
+            self._executer_sur_interface(actions[0])
+        else:
+            # Plusieurs commandes dans la même phrase: un seul passage sur l'interface
+            self._executer_sur_interface(lambda: self._executer_lot(actions))
+
+        for intention in intentions:
+            if intention.approchee:
+                self._mettre_a_jour_console(
+                    f"Commande approchée: {intention.description} "
+                    f"('{intention.mot_cle}', {intention.score:.0%})",
+                    "SUCCES"
+                )
+            elif intention.cle != "recherche":
+                self._mettre_a_jour_console(f"Commande exécutée: {intention.description}", "SUCCES")
+        return True
+
+    def _executer_lot(self, actions: List[Callable]):
+        """Actions d'une même phrase: un seul appel au navigateur, une seule annonce"""
+        self._annonces_lot = []
+        try:
+            with self.navigateur.lot():
+                for action in actions:
+                    action()
+        finally:
+            annonces, self._annonces_lot = self._annonces_lot, None
+        if annonces:
+            self._parler(". ".join(annonces) + ".", interrompre=True)
+
+    def _annoncer(self, message: str):
+        """Annonce le résultat d'une action, ou le garde pour l'annonce du lot en cours"""
+        if self._annonces_lot is not None:
+            self._annonces_lot.append(message)
+        else:
+            self._parler(message, interrompre=True)
+
+    def _action_intention(self, intention: Intention, url: Optional[str] = None) -> Optional[Callable]:
+        """Action de l'application correspondant à une intention (url: déjà résolue)"""
+        if intention.categorie == "sites":
+            return lambda: self._ouvrir_site(intention.cle, url)
+        if intention.cle == "recherche":
+            return lambda: self._effectuer_recherche(intention.requete)
+        if intention.cle == "quitter":
+            return lambda: self.root.after(100, self.quitter)
+        if intention.cle == "aide":
+            return lambda: self._afficher_aide()
+        # Commande ajoutée par ajouter_commande()
+        commande = self.commandes.get(intention.cle)
+        return commande.action if commande else None
+
+    def _afficher_aide(self):
+        """Affiche l'aide des commandes disponibles"""
+        sites = [site.nom for site in self.sites.values()]
+        message = (
+            f"Commandes disponibles:\n"
+            f"- Sites: {', '.join(sites)}\n"
+            f"- Recherche: 'rechercher [votre recherche]'\n"
+            f"- Autres: 'aide', 'quitter'"
+        )
+
+        self._mettre_a_jour_console("Affichage de l'aide", "INFO")
+        self._parler(self._texte_aide())
+
+    def _texte_aide(self) -> str:
+        """Texte de l'aide vocale"""
+        sites = [site.nom for site in self.sites.values()]
+        return f"Vous pouvez dire: ouvrir {', ou '.join(sites)}. Ou effectuer une recherche."
+
+    def _mettre_a_jour_console(self, message: str, niveau: str = "INFO"):
+        """Ajoute un message à la console (appelable depuis n'importe quel thread)"""
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        self.ui.console(f"[{timestamp}] {message}\n", niveau)
+
+    def _afficher_lignes_console(self, lignes: List[Tuple[str, str]]):
+        """Insère un lot de lignes dans la console (thread de l'interface)"""
+        self.journal.ajouter(lignes)
+
+    def _mettre_a_jour_statut(self, message: str):
+        """Met à jour le statut en bas de l'interface"""
+        self.ui.configurer(self.label_statut, text=message)
+
+    def _parler(self, message: str, priorite: PrioriteParole = PrioriteParole.NORMALE,
+                ephemere: bool = False, interrompre: bool = False):
+        """Prononce un message vocalement (sans bloquer l'appelant)"""
+        if self.reconnaissance_active:
+            self.parole.dire(message, priorite, ephemere, interrompre)
+
+    def _signaler_echec_parole(self, message: str):
+        """Fallback: afficher dans la console le message non prononcé"""
+        self._mettre_a_jour_console(f"(TTS) {message}", "INFO")
+
+    def _signaler_echec_navigateur(self, urls: List[str], erreur: Exception):
+        """Signale une ouverture de navigateur échouée dans le thread dédié"""
+        self._mettre_a_jour_console(f"Erreur d'ouverture du navigateur: {erreur}", "ERREUR")
+        self._mettre_a_jour_statut("Erreur navigateur")
+
+    def _eclaircir_couleur(self, couleur: str) -> str:
+        """Éclaircit une couleur hexadécimale"""
+        # Conversion simplifiée - retourne une couleur plus claire
+        return couleur  # Pour l'instant, retourne la même couleur
+
+    def quitter(self):
+        """Ferme l'application proprement"""
+        self._arreter_ecoute()
+        if not self.cycle_ecoute.arreter(delai=self.delai_arret_ecoute):
+            logger.warning("Le thread d'écoute ne s'est pas arrêté à temps")
+        self.parole.arreter()
+        self.navigateur.arreter()
+        self.historique.fermer()
+        self._arret_surveillance.set()
+        self._mettre_a_jour_console("Fermeture de l'application...", "INFO")
+        self._mettre_a_jour_statut("Fermeture...")
+
+        logger.info("Application fermée proprement")
+
+        # Petite pause pour laisser les messages s'afficher
+        self.root.after(500, self.root.quit)
+        self.root.after(600, self.root.destroy)
+
+
+def main():
+    """Point d'entrée principal de l'application"""
+    journal = configurer_journalisation(
+        format_json=os.environ.get("ASSISTANT_VOCAL_JOURNAL_JSON") == "1"
+    )
+    try:
+        logger.info("=" * 50)
+        logger.info("Démarrage de l'Assistant Vocal")
+        logger.info("=" * 50)
+
+        app = AssistantVocalApp()
+        app.root.mainloop()
+
+    except KeyboardInterrupt:
+        logger.info("Application interrompue par l'utilisateur")
+    except Exception as e:
+        logger.critical(f"Erreur critique: {e}", exc_info=True)
+        # Message d'erreur utilisateur
+        ctk.CTk().withdraw()
+        ctk.CTkMessageBox(
+            title="Erreur Critique",
+            message=f"L'application a rencontré une erreur:\n{str(e)}",
+            icon="cancel"
+        )
+    finally:
+        logger.info("Application terminée")
+        # Vide la file et ferme les fichiers
+        journal.stop()
+
+
+if __name__ == "__main__":
     main()
\ No newline at end of file
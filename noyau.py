@@ -0,0 +1,666 @@
+"""
+Cœur de l'Assistant Vocal, indépendant de l'interface graphique
+
+Registre des sites et commandes, index de mots-clés et décision de la
+commande à exécuter pour une phrase reconnue. Ce module n'importe ni Tk ni
+les bibliothèques audio: il sert aussi bien l'application que le service
+local multi-clients (service.py) et ses processus de calcul.
+"""
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+import urllib.parse
+from dataclasses import dataclass
+from typing import Dict, Tuple, Callable, Optional, List
+
+logger = logging.getLogger(__name__)
+
+# Constantes
+MOTEUR_RECHERCHE = "https://www.google.com/search?q="
+# Registre livré à côté du code, quel que soit le répertoire courant
+FICHIER_COMMANDES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "commandes.json")
+VERBES_RECHERCHE = ("rechercher", "chercher", "recherche", "cherche")
+# Mots et ponctuation qui séparent deux commandes d'une même phrase
+SEPARATEURS = ("et", "puis", "ensuite", "aussi", ",", ";", ".", "!", "?")
+# Mots de politesse ou de liaison tolérés autour d'une commande système
+# (« ferme l'application s'il te plaît »), découpés comme par _JETON
+MOTS_VIDES = ("s", "il", "te", "vous", "plaît", "plait", "merci", "maintenant", "tout", "de",
+              "suite", "l", "la", "le", "assistant", "application", "fenêtre", "moi", "alors",
+              "bon", "ok", "d", "accord", "oui", "euh", "donc")
+# Verbes qui ouvrent une nouvelle commande, même au milieu d'une requête de recherche
+VERBES_ACTION = ("ouvre", "ouvrir", "lance", "lancer", "va", "affiche", "afficher", "montre", "démarre")
+# Mots (ou signes de ponctuation) d'une phrase, avec leur position
+_JETON = re.compile(r"[^\W_]+(?:-[^\W_]+)*|[,;.!?]")
+
+# Commandes intégrées: description et mots-clés par défaut (surchargeables
+# dans la section "commandes" du registre)
+COMMANDES_SYSTEME = {
+    "recherche": ("Recherche sur internet",
+                  ("rechercher", "chercher", "trouve", "search", "recherche", "cherche")),
+    "quitter": ("Fermeture de l'application",
+                ("quitter", "arrêter", "stop", "ferme", "au revoir", "exit", "quitte")),
+    "aide": ("Affiche l'aide",
+             ("aide", "help", "commandes", "que peux-tu faire", "comment utiliser")),
+}
+
+
+@dataclass
+class Commande:
+    """Représente une commande vocale"""
+    action: Optional[Callable]
+    description: str
+    mots_cles: Tuple[str, ...]
+    categorie: str = "general"
+
+
+class IndexMotsCles:
+    """Automate d'Aho-Corasick compilé sur les mots-clés des commandes
+
+    Toutes les occurrences de tous les mots-clés sont trouvées en un seul
+    passage sur la phrase, quel que soit le nombre de commandes chargées.
+
+    Ajouts et retraits ne touchent que les nœuds des mots concernés (les
+    branches devenues inutiles sont élaguées et leurs nœuds réutilisés);
+    les liens d'échec sont ensuite recalculés en un seul parcours complet,
+    à la première recherche.
+    """
+
+    def __init__(self):
+        self._transitions: List[Dict[str, int]] = [{}]
+        self._echecs: List[int] = [0]
+        self._liens_sortie: List[int] = [0]
+        self._mots: List[Optional[str]] = [None]
+        # Nœuds élagués, réutilisés par les insertions suivantes
+        self._libres: List[int] = []
+        self._cles_par_mot: Dict[str, Dict[object, None]] = {}
+        self._mots_par_cle: Dict[object, Tuple[str, ...]] = {}
+        self._rangs: Dict[object, int] = {}
+        self._prochain_rang = 0
+        self._a_compiler = False
+
+    def __len__(self) -> int:
+        return len(self._cles_par_mot)
+
+    def ajouter(self, cle, mots_cles: Tuple[str, ...]):
+        """Ajoute (ou remplace) les mots-clés d'une commande"""
+        if cle in self._mots_par_cle:
+            self._retirer_mots(cle)
+        else:
+            self._rangs[cle] = self._prochain_rang
+            self._prochain_rang += 1
+
+        mots = tuple(dict.fromkeys(m.lower() for m in mots_cles if m))
+        self._mots_par_cle[cle] = mots
+        for mot in mots:
+            cles = self._cles_par_mot.get(mot)
+            if cles is None:
+                cles = self._cles_par_mot[mot] = {}
+                self._inserer(mot)
+            cles[cle] = None
+
+    def retirer(self, cle):
+        """Retire une commande de l'index"""
+        if cle in self._mots_par_cle:
+            self._retirer_mots(cle)
+            del self._mots_par_cle[cle]
+            del self._rangs[cle]
+
+    def _retirer_mots(self, cle):
+        for mot in self._mots_par_cle[cle]:
+            cles = self._cles_par_mot[mot]
+            cles.pop(cle, None)
+            if not cles:
+                del self._cles_par_mot[mot]
+                self._elaguer(mot)
+
+    def _inserer(self, mot: str):
+        noeud = 0
+        for car in mot:
+            suivant = self._transitions[noeud].get(car)
+            if suivant is None:
+                suivant = self._nouveau_noeud()
+                self._transitions[noeud][car] = suivant
+            noeud = suivant
+        self._mots[noeud] = mot
+        self._a_compiler = True
+
+    def _nouveau_noeud(self) -> int:
+        if self._libres:
+            noeud = self._libres.pop()
+            self._transitions[noeud] = {}
+            self._echecs[noeud] = self._liens_sortie[noeud] = 0
+            return noeud
+        self._transitions.append({})
+        self._echecs.append(0)
+        self._liens_sortie.append(0)
+        self._mots.append(None)
+        return len(self._transitions) - 1
+
+    def _elaguer(self, mot: str):
+        """Retire un mot du trie avec les nœuds qui ne servent plus qu'à lui"""
+        chemin = [0]
+        for car in mot:
+            chemin.append(self._transitions[chemin[-1]][car])
+        self._mots[chemin[-1]] = None
+        for profondeur in range(len(mot), 0, -1):
+            noeud = chemin[profondeur]
+            if self._transitions[noeud] or self._mots[noeud]:
+                break
+            del self._transitions[chemin[profondeur - 1]][mot[profondeur - 1]]
+            self._libres.append(noeud)
+        self._a_compiler = True
+
+    @property
+    def nb_noeuds(self) -> int:
+        """Nœuds utilisés par le trie (racine comprise)"""
+        return len(self._transitions) - len(self._libres)
+
+    def _compiler(self):
+        """Recalcule les liens d'échec et de sortie (parcours en largeur)"""
+        transitions, echecs = self._transitions, self._echecs
+        liens_sortie, mots = self._liens_sortie, self._mots
+        file = list(transitions[0].values())
+        i = 0
+        while i < len(file):
+            noeud = file[i]
+            i += 1
+            for car, enfant in transitions[noeud].items():
+                repli = echecs[noeud]
+                while repli and car not in transitions[repli]:
+                    repli = echecs[repli]
+                cible = transitions[repli].get(car, 0)
+                echecs[enfant] = cible
+                liens_sortie[enfant] = (
+                    echecs[enfant] if mots[echecs[enfant]] else liens_sortie[echecs[enfant]]
+                )
+                file.append(enfant)
+        self._a_compiler = False
+
+    def occurrences(self, texte: str) -> List[Tuple[int, int, str]]:
+        """Retourne toutes les occurrences (début, fin, mot-clé) dans le texte"""
+        if self._a_compiler:
+            self._compiler()
+
+        transitions, echecs = self._transitions, self._echecs
+        liens_sortie, mots = self._liens_sortie, self._mots
+        resultats = []
+        noeud = 0
+        for fin, car in enumerate(texte, 1):
+            while noeud and car not in transitions[noeud]:
+                noeud = echecs[noeud]
+            noeud = transitions[noeud].get(car, 0)
+            sortie = noeud if mots[noeud] else liens_sortie[noeud]
+            while sortie:
+                mot = mots[sortie]
+                resultats.append((fin - len(mot), fin, mot))
+                sortie = liens_sortie[sortie]
+        return resultats
+
+    def cles_du_mot(self, mot: str) -> List[object]:
+        """Commandes déclenchées par un mot-clé, dans leur ordre d'enregistrement"""
+        return sorted(self._cles_par_mot.get(mot, ()), key=self._rangs.__getitem__)
+
+    def cles_trouvees(self, texte: str) -> List[object]:
+        """Retourne les commandes déclenchées, dans leur ordre d'enregistrement"""
+        cles = {}
+        for _, _, mot in self.occurrences(texte):
+            for cle in self._cles_par_mot.get(mot, ()):
+                cles[cle] = None
+        return sorted(cles, key=self._rangs.__getitem__)
+
+
+class IndexFlou:
+    """Rapprochement approximatif des phrases mal transcrites avec les mots-clés
+
+    Chaque mot-clé est normalisé (minuscules, sans accents ni espaces) et
+    décomposé en bigrammes de caractères, complétés par ceux de son squelette
+    consonantique, le tout stocké dans un index inversé précalculé. Pour une phrase, toutes les fenêtres d'un à trois mots sont
+    comparées à tous les mots-clés en une seule opération NumPy (coefficient
+    de Dice), si bien que "you tube" ou "guitare hub" retrouvent leur commande.
+    """
+
+    def __init__(self, mots_par_fenetre: int = 3):
+        self.mots_par_fenetre = mots_par_fenetre
+        self._cles: List[object] = []
+        self._mots: List[str] = []
+        self._grammes: List[Tuple[str, ...]] = []
+        self._actifs: List[bool] = []
+        self._ids_par_cle: Dict[object, List[int]] = {}
+        self._postings: Dict[str, "np.ndarray"] = {}
+        self._tailles = None
+        self._a_compiler = True
+
+    @staticmethod
+    def normaliser(texte: str) -> List[str]:
+        """Mots en minuscules, sans accents ni ponctuation"""
+        decompose = unicodedata.normalize("NFKD", texte.lower())
+        sans_accents = "".join(c for c in decompose if not unicodedata.combining(c))
+        return "".join(c if c.isalnum() or c.isspace() else "" for c in sans_accents).split()
+
+    @staticmethod
+    def _bigrammes(texte: str) -> Tuple[str, ...]:
+        """Bigrammes du texte et de son squelette consonantique (en majuscules)"""
+        squelette = []
+        for c in texte:
+            if c not in "aeiouyh" and (not squelette or squelette[-1] != c):
+                squelette.append(c)
+        texte = f" {texte} "
+        squelette = f" {''.join(squelette)} ".upper()
+        return tuple(
+            {texte[i:i + 2] for i in range(len(texte) - 1)}
+            | {squelette[i:i + 2] for i in range(len(squelette) - 1)}
+        )
+
+    def ajouter(self, cle, mots_cles: Tuple[str, ...]):
+        """Ajoute (ou remplace) les mots-clés d'une commande"""
+        self.retirer(cle)
+        ids = self._ids_par_cle[cle] = []
+        for mot in mots_cles:
+            forme = "".join(self.normaliser(mot))
+            if not forme:
+                continue
+            ids.append(len(self._cles))
+            self._cles.append(cle)
+            self._mots.append(mot)
+            self._grammes.append(self._bigrammes(forme))
+            self._actifs.append(True)
+        self._a_compiler = True
+
+    def retirer(self, cle):
+        """Retire une commande de l'index"""
+        for i in self._ids_par_cle.pop(cle, ()):
+            self._actifs[i] = False
+            self._a_compiler = True
+
+    def _compiler(self):
+        """Reconstruit l'index inversé bigramme -> mots-clés"""
+        import numpy as np
+
+        # Les entrées retirées sont purgées lors de la recompilation
+        if not all(self._actifs):
+            conserves = [i for i, actif in enumerate(self._actifs) if actif]
+            self._cles = [self._cles[i] for i in conserves]
+            self._mots = [self._mots[i] for i in conserves]
+            self._grammes = [self._grammes[i] for i in conserves]
+            self._actifs = [True] * len(conserves)
+            self._ids_par_cle = {}
+            for i, cle in enumerate(self._cles):
+                self._ids_par_cle.setdefault(cle, []).append(i)
+
+        postings: Dict[str, List[int]] = {}
+        for i, grammes in enumerate(self._grammes):
+            for gramme in grammes:
+                postings.setdefault(gramme, []).append(i)
+        self._postings = {g: np.array(ids, dtype=np.int64) for g, ids in postings.items()}
+        self._tailles = np.array([len(g) for g in self._grammes], dtype=np.float32)
+        self._a_compiler = False
+
+    def meilleurs(self, texte: str, seuil: float = 0.55,
+                  nombre: int = 5) -> List[Tuple[float, object, str]]:
+        """Meilleurs candidats (score, clé, mot-clé) au-dessus du seuil"""
+        import numpy as np
+
+        if self._a_compiler:
+            self._compiler()
+        nb_mots_cles = len(self._cles)
+        mots = self.normaliser(texte)
+        if not nb_mots_cles or not mots:
+            return []
+
+        fenetres = [
+            "".join(mots[i:i + n])
+            for n in range(1, self.mots_par_fenetre + 1)
+            for i in range(len(mots) - n + 1)
+        ]
+        tailles_fenetres = np.empty(len(fenetres), dtype=np.float32)
+        morceaux = []
+        for f, fenetre in enumerate(fenetres):
+            grammes = self._bigrammes(fenetre)
+            tailles_fenetres[f] = len(grammes)
+            decalage = f * nb_mots_cles
+            for gramme in grammes:
+                ids = self._postings.get(gramme)
+                if ids is not None:
+                    morceaux.append(ids + decalage if decalage else ids)
+        if not morceaux:
+            return []
+
+        # Bigrammes communs à chaque couple (fenêtre, mot-clé), en un seul comptage
+        communs = np.bincount(np.concatenate(morceaux), minlength=len(fenetres) * nb_mots_cles)
+        communs = communs.reshape(len(fenetres), nb_mots_cles)
+        scores = (2 * communs / (tailles_fenetres[:, None] + self._tailles[None, :])).max(axis=0)
+
+        nombre = min(nombre, nb_mots_cles)
+        candidats = np.argpartition(-scores, nombre - 1)[:nombre]
+        return sorted(
+            ((float(scores[i]), self._cles[i], self._mots[i]) for i in candidats if scores[i] >= seuil),
+            key=lambda candidat: -candidat[0]
+        )
+
+
+@dataclass(frozen=True)
+class Site:
+    """Site web ouvrable par la voix ou par un bouton"""
+    id: str
+    nom: str
+    url: str
+    mots_cles: Tuple[str, ...]
+    description: str = ""
+    texte_bouton: Optional[str] = None
+    couleur: str = "#1F6AA5"
+
+@dataclass
+class ChangementsRegistre:
+    """Différences entre deux lectures du registre"""
+    sites_modifies: Dict[str, Site]
+    sites_retires: List[str]
+    systeme_modifie: Dict[str, Tuple[str, Tuple[str, ...]]]
+    ordre: Optional[List[str]] = None
+
+    @property
+    def vide(self) -> bool:
+        return not (self.sites_modifies or self.sites_retires or self.systeme_modifie or self.ordre)
+
+
+class RegistreCommandes:
+    """Registre déclaratif des sites et des commandes, lu depuis un fichier JSON
+
+    recharger() relit le fichier et ne retourne que les différences avec la
+    lecture précédente, pour que l'application ne reconstruise que les
+    entrées modifiées (index de mots-clés, boutons).
+    """
+
+    def __init__(self, chemin: str = FICHIER_COMMANDES):
+        self.chemin = chemin
+        self.sites: Dict[str, Site] = {}
+        self.systeme: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+        self.moteur_recherche = MOTEUR_RECHERCHE
+        self._date_modification: Optional[int] = None
+
+    def a_change(self) -> bool:
+        """Vrai si le fichier a été modifié depuis la dernière lecture"""
+        try:
+            return os.stat(self.chemin).st_mtime_ns != self._date_modification
+        except OSError:
+            return False
+
+    def recharger(self) -> Optional[ChangementsRegistre]:
+        """Relit le registre; None si le fichier est illisible ou invalide"""
+        try:
+            self._date_modification = os.stat(self.chemin).st_mtime_ns
+            with open(self.chemin, encoding="utf-8") as fichier:
+                donnees = json.load(fichier)
+
+            sites: Dict[str, Site] = {}
+            for entree in donnees.get("sites", []):
+                bouton = entree.get("bouton") or {}
+                site = Site(
+                    id=entree["id"],
+                    nom=entree["nom"],
+                    url=entree["url"],
+                    mots_cles=tuple(entree.get("mots_cles", ())),
+                    description=entree.get("description", f"Ouverture de {entree['nom']}"),
+                    texte_bouton=bouton.get("texte"),
+                    couleur=bouton.get("couleur", "#1F6AA5")
+                )
+                if site.id in COMMANDES_SYSTEME:
+                    logger.warning(f"Registre: l'identifiant '{site.id}' est réservé")
+                    continue
+                sites[site.id] = site
+
+            systeme = dict(COMMANDES_SYSTEME)
+            for cle, entree in donnees.get("commandes", {}).items():
+                if cle in COMMANDES_SYSTEME:
+                    systeme[cle] = (
+                        entree.get("description", COMMANDES_SYSTEME[cle][0]),
+                        tuple(entree.get("mots_cles", COMMANDES_SYSTEME[cle][1]))
+                    )
+            moteur_recherche = donnees.get("moteur_recherche", MOTEUR_RECHERCHE)
+
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.error(f"Registre des commandes invalide ({self.chemin}): {e}")
+            return None
+
+        changements = ChangementsRegistre(
+            sites_modifies={i: s for i, s in sites.items() if self.sites.get(i) != s},
+            sites_retires=[i for i in self.sites if i not in sites],
+            systeme_modifie={c: v for c, v in systeme.items() if self.systeme.get(c) != v},
+            ordre=list(sites) if list(sites) != list(self.sites) else None
+        )
+        self.sites = sites
+        self.systeme = systeme
+        self.moteur_recherche = moteur_recherche
+        return changements
+
+
+@dataclass(frozen=True)
+class Intention:
+    """Commande retenue pour une phrase (transmissible d'un processus à l'autre)"""
+    cle: str
+    categorie: str
+    description: str
+    requete: str = ""
+    # Inférieur à 1 pour un rapprochement approximatif
+    score: float = 1.0
+    mot_cle: str = ""
+
+    @property
+    def approchee(self) -> bool:
+        return self.score < 1.0
+
+
+class MoteurCommandes:
+    """Décide quelle commande correspond à une phrase reconnue
+
+    Tient le registre, les commandes et leurs index. L'exécution (navigateur,
+    synthèse vocale, historique) reste à la charge de l'appelant, qui reçoit
+    une Intention.
+    """
+
+    def __init__(self, chemin_registre: str = FICHIER_COMMANDES, seuil_flou: float = 0.55):
+        self.seuil_flou = seuil_flou
+        self.commandes: Dict[str, Commande] = {}
+        self.sites: Dict[str, Site] = {}
+        self.verrou = threading.RLock()
+        self.index_mots_cles = IndexMotsCles()
+        self.index_flou = IndexFlou()
+        self.registre = RegistreCommandes(chemin_registre)
+
+    def charger(self) -> ChangementsRegistre:
+        """Première lecture du registre; retourne les entrées appliquées"""
+        changements = self.registre.recharger()
+        if changements is None:
+            # Registre illisible: seules les commandes intégrées restent disponibles
+            changements = ChangementsRegistre({}, [], dict(COMMANDES_SYSTEME))
+        self.appliquer_registre(changements)
+        return changements
+
+    def recharger_si_modifie(self) -> Optional[ChangementsRegistre]:
+        """Relit le registre s'il a changé; None si rien n'a été appliqué"""
+        if not self.registre.a_change():
+            return None
+        changements = self.registre.recharger()
+        if changements is None or changements.vide:
+            return None
+        self.appliquer_registre(changements)
+        return changements
+
+    def appliquer_registre(self, changements: ChangementsRegistre):
+        """Applique les différences du registre: seules les entrées modifiées sont réindexées"""
+        with self.verrou:
+            for site_id in changements.sites_retires:
+                self.sites.pop(site_id, None)
+                self.retirer_commande(site_id)
+
+            for site_id, site in changements.sites_modifies.items():
+                self.sites[site_id] = site
+                self.ajouter_commande(site_id, Commande(None, site.description, site.mots_cles, "sites"))
+
+            if changements.ordre:
+                self.sites = {site_id: self.sites[site_id] for site_id in changements.ordre}
+
+            for cle, (description, mots_cles) in changements.systeme_modifie.items():
+                categorie = "recherche" if cle == "recherche" else "systeme"
+                self.ajouter_commande(cle, Commande(None, description, mots_cles, categorie))
+
+    def ajouter_commande(self, cle, commande: Commande):
+        """Ajoute ou remplace une commande et met les index à jour"""
+        with self.verrou:
+            self.commandes[cle] = commande
+            self.index_mots_cles.ajouter(cle, commande.mots_cles)
+            self.index_flou.ajouter(cle, commande.mots_cles)
+
+    def retirer_commande(self, cle):
+        """Retire une commande et met les index à jour"""
+        with self.verrou:
+            if self.commandes.pop(cle, None) is not None:
+                self.index_mots_cles.retirer(cle)
+                self.index_flou.retirer(cle)
+
+    def analyser(self, texte: str) -> Optional[Intention]:
+        """Première commande à exécuter pour une phrase; None si aucune ne correspond"""
+        intentions = self.intentions(texte)
+        return intentions[0] if intentions else None
+
+    def intentions(self, texte: str) -> List[Intention]:
+        """Commandes d'une phrase, dans l'ordre où elles ont été dites
+
+        La phrase est découpée en mots une seule fois, et les mots-clés de
+        toutes les commandes y sont repérés en un seul passage (seules les
+        occurrences qui commencent et finissent sur un mot comptent). La
+        grammaire lit ensuite les mots de gauche à droite:
+
+        - « et », « puis », « ensuite », « aussi » et la ponctuation
+          (, ; . ! ?) séparent deux propositions;
+        - à une même position, le mot-clé le plus long l'emporte;
+        - un verbe de recherche (VERBES_RECHERCHE) prend tout le reste de la
+          proposition comme requête: les mots-clés qu'elle contient ne
+          déclenchent rien (« cherche tutoriel youtube »). Un séparateur n'y
+          termine la requête que s'il est suivi d'une nouvelle commande. Les
+          autres mots-clés de la recherche (« trouve », « search ») ne
+          lancent rien;
+        - une commande système n'est retenue que si son mot-clé occupe
+          toute sa proposition, aux mots de politesse près (« ferme
+          l'application s'il te plaît »). Sinon la proposition entière est
+          ignorée: « ferme youtube » n'arrête pas l'assistant et n'ouvre pas
+          YouTube, « stop la musique » ne fait rien. « quitter » passe en
+          dernier;
+        - une proposition sans mot-clé est rapprochée des sites par
+          l'index approximatif.
+        """
+        with self.verrou:
+            texte_lower = texte.lower().strip()
+            jetons = [(m.group(), m.start(), m.end()) for m in _JETON.finditer(texte_lower)]
+            if not jetons:
+                return []
+
+            # Occurrences alignées sur les mots: (indice du dernier mot + 1, mot-clé) par mot de départ
+            indice_debut = {debut: i for i, (_, debut, _) in enumerate(jetons)}
+            indice_fin = {fin: i + 1 for i, (_, _, fin) in enumerate(jetons)}
+            occurrences: Dict[int, Tuple[int, str]] = {}
+            for debut, fin, mot_cle in self.index_mots_cles.occurrences(texte_lower):
+                i, j = indice_debut.get(debut), indice_fin.get(fin)
+                if i is not None and j is not None and j > occurrences.get(i, (0, ""))[0]:
+                    occurrences[i] = (j, mot_cle)
+
+            intentions: List[Intention] = []
+            # Intentions de la proposition en cours, avec les mots qu'occupe leur mot-clé
+            proposition: List[Tuple[Intention, int, int]] = []
+            debut_proposition = 0
+            i = 0
+            while i <= len(jetons):
+                if i == len(jetons) or (i not in occurrences and jetons[i][0] in SEPARATEURS):
+                    self._clore_proposition(proposition, jetons, debut_proposition, i,
+                                            texte_lower, intentions)
+                    proposition = []
+                    debut_proposition = i + 1
+                    i += 1
+                    continue
+                if i not in occurrences:
+                    i += 1
+                    continue
+
+                fin, mot_cle = occurrences[i]
+                cle = self.index_mots_cles.cles_du_mot(mot_cle)[0]
+                commande = self.commandes[cle]
+                if commande.categorie == "recherche" and mot_cle not in VERBES_RECHERCHE:
+                    # « je ne trouve pas youtube »: seuls les verbes de recherche ouvrent une requête
+                    i += 1
+                    continue
+                if commande.categorie == "recherche":
+                    fin_requete = self._fin_requete(jetons, fin, occurrences)
+                    if fin_requete > fin:
+                        requete = texte_lower[jetons[fin][1]:jetons[fin_requete - 1][2]]
+                        proposition.append((Intention(cle, "recherche", commande.description,
+                                                      requete=requete, mot_cle=mot_cle), i, fin))
+                    fin = fin_requete
+                else:
+                    proposition.append((Intention(cle, commande.categorie, commande.description,
+                                                  mot_cle=mot_cle), i, fin))
+                i = fin
+
+            # « quitter » en dernier: les autres commandes de la phrase passent d'abord
+            intentions.sort(key=lambda intention: intention.cle == "quitter")
+            return intentions
+
+    def _fin_requete(self, jetons: List[Tuple[str, int, int]], debut: int,
+                     occurrences: Dict[int, Tuple[int, str]]) -> int:
+        """Indice du mot qui suit la requête commençant à `debut`"""
+        for i in range(debut, len(jetons)):
+            if jetons[i][0] not in SEPARATEURS or i + 1 == len(jetons):
+                continue
+            suivant = i + 1
+            if jetons[suivant][0] in VERBES_ACTION:
+                return i
+            if suivant in occurrences:
+                cle = self.index_mots_cles.cles_du_mot(occurrences[suivant][1])[0]
+                if self.commandes[cle].categorie != "sites":
+                    return i
+        # Ponctuation finale exclue de la requête
+        fin = len(jetons)
+        while fin > debut and jetons[fin - 1][0] in SEPARATEURS:
+            fin -= 1
+        return fin
+
+    def _clore_proposition(self, proposition: List[Tuple[Intention, int, int]],
+                           jetons: List[Tuple[str, int, int]], debut: int, fin: int,
+                           texte: str, intentions: List[Intention]):
+        """Ajoute aux intentions celles de la proposition jetons[debut:fin], selon les règles de priorité"""
+        systeme = [element for element in proposition if element[0].categorie == "systeme"]
+        if systeme:
+            # « ferme youtube », « stop la musique »: ni fermeture, ni le reste de la proposition
+            if len(proposition) > 1:
+                return
+            _, debut_cle, fin_cle = systeme[0]
+            if any(mot not in MOTS_VIDES for mot, _, _ in jetons[debut:debut_cle] + jetons[fin_cle:fin]):
+                return
+        if not proposition and fin > debut:
+            # Dernier recours: rapprochement approximatif (transcription imparfaite).
+            # Limité aux sites: une fermeture déclenchée par erreur coûterait cher
+            texte_proposition = texte[jetons[debut][1]:jetons[fin - 1][2]]
+            for score, cle, mot_cle in self.index_flou.meilleurs(texte_proposition, self.seuil_flou):
+                commande = self.commandes[cle]
+                if commande.categorie == "sites":
+                    proposition = [(Intention(cle, "sites", commande.description, score=score,
+                                              mot_cle=mot_cle), debut, fin)]
+                    break
+        for intention, _, _ in proposition:
+            # La même commande dite deux fois ne s'exécute qu'une fois
+            if all((intention.cle, intention.requete) != (autre.cle, autre.requete) for autre in intentions):
+                intentions.append(intention)
+
+    def url_recherche(self, requete: str) -> str:
+        """URL de recherche web pour une requête"""
+        return self.registre.moteur_recherche + urllib.parse.quote(requete)
+
+    def url(self, intention: Intention) -> Optional[str]:
+        """URL à ouvrir pour une intention (site ou recherche), sinon None"""
+        if intention.categorie == "sites":
+            site = self.sites.get(intention.cle)
+            return site.url if site else None
+        if intention.cle == "recherche":
+            return self.url_recherche(intention.requete)
+        return None
@@ -0,0 +1,407 @@
+"""
+Rejeu sans interface du pipeline de commandes vocales
+Usage: python rejeu.py [transcriptions.tsv | répertoire WAV] [--latence S]
+                       [--repetitions N] [--reference FICHIER] [--enregistrer-reference]
+                       [--progressif S]
+
+Chaque ligne d'un fichier de transcriptions contient la phrase reconnue et
+l'action attendue séparées par une tabulation: identifiant de site,
+« recherche:<requête> », « aide », « quitter » ou « - » (aucune action).
+Un répertoire WAV contient des fichiers nom.wav accompagnés de nom.txt au
+même format; l'audio passe alors par la détection de fin d'énoncé et le
+filtre local avant le moteur simulé.
+
+Avec --progressif S, le moteur simulé livre des hypothèses intermédiaires
+(un mot de plus toutes les S secondes) et le rapport indique les
+préparations spéculatives confirmées ou abandonnées.
+"""
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import wave
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from main import (
+    AssistantVocalApp, EtatPersistant, FileParole, MoteurProgressif, MoteurReconnaissance,
+    NavigateurEnregistreur, ParoleNonReconnue
+)
+
+# Fichiers du rejeu à côté du script, quel que soit le répertoire courant
+REPERTOIRE = os.path.dirname(os.path.abspath(__file__))
+FICHIER_TRANSCRIPTIONS = os.path.join(REPERTOIRE, "rejeu", "transcriptions.tsv")
+FICHIER_REFERENCE = os.path.join(REPERTOIRE, "rejeu", "reference.json")
+TAILLE_BLOC = 1024
+SEUIL_ENERGIE = 300
+
+# Phrase, action attendue et identifiants de corrélation des énoncés soumis
+Cas = Tuple[str, str, List[int]]
+
+
+class RacineMuette:
+    """Remplace la fenêtre Tk: les rappels différés s'exécutent aussitôt"""
+
+    def after(self, delai: int, fonction=None, *args):
+        if fonction:
+            fonction(*args)
+
+    def after_idle(self, fonction, *args):
+        pass
+
+
+class InterfaceMuette:
+    """Canal d'interface synchrone qui conserve les lignes de console"""
+
+    def __init__(self):
+        self.lignes: List[Tuple[str, str]] = []
+
+    def configurer(self, widget, **options):
+        pass
+
+    def console(self, ligne: str, niveau: str):
+        self.lignes.append((ligne, niveau))
+
+    def appeler(self, fonction):
+        fonction()
+
+
+class MoteurVocalMuet:
+    """Moteur pyttsx3 simulé: enregistre les phrases au lieu de les dire"""
+
+    def __init__(self, duree_par_caractere: float = 0.0):
+        self.duree_par_caractere = duree_par_caractere
+        self.phrases: List[str] = []
+        self._proprietes = {"voice": "muet", "rate": 170, "volume": 1.0}
+
+    def say(self, texte: str):
+        self.phrases.append(texte)
+
+    def runAndWait(self):
+        if self.duree_par_caractere and self.phrases:
+            time.sleep(len(self.phrases[-1]) * self.duree_par_caractere)
+
+    def stop(self):
+        pass
+
+    def setProperty(self, nom: str, valeur):
+        self._proprietes[nom] = valeur
+
+    def getProperty(self, nom: str):
+        return self._proprietes.get(nom)
+
+
+class MoteurRejeu(MoteurReconnaissance):
+    """Reconnaissance simulée: rend la transcription attendue après un délai
+
+    Un énoncé texte est sa propre transcription; pour l'audio, les
+    transcriptions sont rendues dans l'ordre où elles ont été annoncées.
+    """
+
+    nom = "rejeu"
+
+    def __init__(self, latence: float = 0.0):
+        self.latence = latence
+        self.transcriptions: deque = deque()
+
+    def _reconnaitre(self, audio, langue: str, annulation: threading.Event) -> str:
+        if self.latence:
+            annulation.wait(self.latence)
+        if isinstance(audio, str):
+            return audio
+        if not self.transcriptions:
+            raise ParoleNonReconnue(self.nom)
+        return self.transcriptions.popleft()
+
+
+class AssistantSansInterface(AssistantVocalApp):
+    """Assistant complet sans fenêtre, micro, synthèse ni navigateur réels
+
+    Les actions déclenchées sont relevées par identifiant de corrélation.
+    Avec `progressif`, la reconnaissance livre des hypothèses intermédiaires
+    (un mot toutes les `progressif` secondes) et le résultat final arrive
+    `latence` secondes après le dernier mot.
+    """
+
+    def __init__(self, latence: float = 0.0, progressif: Optional[float] = None):
+        self._repertoire = tempfile.TemporaryDirectory()
+        self.actions: Dict[Optional[int], List[str]] = {}
+        super().__init__()
+        self.moteur_rejeu = MoteurRejeu(latence if progressif is None else 0.0)
+        self.moteur_reconnaissance = self.moteur_rejeu
+        if progressif is not None:
+            self.moteur_reconnaissance = MoteurProgressif(self.moteur_rejeu, progressif, latence)
+        self.parole.demarrer()
+
+    def _initialiser_parametres(self):
+        super()._initialiser_parametres()
+        self.fichier_historique = os.path.join(self._repertoire.name, "historique.db")
+        self.etat = EtatPersistant(os.path.join(self._repertoire.name, "etat.json"))
+        self.ouvrir_navigateur = NavigateurEnregistreur()
+
+    def _configurer_interface(self):
+        self.root = RacineMuette()
+        self.ui = InterfaceMuette()
+
+    def _initialiser_moteur_vocal(self):
+        self.moteur_vocal = MoteurVocalMuet()
+        self.parole = FileParole(
+            lambda: self.moteur_vocal,
+            demarrage_differe=True,
+            statistiques=self.statistiques
+        )
+
+    def _creer_widgets(self):
+        self.label_statut = None
+        self.label_indicateur = None
+        self.btn_ecouter = None
+
+    def _relever(self, action: str):
+        correlation = self.statistiques.correlation_courante()
+        self.actions.setdefault(correlation, []).append(action)
+
+    def _ouvrir_site(self, site_id: str, url: Optional[str] = None):
+        self._relever(site_id)
+        super()._ouvrir_site(site_id, url)
+
+    def _effectuer_recherche(self, requete: Optional[str] = None):
+        self._relever(f"recherche:{requete}")
+        super()._effectuer_recherche(requete)
+
+    def _afficher_aide(self):
+        self._relever("aide")
+        super()._afficher_aide()
+
+    def quitter(self):
+        self._relever("quitter")
+
+    def fermer(self):
+        """Arrête les threads et supprime les fichiers temporaires"""
+        self.cycle_ecoute.arreter(delai=1.0)
+        self.parole.arreter()
+        self.navigateur.arreter()
+        self.historique.fermer()
+        self._arret_surveillance.set()
+        self._repertoire.cleanup()
+
+
+def lire_attendus(chemin: str) -> List[Tuple[str, str]]:
+    """Lit des couples (phrase, action attendue) séparés par une tabulation"""
+    couples = []
+    with open(chemin, encoding="utf-8") as fichier:
+        for ligne in fichier:
+            ligne = ligne.rstrip("\n")
+            if ligne.strip() and not ligne.startswith("#"):
+                phrase, _, attendu = ligne.partition("\t")
+                couples.append((phrase.strip(), attendu.strip() or "-"))
+    return couples
+
+
+def _nb_soumis(app: AssistantSansInterface) -> int:
+    """Nombre d'énoncés soumis au pipeline (un identifiant de corrélation chacun)"""
+    return app._pipeline.soumis
+
+
+def _attendre_fin(app: AssistantSansInterface, limite: float = 30.0):
+    """Attend que tous les énoncés soumis aient été traités"""
+    fin = time.perf_counter() + limite
+    while app._pipeline.en_attente and time.perf_counter() < fin:
+        time.sleep(0.001)
+
+
+def rejouer_transcriptions(app: AssistantSansInterface, couples: List[Tuple[str, str]],
+                           repetitions: int = 1) -> List[Cas]:
+    """Soumet les phrases comme des énoncés déjà capturés, repetitions fois"""
+    pipeline = app._creer_pipeline()
+    cas = []
+    for _ in range(repetitions):
+        for phrase, attendu in couples:
+            # La capture n'attend pas une file pleine (l'énoncé le plus ancien
+            # serait abandonné): le rejeu, lui, attend qu'une place se libère
+            while pipeline.en_attente >= pipeline.capacite:
+                time.sleep(0.0005)
+            pipeline.soumettre(phrase)
+            cas.append((phrase, attendu, [len(cas) + 1]))
+    _attendre_fin(app)
+    pipeline.arreter()
+    return cas
+
+
+def rejouer_wav(app: AssistantSansInterface, repertoire: str) -> List[Cas]:
+    """Passe chaque fichier WAV par la capture (détection de fin d'énoncé, filtre)"""
+    cas = []
+    pipeline = app._creer_pipeline()
+    filtre = app._creer_filtre_local()
+    for nom in sorted(os.listdir(repertoire)):
+        if not nom.lower().endswith(".wav"):
+            continue
+        base = os.path.join(repertoire, os.path.splitext(nom)[0])
+        attendus = lire_attendus(base + ".txt") if os.path.exists(base + ".txt") else []
+        phrase, attendu = attendus[0] if attendus else ("", "-")
+
+        app.moteur_rejeu.transcriptions.append(phrase)
+        avant = _nb_soumis(app)
+        with wave.open(os.path.join(repertoire, nom), "rb") as fichier:
+            taux, largeur = fichier.getframerate(), fichier.getsampwidth()
+            detecteur = app._creer_detecteur(taux, largeur, SEUIL_ENERGIE)
+            bloc = fichier.readframes(TAILLE_BLOC)
+            while bloc:
+                app._traiter_bloc(bloc, detecteur, filtre, pipeline)
+                bloc = fichier.readframes(TAILLE_BLOC)
+        # Silence final pour clore l'énoncé en cours
+        app._traiter_bloc(bytes(taux * largeur), detecteur, filtre, pipeline)
+        _attendre_fin(app)
+        # Transcription inutilisée si le filtre local a écarté l'énoncé
+        app.moteur_rejeu.transcriptions.clear()
+        cas.append((phrase, attendu, list(range(avant + 1, _nb_soumis(app) + 1))))
+    pipeline.arreter()
+    return cas
+
+
+def _nom_source(source: str) -> str:
+    """Chemin de la source relatif au dépôt, pour comparer les rapports d'une machine à l'autre"""
+    chemin = os.path.abspath(source)
+    if os.path.commonpath([chemin, REPERTOIRE]) == REPERTOIRE:
+        chemin = os.path.relpath(chemin, REPERTOIRE)
+    return chemin.replace(os.sep, "/")
+
+
+def executer(source: str = FICHIER_TRANSCRIPTIONS, latence: float = 0.0,
+             repetitions: int = 5, progressif: Optional[float] = None) -> dict:
+    """Rejoue une source et retourne le rapport (débit, précision, latences)"""
+    app = AssistantSansInterface(latence, progressif)
+    try:
+        debut = time.perf_counter()
+        if os.path.isdir(source):
+            cas = rejouer_wav(app, source)
+        else:
+            cas = rejouer_transcriptions(app, lire_attendus(source), repetitions)
+        duree = time.perf_counter() - debut
+        # Navigateur et synthèse sont servis par leurs propres threads
+        time.sleep(0.1)
+
+        erreurs = []
+        nb_erreurs = 0
+        for phrase, attendu, correlations in cas:
+            obtenu = ",".join(
+                action for correlation in correlations for action in app.actions.get(correlation, [])
+            ) or "-"
+            if obtenu != attendu:
+                nb_erreurs += 1
+                erreur = {"phrase": phrase, "attendu": attendu, "obtenu": obtenu}
+                if erreur not in erreurs:
+                    erreurs.append(erreur)
+
+        rapport = {
+            "source": _nom_source(source),
+            "latence_reconnaissance_s": latence,
+            "commandes": len(cas),
+            "ecartees_localement": sum(not correlations for _, _, correlations in cas),
+            "commandes_par_seconde": round(len(cas) / duree, 1),
+            "precision": round(1 - nb_erreurs / max(1, len(cas)), 4),
+            "phrases_prononcees": len(app.moteur_vocal.phrases),
+            "appels_navigateur": len(app.ouvrir_navigateur.appels),
+            "etapes_ms": {
+                etape: {cle: round(valeur, 3) for cle, valeur in p.items()}
+                for etape, p in app.statistiques.instantane().items()
+            },
+            "erreurs": erreurs,
+        }
+        if progressif is not None:
+            speculateur = app.speculateur
+            rapport["speculation"] = {
+                "preparations": speculateur.preparations,
+                "confirmees": speculateur.confirmees,
+                "abandonnees": speculateur.abandonnees,
+                "avance_ms": round(
+                    statistics.median(speculateur.avances) * 1000 if speculateur.avances else 0.0, 1
+                ),
+            }
+        return rapport
+    finally:
+        app.fermer()
+
+
+def comparer(rapport: dict, reference: dict, tolerance: float = 0.3,
+             marge_ms: float = 5.0) -> List[str]:
+    """Régressions du rapport par rapport à la référence enregistrée"""
+    regressions = []
+    if rapport["precision"] < reference["precision"]:
+        regressions.append(f"précision {reference['precision']:.1%} -> {rapport['precision']:.1%}")
+    if rapport["commandes_par_seconde"] < reference["commandes_par_seconde"] * (1 - tolerance):
+        regressions.append(
+            f"débit {reference['commandes_par_seconde']} -> {rapport['commandes_par_seconde']} commandes/s"
+        )
+    for etape, p in rapport["etapes_ms"].items():
+        avant = reference["etapes_ms"].get(etape)
+        if avant and p["p95"] > avant["p95"] * (1 + tolerance) + marge_ms:
+            regressions.append(f"{etape} p95 {avant['p95']:.1f} -> {p['p95']:.1f} ms")
+    return regressions
+
+
+def afficher(rapport: dict):
+    """Affiche un rapport de rejeu"""
+    print(f"Rejeu de {rapport['source']} (reconnaissance simulée: "
+          f"{rapport['latence_reconnaissance_s'] * 1000:.0f} ms)")
+    print(f"  commandes          : {rapport['commandes']} "
+          f"({rapport['ecartees_localement']} écartées localement)")
+    print(f"  débit              : {rapport['commandes_par_seconde']} commandes/s")
+    print(f"  précision          : {rapport['precision']:.1%}")
+    print(f"  phrases prononcées : {rapport['phrases_prononcees']}, "
+          f"appels navigateur: {rapport['appels_navigateur']}")
+    for etape, p in rapport["etapes_ms"].items():
+        print(f"  {etape:<15} p50 {p['p50']:>8.2f}  p95 {p['p95']:>8.2f}  p99 {p['p99']:>8.2f} ms")
+    if "speculation" in rapport:
+        s = rapport["speculation"]
+        print(f"  spéculation        : {s['preparations']} préparation(s), {s['confirmees']} "
+              f"confirmée(s), {s['abandonnees']} abandonnée(s), avance médiane {s['avance_ms']} ms "
+              f"(fixée par --latence, pas une mesure)")
+    for erreur in rapport["erreurs"]:
+        print(f"  ✗ '{erreur['phrase']}': attendu {erreur['attendu']}, obtenu {erreur['obtenu']}")
+
+
+def main(arguments: List[str]) -> int:
+    source, latence, repetitions, progressif = FICHIER_TRANSCRIPTIONS, 0.0, 5, None
+    reference, enregistrer = FICHIER_REFERENCE, False
+    arguments = list(arguments)
+    while arguments:
+        argument = arguments.pop(0)
+        if argument == "--latence":
+            latence = float(arguments.pop(0))
+        elif argument == "--repetitions":
+            repetitions = int(arguments.pop(0))
+        elif argument == "--reference":
+            reference = arguments.pop(0)
+        elif argument == "--enregistrer-reference":
+            enregistrer = True
+        elif argument == "--progressif":
+            progressif = float(arguments.pop(0))
+        else:
+            source = argument
+
+    rapport = executer(source, latence, repetitions, progressif)
+    afficher(rapport)
+
+    if enregistrer:
+        with open(reference, "w", encoding="utf-8") as fichier:
+            json.dump(rapport, fichier, ensure_ascii=False, indent=2)
+            fichier.write("\n")
+        print(f"Référence enregistrée dans {reference}")
+        return 0
+
+    if os.path.exists(reference):
+        with open(reference, encoding="utf-8") as fichier:
+            precedent = json.load(fichier)
+        if precedent["source"] == rapport["source"]:
+            regressions = comparer(rapport, precedent)
+            for regression in regressions:
+                print(f"  Régression: {regression}")
+            return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,257 @@
+"""
+Service local de commandes vocales, partagé entre plusieurs clients
+Usage: python service.py [--port N] [--processus N] [--registre commandes.json]
+
+Protocole: une ligne par requête, soit la phrase reconnue brute, soit un
+objet JSON {"texte": "..."}; une ligne JSON par réponse, dans l'ordre des
+requêtes: {"cle": "youtube", "categorie": "sites", "url": "...", ...,
+"intentions": [...]} ou {"cle": null, "intentions": []} si aucune commande
+ne correspond. Les champs de premier niveau décrivent la première commande
+de la phrase, "intentions" les liste toutes (« ouvre github et cherche
+asyncio »). Le service décide, le client exécute. Une requête illisible
+(UTF-8 invalide) reçoit {"cle": null, "erreur": "..."}; une ligne au-delà
+de la limite du flux aussi, puis la connexion est fermée.
+
+Avec --processus N, l'analyse des phrases (index de mots-clés,
+rapprochement approximatif) est répartie sur N processus, chacun avec sa
+propre copie du moteur de commandes.
+"""
+import asyncio
+import json
+import logging
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from noyau import FICHIER_COMMANDES, Intention, MoteurCommandes
+
+logger = logging.getLogger(__name__)
+
+USAGE = "Usage: python service.py [--port N] [--processus N] [--registre commandes.json]"
+HOTE = "127.0.0.1"
+PORT = 8765
+
+# Moteur propre à chaque processus de calcul
+_moteur_processus: Optional[MoteurCommandes] = None
+_prochaine_verification = 0.0
+
+
+def _description(moteur: MoteurCommandes, intention: Intention) -> dict:
+    return {
+        "cle": intention.cle,
+        "categorie": intention.categorie,
+        "description": intention.description,
+        "requete": intention.requete,
+        "score": round(intention.score, 3),
+        "url": moteur.url(intention),
+    }
+
+
+def _reponse(moteur: MoteurCommandes, intentions: List[Intention]) -> dict:
+    """Réponse JSON d'une analyse: la première commande, puis toutes"""
+    descriptions = [_description(moteur, intention) for intention in intentions]
+    reponse = dict(descriptions[0]) if descriptions else {"cle": None}
+    reponse["intentions"] = descriptions
+    return reponse
+
+
+def _initialiser_processus(chemin_registre: str, seuil_flou: float):
+    global _moteur_processus
+    _moteur_processus = MoteurCommandes(chemin_registre, seuil_flou)
+    _moteur_processus.charger()
+
+
+def _analyser_dans_processus(texte: str, periode_registre: float = 1.0) -> dict:
+    global _prochaine_verification
+    # Le registre est relu au plus une fois par période
+    maintenant = time.monotonic()
+    if maintenant >= _prochaine_verification:
+        _prochaine_verification = maintenant + periode_registre
+        _moteur_processus.recharger_si_modifie()
+    return _reponse(_moteur_processus, _moteur_processus.intentions(texte))
+
+
+class ServiceCommandes:
+    """Serveur asyncio: chaque client envoie des phrases, reçoit des décisions
+
+    Les requêtes d'un même client sont traitées en parallèle (jusqu'à
+    en_vol_max) et les réponses lui reviennent dans l'ordre d'envoi.
+    """
+
+    def __init__(self, chemin_registre: str = FICHIER_COMMANDES, nb_processus: int = 0,
+                 seuil_flou: float = 0.55, en_vol_max: int = 64, periode_registre: float = 1.0):
+        self.moteur = MoteurCommandes(chemin_registre, seuil_flou)
+        self.moteur.charger()
+        self.en_vol_max = en_vol_max
+        self.periode_registre = periode_registre
+        self._pool = None
+        if nb_processus:
+            self._pool = ProcessPoolExecutor(
+                nb_processus,
+                initializer=_initialiser_processus,
+                initargs=(chemin_registre, seuil_flou)
+            )
+        self._serveur: Optional[asyncio.AbstractServer] = None
+        self._surveillance: Optional[asyncio.Task] = None
+        # Tâche de chaque client -> son écrivain
+        self._taches_clients: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self.clients = 0
+        self.requetes = 0
+
+    async def analyser(self, texte: str) -> dict:
+        """Analyse une phrase, dans un processus de calcul s'il y en a"""
+        self.requetes += 1
+        if self._pool is None:
+            return _reponse(self.moteur, self.moteur.intentions(texte))
+        boucle = asyncio.get_running_loop()
+        return await boucle.run_in_executor(
+            self._pool, _analyser_dans_processus, texte, self.periode_registre
+        )
+
+    @staticmethod
+    def _erreur(message: str) -> asyncio.Future:
+        """Réponse d'erreur, mise en file comme une analyse déjà terminée"""
+        futur = asyncio.get_running_loop().create_future()
+        futur.set_result({"cle": None, "erreur": message})
+        return futur
+
+    @staticmethod
+    def _lire_texte(ligne: bytes) -> str:
+        texte = ligne.decode("utf-8").strip()
+        if texte.startswith("{"):
+            try:
+                return str(json.loads(texte).get("texte", ""))
+            except (ValueError, AttributeError):
+                pass
+        return texte
+
+    async def _servir_client(self, lecteur: asyncio.StreamReader, ecrivain: asyncio.StreamWriter):
+        self.clients += 1
+        self._taches_clients[asyncio.current_task()] = ecrivain
+        en_vol: asyncio.Queue = asyncio.Queue(self.en_vol_max)
+
+        async def repondre():
+            while True:
+                tache = await en_vol.get()
+                if tache is None:
+                    return
+                try:
+                    reponse = await tache
+                except Exception as e:
+                    logger.error(f"Analyse impossible: {e}")
+                    reponse = {"cle": None, "erreur": str(e)}
+                ecrivain.write(json.dumps(reponse, ensure_ascii=False).encode("utf-8") + b"\n")
+                await ecrivain.drain()
+
+        redacteur = asyncio.ensure_future(repondre())
+        try:
+            while True:
+                try:
+                    ligne = await lecteur.readline()
+                except ValueError:
+                    # Ligne au-delà de la limite du flux: la suite n'est plus découpable en requêtes
+                    await en_vol.put(self._erreur("ligne trop longue"))
+                    break
+                if not ligne:
+                    break
+                try:
+                    requete = asyncio.ensure_future(self.analyser(self._lire_texte(ligne)))
+                except UnicodeDecodeError:
+                    requete = self._erreur("requête illisible: UTF-8 attendu")
+                # File pleine: le client attend que ses premières réponses partent
+                await en_vol.put(requete)
+            await en_vol.put(None)
+            await redacteur
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # Client parti
+            pass
+        finally:
+            # Aussi à la fermeture du service: l'annulation se propage, écrivain fermé
+            redacteur.cancel()
+            self.clients -= 1
+            self._taches_clients.pop(asyncio.current_task(), None)
+            ecrivain.close()
+
+    async def _surveiller_registre(self):
+        while True:
+            await asyncio.sleep(self.periode_registre)
+            changements = self.moteur.recharger_si_modifie()
+            if changements is not None:
+                logger.info(f"Registre rechargé: {len(changements.sites_modifies)} site(s) modifié(s)")
+
+    async def demarrer(self, hote: str = HOTE, port: int = PORT) -> int:
+        """Ouvre le port d'écoute; retourne le port effectif (utile avec port=0)"""
+        self._serveur = await asyncio.start_server(self._servir_client, hote, port)
+        self._surveillance = asyncio.ensure_future(self._surveiller_registre())
+        return self._serveur.sockets[0].getsockname()[1]
+
+    async def servir(self):
+        """Sert les clients jusqu'à l'annulation"""
+        async with self._serveur:
+            await self._serveur.serve_forever()
+
+    async def fermer(self, delai: float = 1.0):
+        """Ferme le port, la surveillance du registre et les processus de calcul"""
+        if self._surveillance:
+            self._surveillance.cancel()
+        if self._serveur:
+            self._serveur.close()
+        # Connexions fermées: chaque client finit sur une fin de flux; l'annulation
+        # ne vise que ceux qui ne se terminent pas à temps
+        taches = list(self._taches_clients)
+        for ecrivain in list(self._taches_clients.values()):
+            ecrivain.close()
+        if taches:
+            _, restantes = await asyncio.wait(taches, timeout=delai)
+            for tache in restantes:
+                tache.cancel()
+            await asyncio.gather(*restantes, return_exceptions=True)
+        if self._serveur:
+            await self._serveur.wait_closed()
+        if self._pool:
+            self._pool.shutdown()
+
+
+async def _executer(port: int, nb_processus: int, chemin_registre: str):
+    service = ServiceCommandes(chemin_registre, nb_processus)
+    port = await service.demarrer(HOTE, port)
+    logger.info(f"Service de commandes à l'écoute sur {HOTE}:{port} "
+                f"({nb_processus or 'aucun'} processus de calcul)")
+    try:
+        await service.servir()
+    finally:
+        await service.fermer()
+
+
+def main(arguments) -> int:
+    port, nb_processus, chemin_registre = PORT, 0, FICHIER_COMMANDES
+    arguments = list(arguments)
+    try:
+        while arguments:
+            argument = arguments.pop(0)
+            if argument == "--port":
+                port = int(arguments.pop(0))
+            elif argument == "--processus":
+                nb_processus = int(arguments.pop(0))
+            elif argument == "--registre":
+                chemin_registre = arguments.pop(0)
+            else:
+                raise ValueError(f"argument inconnu: {argument}")
+    except IndexError:
+        print(f"{USAGE}\nErreur: valeur manquante après {argument}", file=sys.stderr)
+        return 2
+    except ValueError as e:
+        print(f"{USAGE}\nErreur: {e}", file=sys.stderr)
+        return 2
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    try:
+        asyncio.run(_executer(port, nb_processus, chemin_registre))
+    except KeyboardInterrupt:
+        logger.info("Service arrêté")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))